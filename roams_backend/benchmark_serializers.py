@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+DRF Serializer vs Fast values_list() Path - Serialization Benchmark for ROAMS
+
+Measures rows/second for one list page of OpcUaReadLog and ThresholdBreach
+(default page size 5000), end to end from query to JSON bytes:
+
+1. Before: select_related() queryset -> DRF ModelSerializer -> DRF JSONRenderer
+2. After:  values_list() -> ValuesSerializer (roams_api/fast_serializers.py) -> ORJSONRenderer
+
+Usage: python benchmark_serializers.py [--page-size 5000] [--iterations 5]
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+
+# Add parent directory for Django imports
+sys.path.insert(0, os.path.dirname(__file__))
+
+try:
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'roams_pro.settings')
+    django.setup()
+except Exception as e:
+    print(f"ERROR: Could not load Django settings: {e}")
+    sys.exit(1)
+
+from rest_framework.renderers import JSONRenderer
+from roams_opcua_mgr.models import OpcUaReadLog, ThresholdBreach
+from roams_api.serializers import OpcUaReadLogSerializer, ThresholdBreachSerializer
+from roams_api.fast_serializers import FastOpcUaReadLogSerializer, FastThresholdBreachSerializer
+from roams_api.renderers import ORJSONRenderer
+
+
+def run_drf(queryset, serializer_class, page_size):
+    """Old path: model instances + DRF serializer + stdlib JSON"""
+    page = list(queryset[:page_size])
+    data = serializer_class(page, many=True).data
+    return len(page), JSONRenderer().render(data)
+
+
+def run_fast(queryset, fast_serializer_class, page_size):
+    """New path: values_list rows + compiled accessors + orjson"""
+    page = list(fast_serializer_class.values(queryset)[:page_size])
+    data = fast_serializer_class.serialize(page)
+    return len(page), ORJSONRenderer().render(data)
+
+
+def benchmark(label, func, queryset, serializer_class, page_size, iterations):
+    """Time `iterations` runs of func and return rows/second per run"""
+    rates = []
+    rows = 0
+    payload = b""
+    for _ in range(iterations):
+        start = time.perf_counter()
+        rows, payload = func(queryset, serializer_class, page_size)
+        elapsed = time.perf_counter() - start
+        if rows:
+            rates.append(rows / elapsed)
+
+    if not rates:
+        print(f"  {label:<8} No data")
+        return None
+
+    print(
+        f"  {label:<8} {statistics.median(rates):>10,.0f} rows/s  "
+        f"(median of {iterations}, {rows} rows, {len(payload) / 1024:.0f} KiB)"
+    )
+    return statistics.median(rates)
+
+
+def main():
+    """Main comparison function"""
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--page-size', type=int, default=5000)
+    arg_parser.add_argument('--iterations', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("Serialization Benchmark: DRF serializers vs fast values_list() path")
+    print("=" * 70)
+    print(f"\nPage size: {args.page_size}, iterations: {args.iterations}")
+
+    cases = [
+        (
+            "OpcUaReadLog",
+            OpcUaReadLog.objects.select_related('client_config', 'node', 'node__tag_name').order_by('-timestamp', '-id'),
+            OpcUaReadLogSerializer,
+            FastOpcUaReadLogSerializer,
+        ),
+        (
+            "ThresholdBreach",
+            ThresholdBreach.objects.select_related('node', 'node__client_config', 'node__tag_name').order_by('-timestamp', '-id'),
+            ThresholdBreachSerializer,
+            FastThresholdBreachSerializer,
+        ),
+    ]
+
+    for name, queryset, drf_serializer, fast_serializer in cases:
+        print("\n" + "=" * 70)
+        print(name)
+        print("=" * 70)
+
+        # Warm up connection, query plans and the compiled accessors
+        run_drf(queryset, drf_serializer, 10)
+        run_fast(queryset, fast_serializer, 10)
+
+        before = benchmark("Before", run_drf, queryset, drf_serializer, args.page_size, args.iterations)
+        after = benchmark("After", run_fast, queryset, fast_serializer, args.page_size, args.iterations)
+        if before and after:
+            print(f"  Speedup: {after / before:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
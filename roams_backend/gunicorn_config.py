@@ -9,9 +9,18 @@ backlog = 2048
 
 # Worker Processes
 workers = multiprocessing.cpu_count() * 2 + 1  # Recommended formula
-worker_class = "sync"  # Use 'gevent' or 'eventlet' for async if needed
+# gthread: each worker serves `threads` requests at once while its main thread
+# keeps heartbeating to the master. With "sync" the heartbeat stops for the
+# whole request, so a streaming export (/api/export/...) longer than `timeout`
+# was killed mid-download. Every thread holds its own DB connection.
+worker_class = "gthread"
+threads = 4
 worker_connections = 1000
-timeout = 120  # 2 minutes for OPC UA operations
+# Kills a worker whose main loop is stuck; requests themselves are not limited
+# by it under gthread (long exports are bounded by nginx proxy_read_timeout,
+# which only counts the time between two chunks)
+timeout = 120
+graceful_timeout = 30  # Running requests, exports included, get this long on a restart
 keepalive = 5
 
 # Process Naming
@@ -39,3 +48,10 @@ max_requests_jitter = 50  # Add randomness to prevent all workers restarting at
 # SSL (if using HTTPS directly, but Nginx handles this)
 # keyfile = '/path/to/key.pem'
 # certfile = '/path/to/cert.pem'
+
+
+# Hooks
+def on_exit(server):
+    """Drop the web process record, so the restart resets server uptime (process_registry.py)."""
+    from roams_opcua_mgr.process_registry import unregister_process
+    unregister_process("web")
@@ -0,0 +1,182 @@
+"""
+Conditional GET (ETag / Last-Modified) for read endpoints.
+
+Validators are derived from the per-model version counters in
+roams_opcua_mgr/model_versions.py - one Redis MGET - before the view runs.
+When the client's If-None-Match (or If-Modified-Since) matches, a 304 is
+returned and the view body, its queries and its serialization are skipped.
+
+Endpoints whose output also depends on the clock (rolling "last 24h" counts,
+uptime up to now) pass `time_bucket` seconds: the validators then also change
+once per bucket, so a payload is served unchanged for at most that long.
+
+If Redis is unavailable the view simply runs as if no validators existed.
+
+cached_view() additionally keeps the payload itself in the response cache
+(roams_opcua_mgr/response_cache.py), so clients without a validator - or
+many dashboards right after a write - are served without rerunning the view.
+"""
+
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from roams_opcua_mgr.model_versions import get_model_versions
+from roams_opcua_mgr.response_cache import cached_result
+
+logger = logging.getLogger(__name__)
+
+
+def _validators(request, models, time_bucket):
+    """Return (etag, last_modified seconds), or (None, None) if versions are unavailable."""
+    try:
+        versions = get_model_versions(models)
+    except Exception as e:
+        logger.warning(f"⚠️ Model versions unavailable, serving without validators: {e}")
+        return None, None
+    if any(version is None for version in versions.values()):
+        return None, None
+
+    bucket = int(time.time() // time_bucket) if time_bucket else 0
+    last_modified = max(changed_at for _, changed_at in versions.values()) // 1000
+    if time_bucket:
+        last_modified = max(last_modified, bucket * time_bucket)
+
+    renderer = getattr(request, "accepted_renderer", None)
+    parts = [
+        request.get_full_path(),
+        getattr(renderer, "format", ""),
+        # Output may depend on who asks (permissions, per-user filtering)
+        str(request.user.pk),
+        str(bucket),
+    ] + [f"{label}={versions[label][0]}" for label in models]
+    etag = '"' + hashlib.md5("|".join(parts).encode("utf-8")).hexdigest() + '"'
+    return etag, last_modified
+
+
+def _not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags or "*" in tags
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def conditional_response(request, models, handler, time_bucket=None):
+    """
+    Run handler() unless the client already holds the current payload.
+
+    Args:
+        request: DRF request (authenticated already)
+        models: Model labels ("app_label.model_name") the payload is built from
+        handler: Zero-argument callable producing the Response
+        time_bucket: Seconds after which the payload changes even without writes
+    """
+    etag, last_modified = _validators(request, models, time_bucket)
+    if etag is None:
+        return handler()
+
+    if _not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = handler()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Cache, but revalidate every time
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_view(*models, time_bucket=None):
+    """
+    Decorator for @api_view functions; place it below @api_view and
+    @permission_classes so authentication runs before validators are checked.
+
+        @api_view(["GET"])
+        @permission_classes([IsAuthenticated])
+        @conditional_view("roams_opcua_mgr.tagname")
+        def tag_names(request): ...
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            return conditional_response(
+                request, models, lambda: view(request, *args, **kwargs), time_bucket
+            )
+        return wrapper
+    return decorator
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def cached_view(name, *models, time_bucket=None):
+    """
+    Decorator for @api_view functions whose payload doesn't depend on the user;
+    place it below conditional_view. Only 200 responses are cached, keyed by
+    the full path (query string included).
+
+        @conditional_view("roams_opcua_mgr.tagname")
+        @cached_view("tag-names", "roams_opcua_mgr.tagname")
+        def tag_names(request): ...
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            def render():
+                response = view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    raise _Uncacheable(response)
+                return response.data
+
+            try:
+                data = cached_result(
+                    name, models, render, key=(request.get_full_path(),), time_bucket=time_bucket
+                )
+            except _Uncacheable as e:
+                return e.response
+            return Response(data)
+        return wrapper
+    return decorator
+
+
+class ConditionalReadMixin:
+    """
+    Conditional GET for a viewset's list and retrieve actions.
+
+    Set `conditional_models` to the model labels the serialized output reads,
+    and optionally `conditional_time_bucket`.
+    """
+    conditional_models = ()
+    conditional_time_bucket = None
+
+    def list(self, request, *args, **kwargs):
+        return conditional_response(
+            request, self.conditional_models,
+            lambda: super(ConditionalReadMixin, self).list(request, *args, **kwargs),
+            self.conditional_time_bucket,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request, self.conditional_models,
+            lambda: super(ConditionalReadMixin, self).retrieve(request, *args, **kwargs),
+            self.conditional_time_bucket,
+        )
@@ -2,9 +2,10 @@
 
 from rest_framework import serializers
 from roams_opcua_mgr.models import (
-    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest
+    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest, ControlWriteJob
 )
 from roams_api.serializers import UserSerializer
+from roams_opcua_mgr.control_permissions import user_can_control
 
 
 class ControlStateSerializer(serializers.ModelSerializer):
@@ -43,7 +44,7 @@ class ControlStateSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user:
             return False
-        return obj.can_change_state(request.user)
+        return user_can_control(request.user, obj.pk, self.context.get('control_permissions'))
     
     def get_is_rate_limited(self, obj):
         """Check if control is currently rate-limited"""
@@ -138,6 +139,25 @@ class ControlStateRequestSerializer(serializers.ModelSerializer):
         return "ON" if obj.requested_value else "OFF"
 
 
+class ControlWriteJobSerializer(serializers.ModelSerializer):
+    """Serialize a queued PLC write and its outcome"""
+    
+    station_name = serializers.CharField(source='station.station_name', read_only=True)
+    tag_name = serializers.CharField(source='node.tag_name', read_only=True)
+    requested_by_username = serializers.CharField(source='requested_by.username', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = ControlWriteJob
+        fields = [
+            'id', 'kind', 'batch_id', 'station', 'station_name', 'node', 'tag_name', 'value', 'command',
+            'control_state', 'control_request', 'requested_by', 'requested_by_username',
+            'reason', 'status', 'status_display', 'is_finished', 'message', 'status_code',
+            'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
 class ControlStateChangeRequestSerializer(serializers.Serializer):
     """Serializer for requesting a control state change"""
     
@@ -2,24 +2,24 @@
 
 import uuid
 from django.utils import timezone
-from django.db import transaction
 from django.db.models import Q
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 
 from roams_opcua_mgr.models import (
-    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest
+    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest, ControlWriteJob
 )
 from roams_api.control_serializers import (
     ControlStateSerializer, ControlStateHistorySerializer, ControlPermissionSerializer,
     ControlStateRequestSerializer, ControlStateChangeRequestSerializer,
-    ControlStateConfirmationSerializer
+    ControlStateConfirmationSerializer, ControlWriteJobSerializer
 )
-# Lazy import to avoid early initialization:
-# from roams_opcua_mgr.opcua_client import active_clients
+from roams_opcua_mgr.write_queue import submit_write, write_job_cutoff
+from roams_opcua_mgr.control_permissions import get_control_permissions
 
 import logging
 logger = logging.getLogger(__name__)
@@ -46,7 +46,7 @@ class ControlStateViewSet(viewsets.ReadOnlyModelViewSet):
     - Viewing history of state changes
     """
     
-    queryset = ControlState.objects.all()
+    queryset = ControlState.objects.select_related('node__tag_name', 'last_changed_by')
     serializer_class = ControlStateSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -58,6 +58,8 @@ class ControlStateViewSet(viewsets.ReadOnlyModelViewSet):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
+        # One cache read answers can_user_change for every control in the page
+        context['control_permissions'] = get_control_permissions(self.request.user)
         return context
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
@@ -102,6 +104,16 @@ class ControlStateViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_429_TOO_MANY_REQUESTS
             )
         
+        # One write at a time per control: the queued one decides current_value.
+        # Older jobs can no longer be in flight, whatever their status says.
+        if control_state.write_jobs.filter(
+            status__in=['queued', 'running'], created_at__gte=write_job_cutoff()
+        ).exists():
+            return Response(
+                {"detail": f"A change to {control_state.node.tag_name} is already in progress"},
+                status=status.HTTP_409_CONFLICT
+            )
+        
         # If same value, don't do anything
         if control_state.current_value == requested_value:
             return Response(
@@ -206,96 +218,12 @@ class ControlStateViewSet(viewsets.ReadOnlyModelViewSet):
         )
     
     def _execute_change(self, control_state, new_value, requested_by_user, reason, ip_address, pending_request=None):
-        """Execute the actual control state change"""
-        try:
-            with transaction.atomic():
-                # Get the OPC UA client handler
-                try:
-                    from roams_opcua_mgr.opcua_client import active_clients
-                    client_handler = active_clients.get(control_state.node.client_config.station_name)
-                except Exception:
-                    client_handler = None
-                
-                if not client_handler:
-                    error_msg = f"No active OPC UA client for {control_state.node.client_config.station_name}"
-                    logger.error(f"❌ {error_msg}")
-                    
-                    ControlStateHistory.objects.create(
-                        control_state=control_state,
-                        change_type='failed',
-                        requested_by=requested_by_user,
-                        previous_value=control_state.current_value,
-                        requested_value=new_value,
-                        reason=reason,
-                        error_message=error_msg,
-                        ip_address=ip_address
-                    )
-                    
-                    return Response(
-                        {"detail": error_msg, "error": "client_not_available"},
-                        status=status.HTTP_503_SERVICE_UNAVAILABLE
-                    )
-                
-                # Write to PLC
-                success, message = client_handler.write_node_value(control_state.node, new_value)
-                
-                if not success:
-                    # Log failure
-                    ControlStateHistory.objects.create(
-                        control_state=control_state,
-                        change_type='failed',
-                        requested_by=requested_by_user,
-                        previous_value=control_state.current_value,
-                        requested_value=new_value,
-                        reason=reason,
-                        error_message=message,
-                        ip_address=ip_address
-                    )
-                    
-                    if pending_request:
-                        pending_request.status = 'failed'
-                        pending_request.save()
-                    
-                    return Response(
-                        {"detail": message, "error": "write_failed"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                    )
-                
-                # Update control state
-                control_state.current_value = new_value
-                control_state.plc_value = new_value
-                control_state.is_synced_with_plc = True
-                control_state.last_changed_by = requested_by_user
-                control_state.save()
-                
-                # Log success
-                ControlStateHistory.objects.create(
-                    control_state=control_state,
-                    change_type='executed',
-                    requested_by=requested_by_user,
-                    previous_value=not new_value,
-                    requested_value=new_value,
-                    final_value=new_value,
-                    reason=reason,
-                    ip_address=ip_address
-                )
-                
-                logger.info(
-                    f"🎯 [{control_state.node.tag_name}] State changed to {new_value} "
-                    f"by {requested_by_user.username}"
-                )
-                
-                return Response(
-                    {
-                        "message": f"Control state changed successfully",
-                        "control_state": ControlStateSerializer(control_state, context={'request': self.request}).data,
-                        "request_id": pending_request.id if pending_request else None,
-                    },
-                    status=status.HTTP_200_OK
-                )
+        """Queue the control state change for the station's write worker"""
+        station = control_state.node.client_config
         
-        except Exception as e:
-            logger.exception(f"❌ Unexpected error executing control change: {e}")
+        if station.connection_status != "Connected":
+            error_msg = f"No active OPC UA client for {station.station_name}"
+            logger.error(f"❌ {error_msg}")
             
             ControlStateHistory.objects.create(
                 control_state=control_state,
@@ -304,14 +232,47 @@ class ControlStateViewSet(viewsets.ReadOnlyModelViewSet):
                 previous_value=control_state.current_value,
                 requested_value=new_value,
                 reason=reason,
-                error_message=str(e),
+                error_message=error_msg,
                 ip_address=ip_address
             )
             
+            if pending_request:
+                pending_request.status = 'failed'
+                pending_request.save()
+            
             return Response(
-                {"detail": f"Error executing change: {str(e)}", "error": "execution_error"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"detail": error_msg, "error": "client_not_available"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
+        
+        # The PLC write, ControlState update and history row happen in the ingest
+        # process (roams_opcua_mgr/write_queue.py); this request only records the job
+        job = submit_write(
+            control_state.node,
+            new_value,
+            kind='control_change',
+            requested_by=requested_by_user,
+            control_state=control_state,
+            control_request=pending_request,
+            reason=reason,
+            ip_address=ip_address,
+        )
+        
+        logger.info(
+            f"📮 [{control_state.node.tag_name}] Change to {new_value} queued as job {job.pk} "
+            f"by {requested_by_user.username}"
+        )
+        
+        return Response(
+            {
+                "message": "Control state change queued",
+                "job_id": str(job.pk),
+                "status": job.status,
+                "status_url": reverse('write-job-detail', args=[job.pk], request=self.request),
+                "request_id": pending_request.id if pending_request else None,
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
     
     @action(detail=True, methods=['get'])
     def history(self, request, pk=None):
@@ -364,3 +325,26 @@ class ControlStateRequestViewSet(viewsets.ReadOnlyModelViewSet):
         if self.request.user.is_staff:
             return ControlStateRequest.objects.all()
         return ControlStateRequest.objects.filter(requested_by=self.request.user)
+
+
+class ControlWriteJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status of queued PLC writes (node writes and control changes).
+    
+    GET /api/write-jobs/{job_id}/
+    GET /api/write-jobs/?batch_id={batch_id}   (every node of a bulk write)
+    """
+    
+    queryset = ControlWriteJob.objects.select_related('station', 'node', 'requested_by')
+    serializer_class = ControlWriteJobSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['station', 'node', 'kind', 'status', 'control_state', 'batch_id']
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    
+    def get_queryset(self):
+        """Users only see their own jobs; admins see all"""
+        if self.request.user.is_staff:
+            return self.queryset
+        return self.queryset.filter(requested_by=self.request.user)
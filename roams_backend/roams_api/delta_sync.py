@@ -0,0 +1,121 @@
+"""
+Delta sync ("changes since") for list endpoints.
+
+A client keeps a local copy of a list and refreshes it with `?since=<token>`,
+getting back only the rows created, updated or deleted after the token:
+
+    GET /api/breaches/?since=MTcxODAwMDAwMDAwMDAwMA
+    {"token": "...", "changed": [...], "deleted": [12, 13], "reset": false}
+
+Tokens come from a previous delta response or from the X-Sync-Token header of
+an ordinary list response. Changed rows are found through the model's
+`updated_at` (auto_now), deleted ones through SyncTombstone rows.
+
+`reset: true` means the token can't be answered incrementally (older than the
+tombstone retention, or more than max_sync_rows changes): reload the full list.
+
+Every new token lies SYNC_LAG in the past, so rows saved by transactions that
+were still open when the token was issued are picked up by the next sync.
+Rows near the boundary may therefore be sent twice; apply them as upserts.
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from roams_opcua_mgr.models import SyncTombstone
+from roams_opcua_mgr.models.sync_model import SYNC_TOMBSTONE_RETENTION_DAYS
+from roams_opcua_mgr.sync_tombstones import delete_with_tombstones
+
+SYNC_LAG = timedelta(seconds=10)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def encode_sync_token(moment):
+    micros = (moment - _EPOCH) // _MICROSECOND
+    return base64.urlsafe_b64encode(str(micros).encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_sync_token(token):
+    """Return the aware datetime a token stands for; raise ValidationError if malformed."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        micros = int(base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii'))
+        return _EPOCH + micros * _MICROSECOND
+    except (TypeError, ValueError, OverflowError, UnicodeError, binascii.Error):
+        raise ValidationError({'since': 'Invalid sync token'})
+
+
+class DeltaSyncMixin:
+    """
+    Add `?since=<token>` to a viewset's list action.
+
+    Filters from the query string (station, node, ...) apply to changed rows as
+    usual; deleted ids are not filtered, since a tombstone no longer knows its
+    station. Clients simply ignore ids they don't hold. Deletes through the
+    viewset leave the tombstones (sync_tombstones.delete_with_tombstones).
+    """
+    sync_field = 'updated_at'
+    sync_query_param = 'since'
+    sync_header = 'X-Sync-Token'
+    max_sync_rows = 5000
+
+    def list(self, request, *args, **kwargs):
+        # Taken before any query, so nothing committed after it can be missed
+        token = encode_sync_token(timezone.now() - SYNC_LAG)
+
+        since = request.query_params.get(self.sync_query_param)
+        if since is None:
+            response = super().list(request, *args, **kwargs)
+            response[self.sync_header] = token
+            return response
+
+        since = decode_sync_token(since)
+        if since < timezone.now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+            return self._sync_reset()
+
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.filter(**{f'{self.sync_field}__gt': since}).order_by(self.sync_field, 'id')
+        changed = self._serialize_changed(queryset)
+        if changed is None:
+            return self._sync_reset()
+
+        deleted = SyncTombstone.objects.filter(
+            model_label=queryset.model._meta.label_lower,
+            deleted_at__gt=since,
+        ).values_list('object_id', flat=True).distinct()
+
+        response = Response({
+            'token': token,
+            'changed': changed,
+            'deleted': list(deleted),
+            'reset': False,
+        })
+        response[self.sync_header] = token
+        return response
+
+    def perform_destroy(self, instance):
+        delete_with_tombstones(type(instance).objects.filter(pk=instance.pk))
+
+    def _serialize_changed(self, queryset):
+        """Serialize at most max_sync_rows rows, or return None if there are more."""
+        fast_serializer = getattr(self, 'fast_serializer_class', None)
+        if fast_serializer is not None:
+            rows = list(fast_serializer.values(queryset)[:self.max_sync_rows + 1])
+            if len(rows) > self.max_sync_rows:
+                return None
+            return fast_serializer.serialize(rows)
+
+        rows = list(queryset[:self.max_sync_rows + 1])
+        if len(rows) > self.max_sync_rows:
+            return None
+        return self.get_serializer(rows, many=True).data
+
+    def _sync_reset(self):
+        return Response({'token': None, 'changed': [], 'deleted': [], 'reset': True})
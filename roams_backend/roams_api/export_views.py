@@ -0,0 +1,243 @@
+"""
+Bulk export endpoints - stream readings, threshold breaches and alarms as CSV or NDJSON.
+
+Rows are read with values_list().iterator(), i.e. a Postgres server-side cursor,
+and written out one chunk at a time, so memory use stays flat no matter how
+large the range is and the first bytes reach the client immediately.
+
+Exports have no overall time limit: gunicorn runs gthread workers, whose
+`timeout` only covers a stuck worker, and nginx's proxy_read_timeout (300s)
+only applies between two chunks. A restart or deploy still ends running
+exports after gunicorn's graceful_timeout (gunicorn_config.py); narrow the
+range (from/to, station, node) for exports that must not be interrupted.
+"""
+
+import csv
+import io
+import json
+import logging
+from dateutil import parser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from roams_opcua_mgr.models import OpcUaReadLog, ThresholdBreach, AlarmLog
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 5000
+EXPORT_OUTPUTS = {
+    # output -> (content type, file extension)
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+# Export definitions: (column name, values_list path) plus the lookups used for filtering
+READING_EXPORT = {
+    "name": "readings",
+    "columns": [
+        ("id", "id"),
+        ("timestamp", "timestamp"),
+        ("station", "client_config__station_name"),
+        ("node_id", "node__node_id"),
+        ("parameter", "node__tag_name__name"),
+        ("value", "value"),
+    ],
+    "station_lookup": "client_config__station_name",
+    "node_lookup": "node_id__in",
+}
+
+BREACH_EXPORT = {
+    "name": "breaches",
+    "columns": [
+        ("id", "id"),
+        ("timestamp", "timestamp"),
+        ("station", "node__client_config__station_name"),
+        ("node_id", "node__node_id"),
+        ("parameter", "node__tag_name__name"),
+        ("value", "value"),
+        ("level", "level"),
+        ("acknowledged", "acknowledged"),
+        ("acknowledged_by", "acknowledged_by"),
+        ("acknowledged_at", "acknowledged_at"),
+    ],
+    "station_lookup": "node__client_config__station_name",
+    "node_lookup": "node_id__in",
+}
+
+ALARM_EXPORT = {
+    "name": "alarms",
+    "columns": [
+        ("id", "id"),
+        ("timestamp", "timestamp"),
+        ("station", "station_name"),
+        ("node_id", "node__node_id"),
+        ("parameter", "node__tag_name__name"),
+        ("severity", "severity"),
+        ("message", "message"),
+        ("acknowledged", "acknowledged"),
+    ],
+    "station_lookup": "station_name",
+    "node_lookup": "node_id__in",
+}
+
+
+def _parse_export_filters(request):
+    """
+    Read station/node/from/to/output from the query string.
+
+    Returns:
+        Dict of validated filters
+
+    Raises:
+        ValueError: If a parameter is malformed
+    """
+    output = request.GET.get("output", "csv")
+    if output not in EXPORT_OUTPUTS:
+        raise ValueError(f"output must be one of {list(EXPORT_OUTPUTS)}")
+
+    # node=1,2&node=3 -> [1, 2, 3] (OPCUANode primary keys)
+    node_ids = [
+        int(node_id)
+        for value in request.GET.getlist("node")
+        for node_id in value.split(",")
+        if node_id.strip()
+    ]
+
+    bounds = {}
+    for param in ("from", "to"):
+        value = request.GET.get(param)
+        if value:
+            dt = parser.isoparse(value)
+            bounds[param] = timezone.make_aware(dt) if dt.tzinfo is None else dt
+
+    return {
+        "output": output,
+        "station": request.GET.get("station"),
+        "node_ids": node_ids,
+        "from": bounds.get("from"),
+        "to": bounds.get("to"),
+    }
+
+
+def _iter_csv(rows, header):
+    """Encode rows as CSV, one chunk per EXPORT_CHUNK_SIZE rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _iter_ndjson(rows, header):
+    """Encode rows as newline-delimited JSON objects, one chunk per EXPORT_CHUNK_SIZE rows."""
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(header, row))))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            lines.append("")
+            yield "\n".join(lines)
+            lines = []
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+def _stream_export(queryset, fields, header, output):
+    """
+    Generator behind the StreamingHttpResponse.
+
+    The server-side cursor is opened inside a transaction: behind PgBouncer in
+    transaction pooling mode a cursor only lives as long as its transaction,
+    and outside one Django would declare it WITH HOLD (materialised up front).
+    """
+    encode = _iter_csv if output == "csv" else _iter_ndjson
+    with transaction.atomic():
+        rows = queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        yield from encode(rows, header)
+
+
+def _export_response(request, model, export):
+    try:
+        filters = _parse_export_filters(request)
+    except (TypeError, ValueError) as e:
+        return Response(
+            {"error": f"Invalid export query: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    queryset = model.objects.all()
+    if filters["station"]:
+        queryset = queryset.filter(**{export["station_lookup"]: filters["station"]})
+    if filters["node_ids"]:
+        queryset = queryset.filter(**{export["node_lookup"]: filters["node_ids"]})
+    if filters["from"]:
+        queryset = queryset.filter(timestamp__gte=filters["from"])
+    if filters["to"]:
+        queryset = queryset.filter(timestamp__lte=filters["to"])
+    queryset = queryset.order_by("timestamp", "id")
+
+    header = [name for name, _path in export["columns"]]
+    fields = [path for _name, path in export["columns"]]
+    content_type, extension = EXPORT_OUTPUTS[filters["output"]]
+
+    filename = "_".join(
+        part for part in (export["name"], filters["station"], timezone.now().strftime("%Y%m%d%H%M%S")) if part
+    )
+    logger.info(
+        f"📤 Export {export['name']} ({filters['output']}) requested by {request.user}: "
+        f"station={filters['station']} nodes={filters['node_ids']} from={filters['from']} to={filters['to']}"
+    )
+
+    response = StreamingHttpResponse(
+        _stream_export(queryset, fields, header, filters["output"]),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    response["X-Accel-Buffering"] = "no"  # Let nginx pass chunks straight through
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_readings(request):
+    """
+    Stream OpcUaReadLog rows.
+
+    Query Parameters:
+    - station: Station name (optional)
+    - node: OPCUANode id(s), comma separated or repeated (optional)
+    - from / to: ISO datetime bounds, inclusive (optional)
+    - output: csv (default) or ndjson
+
+    Example:
+      /api/export/readings/?station=station-alpha&from=2025-01-01T00:00:00Z&to=2026-01-01T00:00:00Z&output=ndjson
+    """
+    return _export_response(request, OpcUaReadLog, READING_EXPORT)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_breaches(request):
+    """Stream ThresholdBreach rows. Same parameters as export_readings."""
+    return _export_response(request, ThresholdBreach, BREACH_EXPORT)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_alarms(request):
+    """Stream AlarmLog rows. Same parameters as export_readings."""
+    return _export_response(request, AlarmLog, ALARM_EXPORT)
@@ -0,0 +1,160 @@
+"""
+Fast read-only serializers for high-volume list endpoints.
+
+A ValuesSerializer describes its output as (field name, column, transform)
+entries. It fetches only those columns with values_list() - no model
+instances, no related objects - and turns each row tuple into a dict through
+accessors compiled once per class. Output matches the equivalent DRF
+ModelSerializer so the list endpoints can switch without frontend changes.
+
+Pair with roams_api.renderers.ORJSONRenderer for the encoding side.
+"""
+
+from operator import itemgetter
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+def round_value(value):
+    """Round numeric readings to 2 decimal places; other values pass through."""
+    try:
+        return round(float(value), 2)
+    except (TypeError, ValueError):
+        return value
+
+
+def local_datetime(value):
+    """Render like DRF's DateTimeField: in the current time zone."""
+    return timezone.localtime(value) if value is not None else None
+
+
+class ValuesSerializer:
+    """
+    Declarative values_list() serializer.
+
+    Subclasses set `fields` to a sequence of:
+        (name, column)                    - copy the column as-is
+        (name, column, transform)         - pass the column value through transform()
+        (name, {key: column or (column, transform), ...}) - nested dict
+
+    Columns use ORM lookups ("node__client_config__station_name") and may be
+    shared by several fields; each is selected once.
+    """
+    fields = ()
+
+    # Built lazily per subclass by _compile()
+    _columns = None
+    _accessors = None
+
+    @classmethod
+    def _compile(cls):
+        columns = []
+
+        def column_index(column):
+            if column not in columns:
+                columns.append(column)
+            return columns.index(column)
+
+        def accessor(spec):
+            column, transform = (spec if isinstance(spec, tuple) else (spec, None))
+            getter = itemgetter(column_index(column))
+            if transform is None:
+                return getter
+            return lambda row: transform(getter(row))
+
+        accessors = []
+        for name, spec, *transform in cls.fields:
+            if isinstance(spec, dict):
+                nested = [(key, accessor(sub_spec)) for key, sub_spec in spec.items()]
+                accessors.append((name, lambda row, nested=nested: {key: get(row) for key, get in nested}))
+            else:
+                accessors.append((name, accessor((spec, transform[0]) if transform else spec)))
+
+        cls._columns = tuple(columns)
+        cls._accessors = tuple(accessors)
+
+    @classmethod
+    def columns(cls):
+        """Columns to pass to values_list(), in row order."""
+        if cls.__dict__.get("_columns") is None:
+            cls._compile()
+        return cls._columns
+
+    @classmethod
+    def column_getter(cls, *column_names):
+        """itemgetter for raw columns of a row, e.g. the pagination key."""
+        columns = cls.columns()
+        return itemgetter(*(columns.index(column) for column in column_names))
+
+    @classmethod
+    def values(cls, queryset):
+        """Restrict a queryset to exactly the columns this serializer needs."""
+        return queryset.values_list(*cls.columns())
+
+    @classmethod
+    def serialize(cls, rows):
+        """Turn values_list() rows into a list of dicts."""
+        cls.columns()
+        accessors = cls._accessors
+        return [{name: get(row) for name, get in accessors} for row in rows]
+
+
+class FastOpcUaReadLogSerializer(ValuesSerializer):
+    """values_list() equivalent of OpcUaReadLogSerializer."""
+    fields = (
+        ("id", "id"),
+        ("client_config", "client_config_id"),
+        ("node", "node_id"),
+        ("station_name", "client_config__station_name"),
+        ("node_tag_name", "node__tag_name__name"),
+        ("node_details", {
+            "tag_name": "node__tag_name__name",
+            "node_id": "node__node_id",
+            "tag_units": "node__tag_units",
+        }),
+        ("value", "value", round_value),
+        ("timestamp", "timestamp", local_datetime),
+    )
+
+
+class FastThresholdBreachSerializer(ValuesSerializer):
+    """values_list() equivalent of ThresholdBreachSerializer."""
+    fields = (
+        ("id", "id"),
+        ("node", "node_id"),
+        ("node_id", "node_id"),
+        ("node_tag_name", "node__tag_name__name"),
+        ("station_name", "node__client_config__station_name"),
+        ("value", "value"),
+        ("level", "level"),
+        ("acknowledged", "acknowledged"),
+        ("acknowledged_by", "acknowledged_by"),
+        ("acknowledged_at", "acknowledged_at", local_datetime),
+        ("timestamp", "timestamp", local_datetime),
+        ("min_value", "node__min_value"),
+        ("max_value", "node__max_value"),
+        ("warning_level", "node__warning_level"),
+        ("critical_level", "node__critical_level"),
+    )
+
+
+class FastListMixin:
+    """
+    Serve `list` through a ValuesSerializer instead of the DRF serializer.
+    Filtering, search, ordering and keyset pagination work as before; only
+    the row fetching and dict building change. Detail and write actions keep
+    using serializer_class.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fast_serializer = self.fast_serializer_class
+        queryset = fast_serializer.values(self.filter_queryset(self.get_queryset()))
+
+        if self.paginator is not None:
+            # Rows are tuples, so tell the keyset paginator where its key columns are
+            self.paginator.row_key = fast_serializer.column_getter("timestamp", "id")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast_serializer.serialize(page))
+        return Response(fast_serializer.serialize(queryset))
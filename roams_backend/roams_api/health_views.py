@@ -37,6 +37,13 @@ def health_check_detailed(request):
     except Exception as e:
         db_error = str(e)
     
+    # Response cache hit/miss counters (roams_opcua_mgr/response_cache.py)
+    try:
+        from roams_opcua_mgr.response_cache import get_cache_metrics
+        cache_check = {'status': 'ok', 'metrics': get_cache_metrics()}
+    except Exception as e:
+        cache_check = {'status': 'error', 'error': str(e)}
+    
     total_time = round((time.time() - start_time) * 1000, 2)  # ms
     
     response_data = {
@@ -46,7 +53,8 @@ def health_check_detailed(request):
             'database': {
                 'status': 'ok' if db_healthy else 'error',
                 'latency_ms': db_latency
-            }
+            },
+            'cache': cache_check,
         },
         'response_time_ms': total_time
     }
@@ -0,0 +1,168 @@
+"""
+Keyset (cursor) pagination for time-ordered log tables.
+
+Pages are addressed by the (timestamp, id) of the last row seen instead of an
+OFFSET, and no COUNT(*) is issued, so fetching page 1000 of a year of readings
+costs the same index range scan as fetching page 1.
+
+Responses keep the {next, previous, results} shape the frontend already follows;
+`count` is omitted because computing it is exactly the full scan this avoids.
+"""
+
+import base64
+import binascii
+from collections import OrderedDict
+from urllib import parse
+
+from dateutil import parser
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate a queryset on (timestamp, id).
+
+    The sort direction follows the queryset: if its first ordering term is
+    "-timestamp" pages run newest-first, otherwise oldest-first. `id` is always
+    used as the tie-breaker so rows sharing a timestamp are never skipped or repeated.
+
+    Query Parameters:
+    - cursor: Opaque token taken from a previous `next`/`previous` link
+    - page_size (or limit): Rows per page (default: page_size, max: max_page_size)
+    """
+    page_size = 500
+    max_page_size = 5000
+    page_size_query_params = ('page_size', 'limit')
+    cursor_query_param = 'cursor'
+    timestamp_field = 'timestamp'
+    invalid_cursor_message = 'Invalid cursor'
+    # Callable returning (timestamp, id) for values_list() rows; dicts and model instances work without it
+    row_key = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.descending = self._is_descending(queryset)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2] == 'p'
+
+        # Walking backwards means scanning the index the other way and flipping the page
+        descending = self.descending != reverse
+        sign = '-' if descending else ''
+        queryset = queryset.order_by(f'{sign}{self.timestamp_field}', f'{sign}id')
+
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor[0], cursor[1], descending))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.first_key = self._key(rows[0]) if rows else None
+        self.last_key = self._key(rows[-1]) if rows else None
+        if not rows and cursor is not None:
+            # Empty page reached from a cursor: keep links pointing back at it
+            self.first_key = self.last_key = (cursor[0], cursor[1])
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        for param in self.page_size_query_params:
+            if param in request.query_params:
+                try:
+                    return _positive_int(
+                        request.query_params[param],
+                        strict=True,
+                        cutoff=self.max_page_size,
+                    )
+                except (KeyError, ValueError):
+                    pass
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_key, 'n')
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.first_key, 'p')
+
+    def decode_cursor(self, request):
+        """Return (timestamp, id, direction) from the cursor param, or None on the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            fields = parse.parse_qs(raw, keep_blank_values=True)
+            direction = fields['d'][0]
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return parser.isoparse(fields['t'][0]), int(fields['i'][0]), direction
+        except (TypeError, ValueError, KeyError, IndexError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, key, direction):
+        timestamp, pk = key
+        raw = parse.urlencode({'t': timestamp.isoformat(), 'i': pk, 'd': direction})
+        encoded = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+        url = remove_query_param(self.base_url, 'offset')
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _after(self, timestamp, pk, descending):
+        """Rows strictly after (timestamp, pk) in the scan direction.
+        The plain range term lets Postgres seek on the timestamp index; the OR only settles ties."""
+        field = self.timestamp_field
+        if descending:
+            return Q(**{f'{field}__lte': timestamp}) & (Q(**{f'{field}__lt': timestamp}) | Q(id__lt=pk))
+        return Q(**{f'{field}__gte': timestamp}) & (Q(**{f'{field}__gt': timestamp}) | Q(id__gt=pk))
+
+    def _key(self, row):
+        if self.row_key is not None:
+            return self.row_key(row)
+        if isinstance(row, dict):
+            return row[self.timestamp_field], row['id']
+        return getattr(row, self.timestamp_field), row.pk
+
+    def _is_descending(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        for term in ordering:
+            name = str(term)
+            if name.lstrip('-') == self.timestamp_field:
+                return name.startswith('-')
+        return False
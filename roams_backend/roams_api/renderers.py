@@ -0,0 +1,191 @@
+"""
+Renderers for high-volume endpoints.
+
+ORJSONRenderer is a drop-in replacement for DRF's JSONRenderer backed by orjson.
+
+The binary renderers serve telemetry responses, selected through the Accept header.
+
+Both formats carry the same columnar frame as `layout=columnar` JSON: a list of
+parameters, one int64 epoch-ms timestamp column and one float64 column per
+parameter (NaN / null where a parameter has no reading at that timestamp).
+Series line up because raw readings of one poll cycle share its timestamp and
+rollup buckets share their start. A timestamp appears twice only when a
+parameter has two readings at that millisecond; neither is dropped.
+
+- application/vnd.apache.arrow.stream  Arrow IPC stream (needs pyarrow)
+- application/x-roams-telemetry        Packed little-endian arrays, layout below
+
+Packed layout (all integers little-endian, every array 8-byte aligned so the
+browser can wrap it with Float64Array / BigInt64Array without copying):
+
+    offset 0   4 bytes   magic b"RTLM"
+    offset 4   uint16    format version (1)
+    offset 6   uint16    reserved (0)
+    offset 8   uint32    header length H in bytes
+    offset 12  H bytes   UTF-8 JSON header: parameters, rows, resolution, next, ...
+    padding to a multiple of 8
+               int64[rows]                  timestamps (epoch ms)
+               float64[rows] x parameters   one value column per parameter, in header order
+"""
+
+import json
+import struct
+import numpy as np
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+PACKED_MAGIC = b"RTLM"
+PACKED_VERSION = 1
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    application/json rendered with orjson (several times faster than the stdlib
+    encoder). Datetimes are written as ISO 8601 in their own time zone, as DRF does.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=self._default, option=orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def _default(obj):
+        # Decimals, UUIDs-in-subclasses, lazy strings, querysets, ...
+        return JSONRenderer.encoder_class().default(obj)
+
+
+class TelemetryFrame:
+    """
+    Columnar telemetry ready for a binary renderer.
+
+    Attributes:
+        parameters: List of {"id", "name"} dicts, one per value column
+        timestamps: int64 array of epoch milliseconds (ascending)
+        values: float64 array shaped (len(parameters), len(timestamps))
+        meta: Extra JSON-serialisable fields (resolution, next, previous, ...)
+    """
+
+    def __init__(self, parameters, timestamps, values, meta=None):
+        self.parameters = parameters
+        self.timestamps = timestamps
+        self.values = values
+        self.meta = meta or {}
+
+    @classmethod
+    def from_columns(cls, node_pks, timestamps_ms, values, labels, meta=None):
+        """
+        Pivot long-format columns (one entry per reading) into a frame.
+        Raw readings of a poll cycle share its timestamp, so the matrix is dense;
+        a node's second reading at the same timestamp goes into a repeated column.
+
+        Args:
+            node_pks: int64 array, node of each reading
+            timestamps_ms: int64 array, epoch ms of each reading
+            values: float64 array, NaN for readings that aren't numeric
+            labels: Dict of node pk -> display name
+        """
+        node_pks = np.asarray(node_pks, dtype=np.int64)
+        timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+
+        # Number each node's readings at one timestamp: a repeat gets its own column
+        order = np.lexsort((node_pks, timestamps_ms))
+        sorted_keys = np.stack([timestamps_ms[order], node_pks[order]], axis=1)
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+        positions = np.arange(len(order))
+        repeats = np.empty(len(order), dtype=np.int64)
+        repeats[order] = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+
+        columns, column_index = np.unique(
+            np.stack([timestamps_ms, repeats], axis=1).reshape(-1, 2), axis=0, return_inverse=True
+        )
+        nodes, node_index = np.unique(node_pks, return_inverse=True)
+
+        matrix = np.full((len(nodes), len(columns)), np.nan)
+        matrix[node_index, column_index.reshape(-1)] = values
+        timestamps = columns[:, 0]
+
+        parameters = [{"id": int(node_pk), "name": labels.get(int(node_pk))} for node_pk in nodes]
+        return cls(parameters, timestamps, matrix, meta)
+
+    @classmethod
+    def from_rows(cls, rows, meta=None):
+        """Build a frame from (node pk, datetime, label, value) rows; non-numeric values become NaN."""
+        labels = {}
+        node_pks, timestamps_ms, values = [], [], []
+        for node_pk, ts, label, value in rows:
+            labels[node_pk] = label
+            node_pks.append(node_pk)
+            timestamps_ms.append(int(ts.timestamp() * 1000))
+            values.append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan)
+        return cls.from_columns(node_pks, timestamps_ms, values, labels, meta)
+
+    def header(self):
+        return {**self.meta, "parameters": self.parameters, "rows": int(len(self.timestamps))}
+
+
+class PackedTelemetryRenderer(BaseRenderer):
+    """Render a TelemetryFrame as packed little-endian arrays (see module docstring)."""
+    media_type = "application/x-roams-telemetry"
+    format = "packed"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, TelemetryFrame):
+            # Errors and other plain payloads travel as a header-only frame
+            data = TelemetryFrame([], np.empty(0, dtype=np.int64), np.empty((0, 0)), meta=data or {})
+
+        header = json.dumps(data.header(), separators=(",", ":"), default=str).encode("utf-8")
+        prefix = PACKED_MAGIC + struct.pack("<HHI", PACKED_VERSION, 0, len(header)) + header
+        padding = b"\0" * (-len(prefix) % 8)
+        return b"".join([
+            prefix,
+            padding,
+            data.timestamps.astype("<i8", copy=False).tobytes(),
+            data.values.astype("<f8", copy=False).tobytes(),
+        ])
+
+
+class ArrowTelemetryRenderer(BaseRenderer):
+    """
+    Render a TelemetryFrame as an Arrow IPC stream: a "timestamp" column
+    (timestamp[ms, UTC]) plus one float64 column per parameter, NaN sent as null.
+    Parameter ids and the response metadata are stored in the schema metadata.
+    """
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, TelemetryFrame):
+            data = TelemetryFrame([], np.empty(0, dtype=np.int64), np.empty((0, 0)), meta=data or {})
+
+        columns = [pyarrow.array(data.timestamps, type=pyarrow.timestamp("ms", tz="UTC"))]
+        fields = [pyarrow.field("timestamp", pyarrow.timestamp("ms", tz="UTC"), nullable=False)]
+        for parameter, series in zip(data.parameters, data.values):
+            columns.append(pyarrow.array(series, type=pyarrow.float64(), from_pandas=True))
+            fields.append(pyarrow.field(
+                str(parameter["name"]), pyarrow.float64(),
+                metadata={"node_id": str(parameter["id"])},
+            ))
+
+        schema = pyarrow.schema(fields, metadata={
+            "telemetry": json.dumps(data.header(), separators=(",", ":"), default=str),
+        })
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, schema) as writer:
+            writer.write_batch(pyarrow.record_batch(columns, schema=schema))
+        return sink.getvalue().to_pybytes()
+
+
+# Arrow support is optional: only offered when pyarrow is installed
+TELEMETRY_BINARY_RENDERERS = [PackedTelemetryRenderer] + ([ArrowTelemetryRenderer] if pyarrow else [])
@@ -194,8 +194,13 @@ class TagThresholdSerializer(serializers.ModelSerializer):
         """Return tag name or add_new_tag_name"""
         return str(obj.tag_name) if obj.tag_name else obj.add_new_tag_name or "Unnamed"
     
+    # Counts come from annotate_breach_counts() on list/detail querysets;
+    # instances from elsewhere fall back to one COUNT each
+
     def get_breaches_24h(self, obj):
         """Total breaches in last 24 hours"""
+        if hasattr(obj, 'breach_count_24h'):
+            return obj.breach_count_24h
         return ThresholdBreach.objects.filter(
             node=obj,
             timestamp__gte=now() - timedelta(hours=24)
@@ -203,6 +208,8 @@ class TagThresholdSerializer(serializers.ModelSerializer):
     
     def get_breaches_critical_24h(self, obj):
         """Critical breaches in last 24 hours"""
+        if hasattr(obj, 'critical_count_24h'):
+            return obj.critical_count_24h
         return ThresholdBreach.objects.filter(
             node=obj,
             level="Critical",
@@ -211,6 +218,8 @@ class TagThresholdSerializer(serializers.ModelSerializer):
     
     def get_breaches_warning_24h(self, obj):
         """Warning breaches in last 24 hours"""
+        if hasattr(obj, 'warning_count_24h'):
+            return obj.warning_count_24h
         return ThresholdBreach.objects.filter(
             node=obj,
             level="Warning",
@@ -219,6 +228,8 @@ class TagThresholdSerializer(serializers.ModelSerializer):
     
     def get_unacknowledged_breaches(self, obj):
         """Count of unacknowledged breaches"""
+        if hasattr(obj, 'unacknowledged_count'):
+            return obj.unacknowledged_count
         return ThresholdBreach.objects.filter(
             node=obj,
             acknowledged=False
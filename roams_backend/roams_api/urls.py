@@ -10,6 +10,7 @@ from .views import (
     OpcUaReadLogViewSet, 
     UserViewSet,
     active_stations_summary,
+    live_snapshot,
     home,
     health_check,
     ActiveStationViewSet,
@@ -29,7 +30,9 @@ from .control_viewsets import (
     ControlStateHistoryViewSet,
     ControlPermissionViewSet,
     ControlStateRequestViewSet,
+    ControlWriteJobViewSet,
 )
+from .export_views import export_readings, export_breaches, export_alarms
 from .vpn_views import (
     VPNMonitorViewSet,
     L2TPVPNClientViewSet,
@@ -45,6 +48,7 @@ router.register(r'control-states', ControlStateViewSet, basename='control-state'
 router.register(r'control-state-history', ControlStateHistoryViewSet, basename='control-state-history')
 router.register(r'control-permissions', ControlPermissionViewSet, basename='control-permission')
 router.register(r'control-state-requests', ControlStateRequestViewSet, basename='control-state-request')
+router.register(r'write-jobs', ControlWriteJobViewSet, basename='write-job')
 router.register(r'vpn-monitor', VPNMonitorViewSet, basename='vpn-monitor')
 router.register(r'vpn/l2tp', L2TPVPNClientViewSet, basename='vpn-l2tp')
 router.register(r'vpn/openvpn', OpenVPNClientViewSet, basename='vpn-openvpn')
@@ -69,8 +73,12 @@ urlpatterns = [
     path("user/", current_user, name="current-user"), 
     path('tag-names/', views.tag_names, name='tag-names'),  # New endpoint for Tag Names
     path("telemetry/", telemetry_data, name="telemetry-data"),
+    path("live-snapshot/", live_snapshot, name="live-snapshot"),
     path("system-uptime/", views.system_uptime, name="system-uptime"),
     path("uptime-trend/", views.uptime_trend_graph, name="uptime-trend"),  # New uptime trend endpoint
+    path("export/readings/", export_readings, name="export-readings"),
+    path("export/breaches/", export_breaches, name="export-breaches"),
+    path("export/alarms/", export_alarms, name="export-alarms"),
 ]
 
 
@@ -2,20 +2,22 @@
 from rest_framework import serializers, viewsets, filters, permissions
 from django.contrib.auth.models import User
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, action, renderer_classes
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from .permissions import IsFrontendApp, IsAdminUser as CustomIsAdminUser, IsAdminOrReadOnly
+from .conditional import conditional_view, cached_view, ConditionalReadMixin
 from django.utils import timezone
 from django.utils.timezone import now
 import logging
 
-from roams_opcua_mgr.models import OpcUaWriteLog, ControlState
+from roams_opcua_mgr.models import OpcUaWriteLog
 
 # ✅ FIX 1: Add missing imports for write operation
-from roams_opcua_mgr.opcua_client import get_active_client
-from roams_opcua_mgr.write_data import write_station_node
+from roams_opcua_mgr.write_queue import submit_write, submit_bulk_write
+from roams_opcua_mgr.sync_tombstones import delete_with_tombstones
+from opcua import ua
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +60,28 @@ class UserSerializer(serializers.ModelSerializer):
             )
             return profile.role
 
+# Role permissions shown in Settings > Authentication (static; built once)
+ROLE_PERMISSIONS_MATRIX = {
+    'permissions': [
+        'View Dashboard',
+        'Modify Settings',
+        'Control Equipment',
+        'View Reports',
+        'User Management',
+        'System Logs',
+        'View Alarms',
+        'Acknowledge Alarms',
+    ],
+    'roles': {
+        'viewer': [True, False, False, True, False, False, True, False],
+        'technician': [True, False, True, True, False, False, True, True],
+        'operator': [True, True, True, True, False, True, True, True],
+        'admin': [True, True, True, True, True, True, True, True],
+        'superuser': [True, True, True, True, True, True, True, True],
+    }
+}
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing users.
@@ -186,26 +210,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """Get or update the permissions matrix for roles"""
         if request.method == 'GET':
             # Return default permissions matrix
-            permissions_matrix = {
-                'permissions': [
-                    'View Dashboard',
-                    'Modify Settings',
-                    'Control Equipment',
-                    'View Reports',
-                    'User Management',
-                    'System Logs',
-                    'View Alarms',
-                    'Acknowledge Alarms',
-                ],
-                'roles': {
-                    'viewer': [True, False, False, True, False, False, True, False],
-                    'technician': [True, False, True, True, False, False, True, True],
-                    'operator': [True, True, True, True, False, True, True, True],
-                    'admin': [True, True, True, True, True, True, True, True],
-                    'superuser': [True, True, True, True, True, True, True, True],
-                }
-            }
-            return Response(permissions_matrix, status=200)
+            return Response(ROLE_PERMISSIONS_MATRIX, status=200)
         
         elif request.method == 'POST':
             # Update permissions matrix (for future use)
@@ -296,6 +301,8 @@ def home(request, format=None):
 # ----------------------------
 
 @api_view(['GET'])
+@conditional_view("roams_opcua_mgr.tagname")
+@cached_view("tag-names", "roams_opcua_mgr.tagname")
 def tag_names(request):
     """
     Returns all tag names and their engineering units.
@@ -307,19 +314,242 @@ def tag_names(request):
 # ----------------------------
 # Telemetry Data API (Enhanced with Pagination)
 # ----------------------------
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
 from dateutil import parser
 from rest_framework import status
 from django.utils import timezone
-from rest_framework.pagination import PageNumberPagination
-
-class TelemetryPagination(PageNumberPagination):
+from django.db.models import BigIntegerField, Case, ExpressionWrapper, F, FloatField, When
+from django.db.models.functions import Cast, Extract
+from rest_framework.settings import api_settings
+from rest_framework.renderers import BrowsableAPIRenderer
+from .pagination import KeysetPagination
+from .renderers import ORJSONRenderer, TelemetryFrame, TELEMETRY_BINARY_RENDERERS
+from .fast_serializers import FastListMixin, FastOpcUaReadLogSerializer, FastThresholdBreachSerializer
+from .delta_sync import DeltaSyncMixin
+
+class TelemetryPagination(KeysetPagination):
     page_size = 500
-    page_size_query_param = 'page_size'
     max_page_size = 5000
 
+
+def _parameter_label(tag_name, node_id, add_new_tag_name):
+    """Display name for a node: tag name, then node_id, then the custom tag name."""
+    return tag_name or node_id or add_new_tag_name or "Unknown"
+
+
+_LABEL_FIELDS = ("node__tag_name__name", "node__node_id", "node__add_new_tag_name")
+
+
+def _epoch_ms(field):
+    """SQL expression: a timestamp column as integer epoch milliseconds."""
+    # Extract in UTC: Django would otherwise shift to TIME_ZONE before taking the epoch
+    return Cast(Extract(field, "epoch", tzinfo=dt_timezone.utc) * 1000, BigIntegerField())
+
+
+def _rollup_rows(station_name, from_dt, to_dt, tier, node_ids=None, order_by=("bucket", "node_id")):
+    """
+    values_list of (node pk, bucket, tag name, node_id, custom tag name,
+    sample_count, min, max, sum) for a station from the rollup table of `tier`.
+    """
+    from roams_opcua_mgr.rollups import get_rollup_model, get_tier_width, bucket_start
+
+    width = get_tier_width(tier)
+    queryset = get_rollup_model(tier).objects.filter(
+        node__client_config__station_name=station_name,
+        bucket__gte=bucket_start(from_dt, width),
+        bucket__lte=to_dt,
+    )
+    if node_ids:
+        queryset = queryset.filter(node_id__in=node_ids)
+    return queryset.order_by(*order_by).values_list(
+        "node_id", "bucket", *_LABEL_FIELDS,
+        "sample_count", "min_value", "max_value", "sum_value",
+    )
+
+
+def _rollup_telemetry(station_name, from_dt, to_dt, tier, node_ids=None):
+    """
+    Read pre-aggregated buckets for a station from the rollup table of `tier`.
+    Each row carries the bucket average as `value` plus min/max/count.
+    """
+    return [
+        {
+            "timestamp": bucket.isoformat(),
+            "parameter": _parameter_label(tag_name, node_id, add_new_tag_name),
+            "value": round(sum_value / sample_count, 2) if sample_count else None,
+            "min": min_value,
+            "max": max_value,
+            "count": sample_count,
+            "station": station_name,
+        }
+        for _node_pk, bucket, tag_name, node_id, add_new_tag_name, sample_count, min_value, max_value, sum_value
+        in _rollup_rows(station_name, from_dt, to_dt, tier, node_ids)
+    ]
+
+
+def _downsampled_series(station_name, from_dt, to_dt, resolution, points, method, node_ids=None):
+    """
+    Fetch one series per node at `resolution` and reduce each to at most `points`
+    points with LTTB or min/max-per-bucket downsampling (see utils/downsampling.py).
+    Non-numeric raw readings are skipped since they can't be plotted.
+
+    Yields:
+        (node pk, timestamp, label, value, min, max, count) for every kept point,
+        grouped by node; min/max/count are None for raw readings
+    """
+    from itertools import groupby
+    from operator import itemgetter
+    import numpy as np
+    from roams_opcua_mgr.rollups import to_numeric
+    from roams_opcua_mgr.utils.downsampling import downsample_indices
+
+    # Normalise both sources to (node pk, timestamp, label, value, min, max, count) rows
+    if resolution == "raw":
+        rows = OpcUaReadLog.objects.filter(
+            client_config__station_name=station_name, timestamp__range=(from_dt, to_dt)
+        )
+        if node_ids:
+            rows = rows.filter(node_id__in=node_ids)
+        rows = rows.order_by("node_id", "timestamp").values_list("node_id", "timestamp", *_LABEL_FIELDS, "value")
+        series_rows = (
+            (node_pk, ts, _parameter_label(tag_name, node_id, add_new_tag_name), numeric_value, None, None, None)
+            for node_pk, ts, tag_name, node_id, add_new_tag_name, value in rows.iterator(chunk_size=5000)
+            for numeric_value in (to_numeric(value),)
+            if numeric_value is not None
+        )
+    else:
+        rows = _rollup_rows(
+            station_name, from_dt, to_dt, resolution, node_ids, order_by=("node_id", "bucket")
+        ).filter(sample_count__gt=0)
+        series_rows = (
+            (node_pk, bucket, _parameter_label(tag_name, node_id, add_new_tag_name),
+             round(sum_value / sample_count, 2), min_value, max_value, sample_count)
+            for node_pk, bucket, tag_name, node_id, add_new_tag_name,
+                sample_count, min_value, max_value, sum_value in rows
+        )
+
+    for _node_pk, series in groupby(series_rows, key=itemgetter(0)):
+        series = list(series)
+        x = np.fromiter((row[1].timestamp() for row in series), dtype=np.float64, count=len(series))
+        y = np.fromiter((row[3] for row in series), dtype=np.float64, count=len(series))
+        for i in downsample_indices(x, y, points, method):
+            yield series[i]
+
+
+def _downsampled_telemetry(station_name, from_dt, to_dt, resolution, points, method, node_ids=None):
+    """Downsampled points as telemetry rows, merged across parameters in time order."""
+    from operator import itemgetter
+
+    data = []
+    for _node_pk, ts, label, value, min_value, max_value, sample_count in _downsampled_series(
+        station_name, from_dt, to_dt, resolution, points, method, node_ids
+    ):
+        point = {
+            "timestamp": ts.isoformat(),
+            "parameter": label,
+            "value": value,
+            "station": station_name,
+        }
+        if resolution != "raw":
+            point.update({"min": min_value, "max": max_value, "count": sample_count})
+        data.append(point)
+
+    data.sort(key=itemgetter("timestamp"))
+    return data
+
+
+def _columnar_telemetry(rows):
+    """
+    Pivot (node pk, timestamp, label, value) rows into the columnar layout:
+    each parameter is listed once, timestamps are epoch milliseconds shared by
+    every series, and values[i][j] is parameter i at timestamps[j] (null if absent).
+
+    Series line up because rollup buckets share their start and raw readings
+    share their poll cycle's timestamp (read_data.py). A parameter with two
+    readings at the same millisecond gets that timestamp twice, one column per
+    reading, so nothing is overwritten.
+    """
+    parameters = {}
+    cells = []
+    seen = {}  # (node pk, ts_ms) -> readings so far
+    for node_pk, ts, label, value in rows:
+        ts_ms = int(ts.timestamp() * 1000)
+        if node_pk not in parameters:
+            parameters[node_pk] = {"id": node_pk, "name": label}
+        repeat = seen.get((node_pk, ts_ms), 0)
+        seen[(node_pk, ts_ms)] = repeat + 1
+        cells.append((node_pk, (ts_ms, repeat), value))
+
+    columns = sorted({column for _node_pk, column, _value in cells})
+    column_index = {column: i for i, column in enumerate(columns)}
+    param_index = {node_pk: i for i, node_pk in enumerate(parameters)}
+
+    values = [[None] * len(columns) for _ in parameters]
+    for node_pk, column, value in cells:
+        values[param_index[node_pk]][column_index[column]] = value
+
+    return {
+        "parameters": list(parameters.values()),
+        "timestamps": [ts_ms for ts_ms, _repeat in columns],
+        "values": values,
+    }
+
+
+def _node_labels(node_pks):
+    """Display names for a set of node ids, fetched in one query."""
+    return {
+        node_pk: _parameter_label(tag_name, node_id, add_new_tag_name)
+        for node_pk, tag_name, node_id, add_new_tag_name in OPCUANode.objects.filter(
+            id__in=set(node_pks)
+        ).values_list("id", "tag_name__name", "node_id", "add_new_tag_name")
+    }
+
+
+def _telemetry_frame(rows, meta):
+    """
+    TelemetryFrame from (node pk, epoch ms, float value) rows whose types were
+    already produced by Postgres, so the columns go straight into numpy arrays.
+    """
+    import numpy as np
+
+    rows = list(rows)
+    array = np.array(rows, dtype=np.float64).reshape(len(rows), 3)
+    node_pks = array[:, 0].astype(np.int64)
+    return TelemetryFrame.from_columns(
+        node_pks, array[:, 1].astype(np.int64), array[:, 2],
+        _node_labels(np.unique(node_pks).tolist()), meta=meta,
+    )
+
+
+def _telemetry_response(request, meta, data=None, columns=None):
+    """
+    Build the telemetry Response in the layout/format the client asked for.
+
+    Args:
+        meta: Leading fields (resolution, layout, next, previous, ...)
+        data: Row-layout results (list of dicts)
+        columns: (node pk, timestamp, label, value) rows for the columnar layout,
+            rendered as a TelemetryFrame when a binary renderer was negotiated,
+            or a ready-made TelemetryFrame
+    """
+    if isinstance(columns, TelemetryFrame):
+        body = columns
+    elif columns is not None and getattr(request.accepted_renderer, "render_style", None) == "binary":
+        body = TelemetryFrame.from_rows(columns, meta=meta)
+    elif columns is not None:
+        body = {**meta, **_columnar_telemetry(columns)}
+    else:
+        body = {**meta, "results": data}
+        if meta.get("next") is None and meta.get("previous") is None:
+            body["count"] = len(data)
+    response = Response(body, status=status.HTTP_200_OK)
+    response["X-Telemetry-Resolution"] = meta["resolution"]
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])  # Temporarily removed IsFrontendApp to debug 403
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + TELEMETRY_BINARY_RENDERERS)
 def telemetry_data(request):
     """
     Returns telemetry data filtered by station name and optional date range.
@@ -329,33 +559,134 @@ def telemetry_data(request):
     - station: Station name (required)
     - from: ISO datetime string (optional)
     - to: ISO datetime string (optional)
-    - page: Page number (default: 1)
-    - page_size: Items per page (default: 100, max: 1000)
+    - cursor: Opaque cursor from a previous response's next/previous link
+    - page_size: Items per page (default: 500, max: 5000)
+    - points: Target number of points per parameter (optional, needs from/to).
+      Picks the coarsest rollup tier (1d, 1h, 1m) that still yields this many
+      buckets over the range, or raw readings when none does.
+    - resolution: Force a tier instead: raw, 1m, 1h or 1d (optional, needs from/to)
+    - downsample: lttb (default) or minmax. With `points`, every parameter's series
+      is reduced server-side to at most `points` points and returned unpaginated.
+    - nodes: Comma separated OPCUANode ids to include (optional, default: all)
+    - layout: rows (default) or columnar. Columnar sends each parameter once
+      ("parameters"), one shared epoch-ms "timestamps" array and one aligned
+      array per parameter in "values" (null where a parameter has no reading).
+      Raw readings of one poll cycle share its timestamp, so series line up;
+      a timestamp repeats only when a parameter has two readings at it.
+    
+    The chosen tier is returned as "resolution" in the body and in the
+    X-Telemetry-Resolution header.
+    
+    Binary responses (see roams_api/renderers.py) are chosen with the Accept header:
+    application/x-roams-telemetry (packed arrays) or application/vnd.apache.arrow.stream
+    (Arrow IPC, when pyarrow is installed). They always use the columnar layout.
     
     Example frontend call:
-      /api/telemetry/?station=station-alpha&from=2025-10-01T00:00:00Z&to=2025-10-02T00:00:00Z&page=1&page_size=100
+      /api/telemetry/?station=station-alpha&from=2025-10-01T00:00:00Z&to=2025-10-02T00:00:00Z&page_size=100
+      /api/telemetry/?station=station-alpha&from=2025-07-01T00:00:00Z&to=2025-10-01T00:00:00Z&points=500&downsample=minmax
+      /api/telemetry/?station=station-alpha&from=2025-10-01T00:00:00Z&to=2025-10-02T00:00:00Z&layout=columnar&nodes=12,15
     """
     station_name = request.GET.get("station")
     from_date = request.GET.get("from")
     to_date = request.GET.get("to")
     
-    # Debug logging to file
-    with open('/tmp/telemetry_debug.log', 'a') as f:
-        f.write(f"🔍 Telemetry API: station={station_name}, from={from_date}, to={to_date}\n")
-    
-    print(f"🔍 Telemetry API called: station={station_name}, from={from_date}, to={to_date}")
+    logger.debug(f"🔍 Telemetry API called: station={station_name}, from={from_date}, to={to_date}")
 
     if not station_name:
         return Response({"error": "Missing required 'station' parameter"}, status=400)
 
-    queryset = OpcUaReadLog.objects.select_related("node", "client_config")
+    from roams_opcua_mgr.rollups import NUMERIC_VALUE_REGEX, to_numeric
+
+    layout = request.GET.get("layout", "rows")
+    binary = getattr(request.accepted_renderer, "render_style", None) == "binary"
+    try:
+        if layout not in ("rows", "columnar"):
+            raise ValueError("layout must be 'rows' or 'columnar'")
+        # nodes=1,2,3 -> OPCUANode primary keys
+        node_ids = [int(node_id) for node_id in request.GET.get("nodes", "").split(",") if node_id.strip()]
+    except ValueError as e:
+        return Response(
+            {"error": f"Invalid telemetry query: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if binary:
+        layout = "columnar"
+
+    points = request.GET.get("points")
+    resolution = request.GET.get("resolution")
+    if (points or resolution) and from_date and to_date:
+        from roams_opcua_mgr.rollups import ROLLUP_TIERS, plan_resolution
+        from roams_opcua_mgr.utils.downsampling import DOWNSAMPLE_METHODS
+        downsample = request.GET.get("downsample", "lttb")
+        try:
+            if points:
+                points = int(points)
+                if points < 1:
+                    raise ValueError("points must be a positive integer")
+            if downsample not in DOWNSAMPLE_METHODS:
+                raise ValueError(f"downsample must be one of {list(DOWNSAMPLE_METHODS)}")
+            from_dt = parser.isoparse(from_date)
+            to_dt = parser.isoparse(to_date)
+            if from_dt.tzinfo is None:
+                from_dt = timezone.make_aware(from_dt)
+            if to_dt.tzinfo is None:
+                to_dt = timezone.make_aware(to_dt)
+            if resolution:
+                valid_tiers = ["raw"] + [tier for tier, _model_name, _width in ROLLUP_TIERS]
+                if resolution not in valid_tiers:
+                    raise ValueError(f"resolution must be one of {valid_tiers}")
+            else:
+                resolution = plan_resolution(from_dt, to_dt, points)
+        except (TypeError, ValueError) as e:
+            return Response(
+                {"error": f"Invalid telemetry query: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if points:
+            meta = {
+                "resolution": resolution,
+                "downsample": downsample,
+                "points": points,
+                "layout": layout,
+                "next": None,
+                "previous": None,
+            }
+            if layout == "columnar":
+                columns = (
+                    (node_pk, ts, label, value)
+                    for node_pk, ts, label, value, _min, _max, _count in _downsampled_series(
+                        station_name, from_dt, to_dt, resolution, points, downsample, node_ids
+                    )
+                )
+                return _telemetry_response(request, meta, columns=columns)
+            data = _downsampled_telemetry(station_name, from_dt, to_dt, resolution, points, downsample, node_ids)
+            return _telemetry_response(request, meta, data=data)
+
+        if resolution != "raw":
+            meta = {"resolution": resolution, "layout": layout, "next": None, "previous": None}
+            if binary:
+                rows = _rollup_rows(station_name, from_dt, to_dt, resolution, node_ids).filter(
+                    sample_count__gt=0
+                ).annotate(
+                    ts_ms=_epoch_ms("bucket"),
+                    avg_value=ExpressionWrapper(F("sum_value") / F("sample_count"), output_field=FloatField()),
+                ).values_list("node_id", "ts_ms", "avg_value")
+                return _telemetry_response(request, meta, columns=_telemetry_frame(rows, meta))
+            if layout == "columnar":
+                columns = (
+                    (node_pk, bucket, _parameter_label(tag_name, node_id, add_new_tag_name),
+                     round(sum_value / sample_count, 2) if sample_count else None)
+                    for node_pk, bucket, tag_name, node_id, add_new_tag_name, sample_count, _min, _max, sum_value
+                    in _rollup_rows(station_name, from_dt, to_dt, resolution, node_ids)
+                )
+                return _telemetry_response(request, meta, columns=columns)
+            data = _rollup_telemetry(station_name, from_dt, to_dt, resolution, node_ids)
+            return _telemetry_response(request, meta, data=data)
 
-    # Filter by station
-    queryset = queryset.filter(client_config__station_name=station_name)
-    count_after_station = queryset.count()
-    with open('/tmp/telemetry_debug.log', 'a') as f:
-        f.write(f"📊 After station filter: {count_after_station} records\n")
-    print(f"📊 After station filter: {count_after_station} records")
+    queryset = OpcUaReadLog.objects.filter(client_config__station_name=station_name)
+    if node_ids:
+        queryset = queryset.filter(node_id__in=node_ids)
 
     # Date range
     if from_date and to_date:
@@ -368,80 +699,118 @@ def telemetry_data(request):
             if to_dt.tzinfo is None:
                 to_dt = timezone.make_aware(to_dt)
             queryset = queryset.filter(timestamp__range=(from_dt, to_dt))
-            count_after_date = queryset.count()
-            with open('/tmp/telemetry_debug.log', 'a') as f:
-                f.write(f"📅 After date filter: {count_after_date} records\n")
-            print(f"📅 After date filter ({from_dt} to {to_dt}): {count_after_date} records")
         except Exception as e:
-            print("⚠️ Invalid date range:", e)
+            logger.debug(f"⚠️ Invalid date range: {e}")
             return Response(
                 {"error": f"Invalid date range format: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-    if not queryset.exists():
-        with open('/tmp/telemetry_debug.log', 'a') as f:
-            f.write(f"❌ No data found for station '{station_name}'\n")
-        print(f"❌ No data found for station '{station_name}'")
-        return Response([], status=status.HTTP_200_OK)
-
-    # ✅ FIX 3: Apply pagination instead of hard limit
+    # Keyset pagination on (timestamp, id): no COUNT, no OFFSET
     queryset = queryset.order_by("timestamp")
-    
-    # Get pagination settings
+    if binary:
+        # Epoch ms and the float cast are computed by Postgres; no datetimes or labels per row
+        queryset = queryset.annotate(
+            ts_ms=_epoch_ms("timestamp"),
+            numeric_value=Case(
+                When(value__regex=NUMERIC_VALUE_REGEX, then=Cast("value", FloatField())),
+                default=None,
+                output_field=FloatField(),
+            ),
+        ).values("id", "timestamp", "node_id", "ts_ms", "numeric_value")
+    else:
+        queryset = queryset.values("id", "node_id", "timestamp", "value", *_LABEL_FIELDS)
     paginator = TelemetryPagination()
     page = paginator.paginate_queryset(queryset, request)
-    
-    if page is not None:
-        data = []
+
+    meta = {
+        "resolution": "raw",
+        "layout": layout,
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    }
+    logger.debug(f"✅ Returning {len(page)} records via pagination")
+
+    if binary:
+        rows = ((log["node_id"], log["ts_ms"], log["numeric_value"]) for log in page)
+        return _telemetry_response(request, meta, columns=_telemetry_frame(rows, meta))
+
+    if layout == "columnar":
+        columns = []
         for log in page:
-            if not log.node or not log.client_config:
-                continue
+            numeric_value = to_numeric(log["value"])
+            columns.append((
+                log["node_id"],
+                log["timestamp"],
+                _parameter_label(log["node__tag_name__name"], log["node__node_id"], log["node__add_new_tag_name"]),
+                # Keep non-numeric readings (e.g. "ON") as-is rather than dropping them
+                numeric_value if numeric_value is not None else log["value"],
+            ))
+        return _telemetry_response(request, meta, columns=columns)
+
+    data = [
+        {
+            "timestamp": log["timestamp"].isoformat(),
+            "parameter": _parameter_label(
+                log["node__tag_name__name"], log["node__node_id"], log["node__add_new_tag_name"]
+            ),
+            "value": log["value"],
+            "station": station_name,
+        }
+        for log in page
+    ]
+    return _telemetry_response(request, meta, data=data)
 
-            # ✅ FIX 4: Simplified tag_value handling (already correct)
-            tag_value = None
-            if log.node.tag_name and hasattr(log.node.tag_name, "name"):
-                tag_value = log.node.tag_name.name
-            elif log.node.tag_name:
-                tag_value = str(log.node.tag_name)
-            else:
-                tag_value = log.node.node_id or "Unknown"
-
-            data.append({
-                "timestamp": log.timestamp.isoformat(),
-                "parameter": tag_value or log.node.add_new_tag_name or "Unknown",
-                "value": log.value,
-                "station": log.client_config.station_name,
-            })
-        
-        with open('/tmp/telemetry_debug.log', 'a') as f:
-            f.write(f"✅ Returning {len(data)} records via pagination\n")
-        print(f"✅ Returning {len(data)} records via pagination")
-        return paginator.get_paginated_response(data)
+
+
+# ----------------------------
+# Live Value Snapshot (Redis)
+# ----------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def live_snapshot(request):
+    """
+    Latest value, timestamp and quality of every node of one or more stations.
+    Served from the Redis hashes the ingest loop publishes each read cycle,
+    in a single round trip - PostgreSQL is not queried.
     
-    # Fallback if pagination fails
-    data = []
-    for log in queryset[:5000]:  # Keep safety limit
-        if not log.node or not log.client_config:
-            continue
-
-        tag_value = None
-        if log.node.tag_name and hasattr(log.node.tag_name, "name"):
-            tag_value = log.node.tag_name.name
-        elif log.node.tag_name:
-            tag_value = str(log.node.tag_name)
-        else:
-            tag_value = log.node.node_id or "Unknown"
+    Query Parameters:
+    - station: Station name(s), comma separated or repeated (required)
+    
+    The ETag changes whenever any requested station publishes; send it back
+    as If-None-Match to get 304 Not Modified while nothing has changed.
+    
+    Example:
+      /api/live-snapshot/?station=station-alpha,station-beta
+    """
+    from roams_opcua_mgr.live_snapshot import get_snapshot, snapshot_etag
 
-        data.append({
-            "timestamp": log.timestamp.isoformat(),
-            "parameter": tag_value or log.node.add_new_tag_name or "Unknown",
-            "value": log.value,
-            "station": log.client_config.station_name,
-        })
+    station_names = sorted({
+        name.strip()
+        for value in request.GET.getlist("station")
+        for name in value.split(",")
+        if name.strip()
+    })
+    if not station_names:
+        return Response({"error": "Missing required 'station' parameter"}, status=400)
 
-    return Response(data, status=status.HTTP_200_OK)
+    try:
+        snapshot = get_snapshot(station_names)
+    except Exception as e:
+        logger.error(f"❌ Live snapshot unavailable: {e}")
+        return Response(
+            {"error": f"Live values unavailable: {str(e)}"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
 
+    etag = snapshot_etag(snapshot)
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response({"stations": snapshot}, status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
 
 
 # ----------------------------
@@ -449,6 +818,8 @@ def telemetry_data(request):
 # ----------------------------
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsFrontendApp])
+@conditional_view("roams_opcua_mgr.opcuaclientconfig")
+@cached_view("active-stations", "roams_opcua_mgr.opcuaclientconfig")
 def active_stations_summary(request):
     try:
         from roams_opcua_mgr.opcua_client import get_total_active_stations, get_total_connected_stations
@@ -467,7 +838,24 @@ def active_stations_summary(request):
 # ----------------------------
 # OPC UA ViewSets
 # ----------------------------
-class OPCUANodeViewSet(viewsets.ModelViewSet):
+BULK_WRITE_MAX_NODES = 200
+WRITABLE_ACCESS_LEVELS = ["Read_write", "Write_only"]
+
+
+def convert_write_value(data_type, value):
+    """Convert a request value to the node's data type; raises TypeError/ValueError."""
+    if data_type == "Boolean":
+        return bool(int(value))
+    if data_type in ["Int16", "Int32", "Int64", "UInt16", "UInt32", "UInt64", "Integer", "Byte"]:
+        return int(value)
+    if data_type in ["Float", "Double"]:
+        return float(value)
+    return value
+
+
+class OPCUANodeViewSet(DeltaSyncMixin, viewsets.ModelViewSet):
+    # ?since= reports configuration changes: ingest saves don't touch updated_at,
+    # live values come from /api/live-snapshot/ and ws/live/ instead
     queryset = OPCUANode.objects.all()
     serializer_class = OPCUANodeSerializer
     permission_classes = [IsAuthenticated, IsFrontendApp]
@@ -502,7 +890,10 @@ class OPCUANodeViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def write(self, request, pk=None):
-        """Write a value to an OPC UA node (supports Boolean, Integer, Float)"""
+        """
+        Queue a write to an OPC UA node (supports Boolean, Integer, Float).
+        Returns 202 with a job id; poll status_url or watch ws/live/ for the result.
+        """
         try:
             logger.info(f"📝 Write request started for node pk={pk}")
             
@@ -536,7 +927,7 @@ class OPCUANodeViewSet(viewsets.ModelViewSet):
             
             # Step 4: Validate access level (allow Read_write and Write_only)
             access_level = getattr(node, 'access_level', 'Read_write')
-            if access_level not in ["Read_write", "Write_only"]:
+            if access_level not in WRITABLE_ACCESS_LEVELS:
                 logger.error(f"❌ Node {node.node_id} access level is {access_level}")
                 return Response(
                     {"error": f"Node is not writable (access level: {access_level})"},
@@ -563,38 +954,18 @@ class OPCUANodeViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_503_SERVICE_UNAVAILABLE,
                 )
             
-            # Step 7: Get active OPC UA client (UaExpert-style connection check)
-            logger.info(f"🔍 Getting active client for {station_name}")
-            try:
-                client = get_active_client(station)
-                if not client:
-                    logger.error(f"❌ No active client for {station_name}")
-                    return Response(
-                        {"error": f"Station {station_name} is not connected. Please check OPC UA server."},
-                        status=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    )
-                logger.info(f"✅ Got active client for {station_name}")
-            except Exception as e:
-                logger.error(f"❌ Error getting active client: {e}", exc_info=True)
+            # Step 7: The ingest process owns the OPC UA session; refuse early if it is down
+            if station.connection_status != "Connected":
+                logger.error(f"❌ Station {station_name} is {station.connection_status}")
                 return Response(
-                    {"error": f"Failed to connect to OPC UA server: {str(e)}"},
+                    {"error": f"Station {station_name} is not connected. Please check OPC UA server."},
                     status=status.HTTP_503_SERVICE_UNAVAILABLE,
                 )
             
             # Step 8: Convert value based on data type (UaExpert-style type handling)
             try:
-                if data_type == "Boolean":
-                    write_value = bool(int(value))
-                    logger.info(f"✅ Boolean: {value} → {write_value}")
-                elif data_type in ["Int16", "Int32", "Int64", "UInt16", "UInt32", "UInt64", "Integer", "Byte"]:
-                    write_value = int(value)
-                    logger.info(f"✅ Integer: {value} → {write_value}")
-                elif data_type in ["Float", "Double"]:
-                    write_value = float(value)
-                    logger.info(f"✅ Float: {value} → {write_value}")
-                else:
-                    write_value = value
-                    logger.info(f"⚠️ Unknown type {data_type}, using raw value: {write_value}")
+                write_value = convert_write_value(data_type, value)
+                logger.info(f"✅ {data_type}: {value} → {write_value}")
             except (TypeError, ValueError) as e:
                 logger.error(f"❌ Cannot convert value {value} to {data_type}: {e}")
                 return Response(
@@ -602,63 +973,29 @@ class OPCUANodeViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             
-            # Step 9: Write to OPC UA node (like UaExpert does)
-            logger.info(f"📤 Writing to M241 PLC: {node.tag_name} = {write_value}")
-            try:
-                success = write_station_node(client, node, write_value, command)
-                if not success:
-                    logger.error(f"❌ Write failed for {node.node_id}")
-                    return Response(
-                        {"error": f"Write operation failed for {node.tag_name}. Check server permissions."},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-                logger.info(f"✅ Successfully wrote to {node.tag_name}")
-            except Exception as e:
-                logger.error(f"❌ Write exception: {e}", exc_info=True)
-                return Response(
-                    {"error": f"Write failed: {str(e)}"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-            
-            # Update ControlState to track current value (only for boolean controls)
-            if data_type == "Boolean" and getattr(node, 'is_boolean_control', False):
-                try:
-                    control_state, created = ControlState.objects.get_or_create(
-                        node=node,
-                        defaults={
-                            'current_value': write_value,
-                            'last_changed_by': request.user if request.user.is_authenticated else None
-                        }
-                    )
-                    
-                    # Only update if value actually changed
-                    if not created and control_state.current_value != write_value:
-                        control_state.current_value = write_value
-                        control_state.last_changed_by = request.user if request.user.is_authenticated else None
-                        control_state.save()
-                        logger.info(f"✅ Updated ControlState for node {node.id}")
-                    elif created:
-                        logger.info(f"✅ Created ControlState for node {node.id}")
-                    else:
-                        logger.info(f"ℹ️ ControlState unchanged for node {node.id}")
-                        
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not update ControlState: {e}")
-                    # Don't fail the request since the write succeeded
-            
-            logger.info(f"✅ Write completed successfully for node {node.node_id}")
+            # Step 9: Queue the write for the station's worker in the ingest process
+            job = submit_write(
+                node,
+                write_value,
+                command=command,
+                requested_by=request.user,
+                ip_address=request.META.get('REMOTE_ADDR'),
+            )
+            logger.info(f"📮 Write to {node.tag_name} queued as job {job.pk}")
             
-            # Success response
             return Response({
                 "success": True,
-                "message": f"✅ Successfully wrote {write_value} to {node.tag_name}",
+                "message": f"Write of {write_value} to {node.tag_name} queued",
+                "job_id": str(job.pk),
+                "status": job.status,
+                "status_url": reverse('write-job-detail', args=[job.pk], request=request),
                 "node_id": node.node_id,
-                "tag_name": node.tag_name,
+                "tag_name": str(node.tag_name),
                 "value": write_value,
                 "data_type": data_type,
                 "command": command,
-                "timestamp": now().isoformat(),
-            }, status=status.HTTP_200_OK)
+                "timestamp": job.created_at.isoformat(),
+            }, status=status.HTTP_202_ACCEPTED)
         
         except Exception as e:
             logger.error(f"❌ Unexpected error in write endpoint: {str(e)}", exc_info=True)
@@ -667,9 +1004,124 @@ class OPCUANodeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=False, methods=['post'])
+    def bulk_write(self, request):
+        """
+        Queue writes to several nodes of one station, sent as a single OPC UA Write call.
+
+        POST /api/opcua_node/bulk_write/
+        {
+            "writes": [{"node": 12, "value": 0}, {"node": 13, "value": 45.5}],
+            "command": "STOP",
+            "reason": "Stop all pumps"
+        }
+
+        Every target is validated before anything is queued. Returns 202 with a
+        batch_id; each node's OPC UA status code is reported by
+        /api/write-jobs/?batch_id=<batch_id> once the batch ran.
+        """
+        writes = request.data.get('writes')
+        command = request.data.get('command', 'WRITE')
+        reason = request.data.get('reason', '')
+
+        if not isinstance(writes, list) or not writes:
+            return Response(
+                {"error": "'writes' must be a non-empty list of {node, value}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(writes) > BULK_WRITE_MAX_NODES:
+            return Response(
+                {"error": f"At most {BULK_WRITE_MAX_NODES} nodes per bulk write"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # One query for every target
+        node_pks = [item.get('node') if isinstance(item, dict) else None for item in writes]
+        nodes = OPCUANode.objects.select_related('client_config', 'tag_name').in_bulk(
+            [pk for pk in node_pks if isinstance(pk, int)]
+        )
+
+        errors = []
+        targets = []
+        seen = set()
+        for index, item in enumerate(writes):
+            node = nodes.get(node_pks[index])
+            if node is None:
+                errors.append({"index": index, "node": node_pks[index], "error": "Node not found"})
+                continue
+            if node.pk in seen:
+                errors.append({"index": index, "node": node.pk, "error": "Node listed more than once"})
+                continue
+            seen.add(node.pk)
+            if node.access_level not in WRITABLE_ACCESS_LEVELS:
+                errors.append({"index": index, "node": node.pk,
+                               "error": f"Node is not writable (access level: {node.access_level})"})
+                continue
+            try:
+                ua.NodeId.from_string(node.node_id)
+            except ua.UaStringParsingError as e:
+                errors.append({"index": index, "node": node.pk,
+                               "error": f"Invalid OPC UA node id '{node.node_id}': {e}"})
+                continue
+            if item.get('value') is None:
+                errors.append({"index": index, "node": node.pk, "error": "Missing 'value'"})
+                continue
+            try:
+                targets.append((node, convert_write_value(node.data_type, item['value'])))
+            except (TypeError, ValueError) as e:
+                errors.append({"index": index, "node": node.pk,
+                               "error": f"Invalid value '{item['value']}' for data type {node.data_type}: {e}"})
+
+        stations = {node.client_config_id for node in nodes.values()}
+        if not errors and len(stations) != 1:
+            errors.append({"error": "All nodes of a bulk write must belong to the same station"})
+        if errors:
+            return Response(
+                {"error": "Bulk write rejected, nothing was queued", "errors": errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        station = targets[0][0].client_config
+        if not station.active or station.connection_status != "Connected":
+            return Response(
+                {"error": f"Station {station.station_name} is not connected. Please check OPC UA server."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        batch_id, jobs = submit_bulk_write(
+            station,
+            targets,
+            command=command,
+            requested_by=request.user,
+            reason=reason,
+            ip_address=request.META.get('REMOTE_ADDR'),
+        )
+
+        return Response({
+            "success": True,
+            "message": f"Write of {len(jobs)} nodes on {station.station_name} queued",
+            "batch_id": str(batch_id),
+            "status_url": reverse('write-job-list', request=request) + f"?batch_id={batch_id}",
+            "station": station.station_name,
+            "command": command,
+            "jobs": [
+                {
+                    "job_id": str(job.pk),
+                    "node": job.node_id,
+                    "node_id": job.node.node_id,
+                    "tag_name": str(job.node.tag_name),
+                    "value": job.value,
+                    "status": job.status,
+                }
+                for job in jobs
+            ],
+        }, status=status.HTTP_202_ACCEPTED)
+
 
-class OpcUaClientConfigViewSet(viewsets.ModelViewSet):
+class OpcUaClientConfigViewSet(ConditionalReadMixin, viewsets.ModelViewSet):
     queryset = OpcUaClientConfig.objects.all()
+    # ⚡ Performance: 304 Not Modified while no station changed
+    conditional_models = ("roams_opcua_mgr.opcuaclientconfig",)
     serializer_class = OpcUaClientConfigSerializer
     permission_classes = [IsAuthenticated, IsFrontendApp]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -677,15 +1129,23 @@ class OpcUaClientConfigViewSet(viewsets.ModelViewSet):
     search_fields = ['station_name', 'opcua_url']
     ordering_fields = ['station_name', 'last_connected']
 
-class OpcUaReadLogViewSet(viewsets.ReadOnlyModelViewSet):
+    def perform_destroy(self, instance):
+        # Tombstones for the station's nodes, breaches and alarms (delta sync)
+        delete_with_tombstones(OpcUaClientConfig.objects.filter(pk=instance.pk))
+
+class OpcUaReadLogViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     # ⚡ Performance: Use select_related to reduce database queries
     queryset = OpcUaReadLog.objects.select_related('client_config', 'node').all().order_by('-timestamp')
     serializer_class = OpcUaReadLogSerializer
+    # ⚡ Performance: list() reads only the needed columns and renders with orjson
+    fast_serializer_class = FastOpcUaReadLogSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated, IsFrontendApp]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['client_config', 'node','timestamp']
     search_fields = ['value']
     ordering_fields = ['timestamp']
+    pagination_class = KeysetPagination
 
 class ActiveStationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = OpcUaClientConfigSerializer
@@ -700,6 +1160,8 @@ class ActiveStationViewSet(viewsets.ReadOnlyModelViewSet):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional_view("roams_opcua_mgr.opcuaclientconfig", "roams_opcua_mgr.connectionlog", time_bucket=60)
+@cached_view("system-uptime", "roams_opcua_mgr.opcuaclientconfig", "roams_opcua_mgr.connectionlog", time_bucket=60)
 def system_uptime(request):
     """
     Returns uptime percentage for all stations and the overall average.
@@ -771,10 +1233,11 @@ def uptime_trend_graph(request):
 
 from roams_opcua_mgr.models import OPCUANode, ThresholdBreach
 from .serializers import TagThresholdSerializer, ThresholdBreachSerializer
+from roams_opcua_mgr.dashboard_analytics import annotate_breach_counts
 from rest_framework.decorators import action
 
 
-class TagThresholdViewSet(viewsets.ModelViewSet):
+class TagThresholdViewSet(ConditionalReadMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing OPC UA node thresholds.
     Threshold fields are now part of OPCUANode model.
@@ -793,7 +1256,7 @@ class TagThresholdViewSet(viewsets.ModelViewSet):
     - VIEW: IsAuthenticated (any user)
     - CREATE/UPDATE/DELETE: IsAdminUser (staff only)
     """
-    queryset = OPCUANode.objects.select_related('client_config').filter(threshold_active=True)
+    queryset = OPCUANode.objects.select_related('client_config', 'tag_name').filter(threshold_active=True)
     serializer_class = TagThresholdSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -801,6 +1264,15 @@ class TagThresholdViewSet(viewsets.ModelViewSet):
     search_fields = ['tag_name__name', 'add_new_tag_name', 'node_id']
     ordering_fields = ['created_at', 'updated_at', 'severity']
     ordering = ['-updated_at']
+    # ⚡ Performance: 304 Not Modified while no node, station or breach changed;
+    # the 24h breach counts also roll over time, hence the one-minute bucket
+    conditional_models = (
+        "roams_opcua_mgr.opcuanode",
+        "roams_opcua_mgr.opcuaclientconfig",
+        "roams_opcua_mgr.tagname",
+        "roams_opcua_mgr.thresholdbreach",
+    )
+    conditional_time_bucket = 60
     
     def get_permissions(self):
         """
@@ -814,6 +1286,10 @@ class TagThresholdViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
     
+    def perform_destroy(self, instance):
+        # A threshold entry is the node itself: leave delta-sync tombstones
+        delete_with_tombstones(OPCUANode.objects.filter(pk=instance.pk))
+    
     def get_queryset(self):
         """
         Optionally filter by station via query parameter.
@@ -823,7 +1299,8 @@ class TagThresholdViewSet(viewsets.ModelViewSet):
         station = self.request.query_params.get('station', None)  # type: ignore
         if station:
             queryset = queryset.filter(client_config__station_name=station)
-        return queryset
+        # ⚡ Performance: breach counters for the whole page in the same query
+        return annotate_breach_counts(queryset)
     
     @action(detail=True, methods=['get'])
     def breaches(self, request, pk=None):
@@ -849,36 +1326,17 @@ class TagThresholdViewSet(viewsets.ModelViewSet):
         Get breach count for last 24 hours broken down by level.
         Example: /api/thresholds/1/breaches_24h/
         """
-        from django.utils.timezone import now, timedelta
-        
+        # get_object() comes from the annotated queryset: no extra queries
         node = self.get_object()
-        cutoff = now() - timedelta(hours=24)
-        
-        total = ThresholdBreach.objects.filter(
-            node=node,
-            timestamp__gte=cutoff
-        ).count()
-        
-        critical = ThresholdBreach.objects.filter(
-            node=node,
-            level="Critical",
-            timestamp__gte=cutoff
-        ).count()
-        
-        warning = ThresholdBreach.objects.filter(
-            node=node,
-            level="Warning",
-            timestamp__gte=cutoff
-        ).count()
         
         return Response({
-            'total': total,
-            'critical': critical,
-            'warning': warning,
+            'total': node.breach_count_24h,
+            'critical': node.critical_count_24h,
+            'warning': node.warning_count_24h,
         })
 
 
-class ThresholdBreachViewSet(viewsets.ModelViewSet):
+class ThresholdBreachViewSet(DeltaSyncMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint for viewing and managing threshold breach events.
     
@@ -891,11 +1349,15 @@ class ThresholdBreachViewSet(viewsets.ModelViewSet):
     # ⚡ Performance: Use select_related to reduce database queries
     queryset = ThresholdBreach.objects.select_related('node', 'node__client_config').order_by('-timestamp')
     serializer_class = ThresholdBreachSerializer
+    # ⚡ Performance: list() reads only the needed columns and renders with orjson
+    fast_serializer_class = FastThresholdBreachSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['node', 'level', 'acknowledged']
-    ordering_fields = ['timestamp', 'level']
+    ordering_fields = ['timestamp']  # Keyset pagination only pages on (timestamp, id)
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """
@@ -944,7 +1406,7 @@ class ThresholdBreachViewSet(viewsets.ModelViewSet):
         try:
             breach = self.get_object()
             breach_id = breach.id
-            breach.delete()
+            self.perform_destroy(breach)
             
             return Response(
                 {
@@ -1051,7 +1513,7 @@ class NotificationRecipientViewSet(viewsets.ModelViewSet):
 
 # ============== ALARM VIEWSETS ==============
 
-class AlarmLogViewSet(viewsets.ModelViewSet):
+class AlarmLogViewSet(DeltaSyncMixin, viewsets.ModelViewSet):
     """
     ViewSet for reading and managing alarm logs.
     Provides filtering by station, severity, and date range.
@@ -1062,8 +1524,9 @@ class AlarmLogViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['station_name', 'severity', 'acknowledged', 'timestamp']
     search_fields = ['node__tag_name__name', 'message', 'station_name']
-    ordering_fields = ['timestamp', 'severity']
+    ordering_fields = ['timestamp']  # Keyset pagination only pages on (timestamp, id)
     ordering = ['-timestamp']
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """Get alarm logs, optionally filtered by date range"""
@@ -1124,7 +1587,7 @@ class AlarmLogViewSet(viewsets.ModelViewSet):
         try:
             alarm = self.get_object()
             alarm_id = alarm.id
-            alarm.delete()
+            self.perform_destroy(alarm)
             
             return Response(
                 {
@@ -16,6 +16,8 @@ from django.utils.timezone import now
 from django.db.models import Q
 import threading
 from django.core.cache import cache
+from .model_versions import bump_model_version_on_commit
+from .sync_tombstones import delete_with_tombstones, tombstone_cascade
 
 
 
@@ -227,6 +229,8 @@ class OpcUaClientConfigAdmin(admin.ModelAdmin):
                     )
                 
                 # Step 3: Delete nodes and their related data
+                # Raw SQL below: leave delta-sync tombstones for nodes, breaches and alarms first
+                tombstone_cascade(OpcUaClientConfig.objects.filter(pk=client_config_id))
                 update_progress("Retrieving node data...", 30)
                 with connection.cursor() as cursor:
                     # Get all node IDs for this config
@@ -280,6 +284,10 @@ class OpcUaClientConfigAdmin(admin.ModelAdmin):
                         [client_config_id]
                     )
                 
+                # Raw SQL skips signals: invalidate conditional-GET validators by hand
+                for label in ("roams_opcua_mgr.opcuaclientconfig", "roams_opcua_mgr.opcuanode", "roams_opcua_mgr.tagname"):
+                    bump_model_version_on_commit(label)
+                
                 # Mark as complete
                 update_progress("Deletion completed!", 100)
         except Exception as e:
@@ -346,6 +354,16 @@ class AuthenticationsettingAdmin(admin.ModelAdmin):
     list_filter = ("Anonymous",)
     search_fields = ("client_config__station_name", "username")
 
+class SyncTombstoneAdminMixin:
+    """Deletes from the admin leave delta-sync tombstones (sync_tombstones.py)."""
+
+    def delete_model(self, request, obj):
+        delete_with_tombstones(type(obj).objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        delete_with_tombstones(queryset)
+
+
 class AlarmInline(admin.TabularInline):
     model = AlarmLog
     extra = 0
@@ -353,7 +371,7 @@ class AlarmInline(admin.TabularInline):
 
 # Register OPC UA Node Configuration
 @admin.register(OPCUANode)
-class OPCUANodeAdmin(admin.ModelAdmin):
+class OPCUANodeAdmin(SyncTombstoneAdminMixin, admin.ModelAdmin):
     list_display = (
         "client_config", "is_active", "node_id", "tag_name", 
         "access_level", "last_value", "tag_units", "data_type_display", "display_type_display", "last_updated"
@@ -442,13 +460,13 @@ class OPCUANodeAdmin(admin.ModelAdmin):
 
 # Register Tag Names
 @admin.register(TagName)
-class TagNameAdmin(admin.ModelAdmin):
+class TagNameAdmin(SyncTombstoneAdminMixin, admin.ModelAdmin):
     list_display = ("name", "tag_units")
     search_fields = ("name",)
 
 # Model for logging alarms
 @admin.register(AlarmLog)
-class AlarmLogAdmin(admin.ModelAdmin):
+class AlarmLogAdmin(SyncTombstoneAdminMixin, admin.ModelAdmin):
     list_display = (
         "station_name",
         "node",
@@ -483,13 +501,15 @@ def acknowledge_breaches(modeladmin, request, queryset):
     count = queryset.update(
         acknowledged=True,
         acknowledged_by=username,
-        acknowledged_at=now()
+        acknowledged_at=now(),
+        updated_at=now(),  # update() skips auto_now; delta sync needs it
     )
+    bump_model_version_on_commit("roams_opcua_mgr.thresholdbreach")  # ...and signals
     modeladmin.message_user(request, f"✅ {count} breach(es) marked as acknowledged")
 
 
 @admin.register(ThresholdBreach)
-class ThresholdBreachAdmin(admin.ModelAdmin):
+class ThresholdBreachAdmin(SyncTombstoneAdminMixin, admin.ModelAdmin):
     """Admin interface for threshold breaches with filtering and bulk actions"""
     
     list_display = (
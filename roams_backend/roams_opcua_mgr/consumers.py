@@ -1,5 +1,9 @@
+import asyncio
 import json
-from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer, AsyncWebsocketConsumer
+from django.apps import apps
+from .live_push import station_group
 
 class OPCUAServerConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -13,3 +17,121 @@ class OPCUAServerConsumer(AsyncWebsocketConsumer):
     async def refresh_clients(self, event):
         """Send refresh signal to frontend."""
         await self.send(text_data=json.dumps({"message": "Refresh server list"}))
+
+
+class LiveDataConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Live values, breaches and connection status for subscribed stations (see live_push.py).
+
+    Client -> server:
+        {"action": "subscribe", "stations": ["Bombo", "Lutete"]}
+        {"action": "unsubscribe", "stations": ["Lutete"]}
+
+    Server -> client:
+        {"type": "update", "station": "Bombo", "version": ..., "values": {...},
+         "breaches": [...], "status": "Connected",
+         "jobs": {"<job id>": {...}},
+         "controls": {"<control state id>": {...}}}  (each of the last six optional)
+        {"type": "subscribed", "stations": [...]}     stations actually joined
+
+    Backpressure: group messages are merged into one pending message per station
+    (latest value per node wins) and a single sender task drains them. A slow
+    client therefore receives fewer, larger updates instead of an ever-growing
+    backlog, and the channel layer never blocks on it.
+    """
+    # Close code for a missing/invalid token (4000-4999 are application codes)
+    UNAUTHORIZED_CLOSE_CODE = 4401
+    MAX_SUBSCRIPTIONS = 100
+    # Breaches are events, not state: keep the newest ones if a client falls far behind
+    MAX_PENDING_BREACHES = 200
+
+    async def connect(self):
+        user = self.scope.get("user")
+        await self.accept()
+        if user is None or not user.is_authenticated:
+            # Accept first so the browser sees the close code, not a bare handshake failure
+            await self.close(code=self.UNAUTHORIZED_CLOSE_CODE)
+            return
+
+        self.subscriptions = {}  # station pk -> station name
+        self.pending = {}  # station name -> merged message
+        self.pending_event = asyncio.Event()
+        self.sender = asyncio.create_task(self._drain_pending())
+
+    async def disconnect(self, code):
+        sender = getattr(self, "sender", None)
+        if sender is not None:
+            sender.cancel()
+        for station_pk in getattr(self, "subscriptions", {}):
+            await self.channel_layer.group_discard(station_group(station_pk), self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get("action") if isinstance(content, dict) else None
+        names = content.get("stations") if isinstance(content, dict) else None
+        if action not in ("subscribe", "unsubscribe") or not isinstance(names, list):
+            await self.send_json({"type": "error", "message": "Expected {action: subscribe|unsubscribe, stations: [...]}"})
+            return
+
+        stations = await self._resolve_stations([str(name) for name in names])
+        if action == "subscribe":
+            room = self.MAX_SUBSCRIPTIONS - len(self.subscriptions)
+            new = {pk: name for pk, name in stations.items() if pk not in self.subscriptions}
+            for station_pk, name in list(new.items())[:max(room, 0)]:
+                await self.channel_layer.group_add(station_group(station_pk), self.channel_name)
+                self.subscriptions[station_pk] = name
+        else:
+            for station_pk in stations:
+                if self.subscriptions.pop(station_pk, None) is not None:
+                    await self.channel_layer.group_discard(station_group(station_pk), self.channel_name)
+                    self.pending.pop(stations[station_pk], None)
+
+        await self.send_json({"type": "subscribed", "stations": sorted(self.subscriptions.values())})
+
+    @database_sync_to_async
+    def _resolve_stations(self, names):
+        OpcUaClientConfig = apps.get_model("roams_opcua_mgr", "OpcUaClientConfig")
+        return dict(
+            OpcUaClientConfig.objects.filter(station_name__in=names).values_list("pk", "station_name")
+        )
+
+    # ---- Channel layer handlers: merge, never send directly ----
+
+    async def live_update(self, event):
+        pending = self.pending.setdefault(event["station"], {"type": "update", "station": event["station"]})
+        pending.setdefault("values", {}).update(event["values"])
+        if event.get("version") is not None:
+            pending["version"] = max(pending.get("version") or 0, event["version"])
+        if event["breaches"]:
+            breaches = pending.setdefault("breaches", []) + event["breaches"]
+            dropped = len(breaches) - self.MAX_PENDING_BREACHES
+            if dropped > 0:
+                pending["breaches_dropped"] = pending.get("breaches_dropped", 0) + dropped
+                breaches = breaches[dropped:]
+            pending["breaches"] = breaches
+        self.pending_event.set()
+
+    async def live_status(self, event):
+        pending = self.pending.setdefault(event["station"], {"type": "update", "station": event["station"]})
+        pending["status"] = event["status"]
+        self.pending_event.set()
+
+    async def live_job(self, event):
+        # Control write progress; only the latest status of each job is kept
+        pending = self.pending.setdefault(event["station"], {"type": "update", "station": event["station"]})
+        pending.setdefault("jobs", {})[event["job"]["id"]] = event["job"]
+        self.pending_event.set()
+
+    async def live_control(self, event):
+        # Control states reconciled with the PLC; latest state per control wins
+        pending = self.pending.setdefault(event["station"], {"type": "update", "station": event["station"]})
+        pending.setdefault("controls", {}).update(event["controls"])
+        self.pending_event.set()
+
+    async def _drain_pending(self):
+        """Send merged messages; while a send is in flight, new events keep merging."""
+        while True:
+            await self.pending_event.wait()
+            self.pending_event.clear()
+            while self.pending:
+                _, message = self.pending.popitem()
+                await self.send_json(message)
@@ -0,0 +1,102 @@
+"""
+Control permissions - each user's ControlPermission rows compiled once and cached.
+
+    permissions = get_control_permissions(request.user)
+    allowed = user_can_control(request.user, control_state.pk, permissions)
+
+The compiled set maps control state id -> (permission level, expiry) for the
+user's active permissions. It lives in the Django cache (Redis, shared by all
+workers) and is memoised on the user object for the rest of the request, so a
+control panel listing every control checks them all without a query.
+
+Expiry is checked on every lookup, so a permission running out needs no
+invalidation. Granting, changing or revoking a permission deletes the user's
+entry once the transaction commits (signals.py).
+"""
+
+import logging
+
+from django.apps import apps
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_CACHE_TIMEOUT = 300  # seconds; writes invalidate entries long before
+_MEMO_ATTR = "_control_permissions"
+
+
+def _cache_key(user_id):
+    return f"ctrlperm:{user_id}"
+
+
+def _compile(user_id):
+    ControlPermission = apps.get_model("roams_opcua_mgr", "ControlPermission")
+    return {
+        control_state_id: (level, expires_at)
+        for control_state_id, level, expires_at in ControlPermission.objects.filter(
+            user_id=user_id, is_active=True
+        ).values_list("control_state_id", "permission_level", "expires_at")
+    }
+
+
+def get_control_permissions(user):
+    """
+    The user's compiled control permissions.
+
+    Returns:
+        Dict of control state id -> (permission_level, expires_at or None);
+        empty for anonymous users
+    """
+    if user is None or not user.is_authenticated:
+        return {}
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is not None:
+        return memo
+
+    key = _cache_key(user.pk)
+    try:
+        permissions = cache.get(key)
+    except Exception as e:
+        logger.warning(f"⚠️ Permission cache unavailable: {e}")
+        permissions = _compile(user.pk)
+    else:
+        if permissions is None:
+            permissions = _compile(user.pk)
+            try:
+                cache.set(key, permissions, timeout=PERMISSION_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not cache permissions for user {user.pk}: {e}")
+
+    setattr(user, _MEMO_ATTR, permissions)
+    return permissions
+
+
+def user_can_control(user, control_state_id, permissions=None):
+    """
+    Whether the user may change the control (same rules as ControlPermission.is_valid).
+
+    Args:
+        user: The requesting user
+        control_state_id: ControlState pk
+        permissions: Compiled set from get_control_permissions (looked up if omitted)
+    """
+    if not user or not user.is_active:
+        return False
+    if user.is_superuser:
+        return True
+    if permissions is None:
+        permissions = get_control_permissions(user)
+    entry = permissions.get(control_state_id)
+    if entry is None:
+        return False
+    _, expires_at = entry
+    return expires_at is None or timezone.now() <= expires_at
+
+
+def invalidate_control_permissions(user_id):
+    """Drop a user's compiled set; the next check rebuilds it."""
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not invalidate permissions for user {user_id}: {e}")
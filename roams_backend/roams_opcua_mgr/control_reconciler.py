@@ -0,0 +1,204 @@
+"""
+Control reconciler - keep ControlState in step with the PLC without polling.
+
+One reconciler runs per station in the ingest process (started next to the
+write queue worker). It subscribes to every is_boolean_control node of the
+station, so the server reports changes made anywhere - including a pump
+switched by hand at the panel. Notifications are only collected as they
+arrive; once per tick the reconciler settles them in one transaction:
+
+- rows whose PLC value diverged get one bulk_update and one bulk_create of
+  "synced" history rows;
+- the change goes out to ws/live/ subscribers as a "live.control" message.
+
+While a write to a control is queued or running the operator's value stays in
+current_value and only plc_value/is_synced_with_plc follow the PLC; otherwise
+the PLC wins and current_value is updated too.
+
+The subscription is recreated after a reconnect (the handler's client object
+changes) and when the set of control nodes changes.
+"""
+
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from opcua import ua
+
+from roams_opcua_mgr.live_push import publish_control_states
+from roams_opcua_mgr.session_scheduler import KEEPALIVE
+from roams_opcua_mgr.write_queue import write_job_cutoff
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_TICK = 1  # seconds between batched updates
+SUBSCRIPTION_PERIOD_MS = 500  # publishing interval asked from the server
+NODE_REFRESH_SECONDS = 60  # how often the set of control nodes is re-read
+
+
+class ControlStateReconciler:
+    """Subscribes to a station's boolean control nodes and settles changes per tick."""
+
+    def __init__(self, client_handler):
+        self.client_handler = client_handler
+        self.station = client_handler.config
+        self._lock = threading.Lock()
+        self._changes = {}  # node pk -> latest PLC value since the last tick
+        self._node_pks = {}  # OPC UA node id string -> node pk
+        self._client = None
+        self._subscription = None
+        self._nodes_checked_at = 0
+
+    # ---- Subscription handler (runs on the OPC UA client's thread): collect only ----
+
+    def datachange_notification(self, node, val, data):
+        node_pk = self._node_pks.get(node.nodeid.to_string())
+        if node_pk is None or val is None:
+            return
+        if not data.monitored_item.Value.StatusCode.is_good():
+            return
+        with self._lock:
+            self._changes[node_pk] = bool(val)
+
+    def status_change_notification(self, status):
+        logger.warning(f"⚠️ {self.station.station_name}: control subscription status {status}")
+        self._client = None  # Resubscribe on the next tick
+
+    # ---- Reconciler thread ----
+
+    def run(self):
+        logger.info(f"🔁 Control reconciler started for {self.station.station_name}")
+        while True:
+            try:
+                close_old_connections()
+                self._ensure_subscription()
+                self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ Control reconciler error for {self.station.station_name}: {e}")
+                self._client = None
+            time.sleep(RECONCILE_TICK)
+
+    def _control_nodes(self):
+        """OPC UA node id (normalised) -> node pk of the station's boolean controls."""
+        OPCUANode = apps.get_model("roams_opcua_mgr", "OPCUANode")
+        nodes = {}
+        for node_id, pk in OPCUANode.objects.filter(
+            client_config=self.station, is_boolean_control=True
+        ).values_list("node_id", "pk"):
+            try:
+                nodes[ua.NodeId.from_string(node_id).to_string()] = pk
+            except Exception as e:
+                logger.warning(f"⚠️ Invalid control node id {node_id}: {e}")
+        return nodes
+
+    def _ensure_subscription(self):
+        handler = self.client_handler
+        if not handler.connected or not handler.client:
+            self._client = None
+            return
+
+        refresh_nodes = time.monotonic() - self._nodes_checked_at >= NODE_REFRESH_SECONDS
+        if handler.client is self._client and not refresh_nodes:
+            return
+        control_nodes = self._control_nodes()
+        self._nodes_checked_at = time.monotonic()
+        if handler.client is self._client and control_nodes == self._node_pks:
+            return
+
+        self._unsubscribe()
+        self._node_pks = control_nodes
+        self._client = handler.client
+        if not self._node_pks:
+            return
+
+        # Subscription setup is session housekeeping, like the health check
+        with handler.session.slot(KEEPALIVE):
+            self._subscription = handler.client.create_subscription(SUBSCRIPTION_PERIOD_MS, self)
+            self._subscription.subscribe_data_change(
+                [handler.client.get_node(node_id) for node_id in self._node_pks]
+            )
+        # The server sends every node's current value first: the next tick is a full sync
+        logger.info(
+            f"✅ {self.station.station_name}: subscribed to {len(self._node_pks)} control nodes"
+        )
+
+    def _unsubscribe(self):
+        if self._subscription is None:
+            return
+        try:
+            self._subscription.delete()
+        except Exception:
+            pass  # The session it belonged to is usually gone already
+        self._subscription = None
+
+    def reconcile(self):
+        """
+        Apply the PLC values collected since the last tick.
+
+        Returns:
+            Number of ControlState rows updated
+        """
+        with self._lock:
+            changes, self._changes = self._changes, {}
+        if not changes:
+            return 0
+
+        ControlState = apps.get_model("roams_opcua_mgr", "ControlState")
+        ControlStateHistory = apps.get_model("roams_opcua_mgr", "ControlStateHistory")
+        ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+
+        states = list(ControlState.objects.filter(node_id__in=changes))
+        writing = set(
+            ControlWriteJob.objects.filter(
+                node_id__in=changes, status__in=['queued', 'running'], created_at__gte=write_job_cutoff()
+            ).values_list("node_id", flat=True)
+        )
+
+        now = timezone.now()
+        updated = []
+        history = []
+        for state in states:
+            plc_value = changes[state.node_id]
+            if state.node_id in writing:
+                # A write is on its way: keep the operator's value, report the PLC's
+                current_value = state.current_value
+            else:
+                current_value = plc_value
+            synced = current_value == plc_value
+            if (state.current_value, state.plc_value, state.is_synced_with_plc) == (current_value, plc_value, synced):
+                continue
+
+            if current_value != state.current_value:
+                history.append(ControlStateHistory(
+                    control_state=state,
+                    change_type='synced',
+                    previous_value=state.current_value,
+                    requested_value=current_value,
+                    final_value=current_value,
+                    reason="Changed at the PLC",
+                ))
+            state.current_value = current_value
+            state.plc_value = plc_value
+            state.is_synced_with_plc = synced
+            state.sync_error_message = ""
+            state.updated_at = now  # bulk_update skips auto_now
+            updated.append(state)
+
+        if not updated:
+            return 0
+
+        with transaction.atomic():
+            ControlState.objects.bulk_update(
+                updated,
+                ["current_value", "plc_value", "is_synced_with_plc", "sync_error_message", "updated_at"],
+            )
+            ControlStateHistory.objects.bulk_create(history)
+
+        logger.info(
+            f"🔁 {self.station.station_name}: {len(updated)} control states reconciled with the PLC"
+        )
+        publish_control_states(self.station.pk, self.station.station_name, updated)
+        return len(updated)
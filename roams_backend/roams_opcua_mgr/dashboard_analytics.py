@@ -1,21 +1,150 @@
 """
 Dashboard and analytics service for threshold breaches.
 Provides metrics and trends for breach visualization.
+
+Counters for a (station, time window) come from breach_counters(): one
+aggregate query with filtered and distinct Counts. get_breach_statistics,
+get_breach_severity_distribution and get_daily_breach_report are views over
+its result, and get_breach_dashboard serves all of them from a single pass.
+Both are kept in the version-keyed response cache, so polling dashboards
+share one computation per change.
+
+Rolling-window rankings and trends keep per-bucket partials in a
+SlidingWindowCache (utils/sliding_window.py) and only query the newest buckets.
 """
 
 import logging
 from django.utils.timezone import now, timedelta
 from django.apps import apps
-from django.db.models import Count, Q, Avg, Max, Min
+from django.db.models import Count, F, Q, Avg, Max, Min
 from datetime import datetime, date
+from roams_opcua_mgr.response_cache import cached_result
+from roams_opcua_mgr.rollups import bucket_start
 
 logger = logging.getLogger(__name__)
 
+# ThresholdBreach.LEVEL_CHOICES, counted individually by breach_counters()
+BREACH_LEVELS = ("Critical", "Warning")
+
+# Breach results are cached until one of these changes (response_cache.py).
+# The window slides too, so entries also turn over every BREACH_CACHE_TIME_BUCKET seconds.
+BREACH_CACHE_MODELS = (
+    "roams_opcua_mgr.thresholdbreach",
+    "roams_opcua_mgr.opcuanode",
+    "roams_opcua_mgr.opcuaclientconfig",
+)
+BREACH_CACHE_TIME_BUCKET = 60
+
+# Partial-aggregate granularity of the top-parameters sliding window
+TOP_PARAMETERS_BUCKET = timedelta(minutes=1)
+
+
+def _breach_window(start, end=None, station=None):
+    """ThresholdBreach rows with start <= timestamp (<= end), optionally for one station."""
+    ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
+    query = ThresholdBreach.objects.filter(timestamp__gte=start)
+    if end is not None:
+        query = query.filter(timestamp__lte=end)
+    if station:
+        query = query.filter(node__client_config__station_name=station)
+    return query
+
+
+def breach_counters(query):
+    """
+    Every breach counter of a filtered ThresholdBreach queryset, in one query.
+
+    Returns:
+        Dict with total, per-level (critical/warning), acknowledged,
+        unacknowledged and distinct parameter / station counts
+    """
+    return query.aggregate(
+        total=Count('id'),
+        **{level.lower(): Count('id', filter=Q(level=level)) for level in BREACH_LEVELS},
+        acknowledged_count=Count('id', filter=Q(acknowledged=True)),
+        unacknowledged_count=Count('id', filter=Q(acknowledged=False)),
+        affected_parameters=Count('node_id', distinct=True),
+        affected_stations=Count('node__client_config_id', distinct=True),
+    )
+
+
+def _cached_counters(station, hours):
+    """breach_counters() over the last `hours`, from the response cache while no breach changed."""
+    return cached_result(
+        "breach-counters", BREACH_CACHE_MODELS,
+        lambda: breach_counters(_breach_window(now() - timedelta(hours=hours), station=station)),
+        key=(station, hours), time_bucket=BREACH_CACHE_TIME_BUCKET,
+    )
+
+
+def _statistics_view(counters):
+    return {
+        'total_breaches': counters['total'],
+        'critical_breaches': counters['critical'],
+        'warning_breaches': counters['warning'],
+        'unacknowledged_breaches': counters['unacknowledged_count'],
+        'acknowledged_breaches': counters['acknowledged_count'],
+        'affected_parameters': counters['affected_parameters'],
+        'affected_stations': counters['affected_stations'],
+    }
+
+
+def _severity_view(counters):
+    # Same shape as a GROUP BY level: only levels that occurred, in level order
+    return {level: counters[level.lower()] for level in sorted(BREACH_LEVELS) if counters[level.lower()]}
+
+
+def annotate_breach_counts(node_queryset, hours=24):
+    """
+    Annotate an OPCUANode queryset with its breach counters, so a whole page
+    of nodes gets them from the same query instead of four COUNTs per node.
+    
+    Adds:
+        breach_count_24h, critical_count_24h, warning_count_24h: breaches in the last `hours`
+        unacknowledged_count: unacknowledged breaches of any age
+    """
+    recent = Q(breaches__timestamp__gte=now() - timedelta(hours=hours))
+    return node_queryset.annotate(
+        breach_count_24h=Count('breaches', filter=recent),
+        critical_count_24h=Count('breaches', filter=recent & Q(breaches__level='Critical')),
+        warning_count_24h=Count('breaches', filter=recent & Q(breaches__level='Warning')),
+        unacknowledged_count=Count('breaches', filter=Q(breaches__acknowledged=False)),
+    )
+
+
+def _top_parameter_partials(station):
+    """compute() for the top-parameters sliding window: per-minute counts per node."""
+    from roams_opcua_mgr.utils.time_buckets import DateBin
+
+    def compute(start, end):
+        rows = (
+            _breach_window(start, station=station)
+            .filter(timestamp__lt=end)
+            .annotate(time_bucket=DateBin(TOP_PARAMETERS_BUCKET, F('timestamp')))
+            .values('time_bucket', 'node__tag_name', 'node__tag_units', 'node__id')
+            .annotate(
+                count=Count('id'),
+                critical_count=Count('id', filter=Q(level='Critical')),
+                warning_count=Count('id', filter=Q(level='Warning')),
+                last_breach=Max('timestamp'),
+            )
+            .order_by()
+        )
+        partials = {}
+        for row in rows:
+            partials.setdefault(row.pop('time_bucket'), []).append(row)
+        return partials
+
+    return compute
+
 
 def get_top_breached_parameters(station=None, hours=24, limit=10):
     """
     Get the top parameters with most breaches.
     
+    Per-minute counts are kept in a SlidingWindowCache, so repeated polls only
+    query the newest minute and the partial minute at the start of the window.
+    
     Args:
         station: Optional station to filter by
         hours: Look back this many hours
@@ -24,25 +153,25 @@ def get_top_breached_parameters(station=None, hours=24, limit=10):
     Returns:
         List of dicts with parameter name and breach count
     """
+    from roams_opcua_mgr.utils.sliding_window import SlidingWindowCache
+    
     try:
-        ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
-        OPCUANode = apps.get_model("roams_opcua_mgr", "OPCUANode")
-        
-        cutoff = now() - timedelta(hours=hours)
-        
-        query = ThresholdBreach.objects.filter(timestamp__gte=cutoff)
-        
-        if station:
-            query = query.filter(node__client_config__station_name=station)
-        
-        breaches = query.values('node__tag_name', 'node__tag_units', 'node__id').annotate(
-            count=Count('id'),
-            critical_count=Count('id', filter=Q(level='Critical')),
-            warning_count=Count('id', filter=Q(level='Warning')),
-            last_breach=Max('timestamp')
-        ).order_by('-count')[:limit]
-        
-        return list(breaches)
+        end = now()
+        window = SlidingWindowCache("top-params", TOP_PARAMETERS_BUCKET, _top_parameter_partials(station))
+        
+        totals = {}
+        for _bucket, rows in window.buckets(f"{station or '*'}:{hours}", end - timedelta(hours=hours), end):
+            for row in rows:
+                total = totals.get(row['node__id'])
+                if total is None:
+                    totals[row['node__id']] = dict(row)
+                    continue
+                total['count'] += row['count']
+                total['critical_count'] += row['critical_count']
+                total['warning_count'] += row['warning_count']
+                total['last_breach'] = max(total['last_breach'], row['last_breach'])
+        
+        return sorted(totals.values(), key=lambda row: -row['count'])[:limit]
         
     except Exception as e:
         logger.error(f"Error getting top breached parameters: {e}")
@@ -61,64 +190,108 @@ def get_breach_statistics(station=None, hours=24):
         Dict with various statistics
     """
     try:
-        ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
-        
-        cutoff = now() - timedelta(hours=hours)
-        
-        query = ThresholdBreach.objects.filter(timestamp__gte=cutoff)
-        
-        if station:
-            query = query.filter(node__client_config__station_name=station)
-        
-        stats = {
-            'total_breaches': query.count(),
-            'critical_breaches': query.filter(level='Critical').count(),
-            'warning_breaches': query.filter(level='Warning').count(),
-            'unacknowledged_breaches': query.filter(acknowledged=False).count(),
-            'acknowledged_breaches': query.filter(acknowledged=True).count(),
-            'affected_parameters': query.values('node_id').distinct().count(),
-            'affected_stations': query.values('node__client_config_id').distinct().count(),
-        }
-        
-        return stats
+        return _statistics_view(_cached_counters(station, hours))
         
     except Exception as e:
         logger.error(f"Error getting breach statistics: {e}")
         return {}
 
 
-def get_breach_trend(hours=24, interval_minutes=60):
+def get_breach_dashboard(station=None, hours=24, limit=10):
     """
-    Get breach trend data for time-series visualization.
+    Everything the breach dashboard shows for one (station, window), in two
+    queries: the shared counters and the top parameters.
     
     Args:
+        station: Optional station to filter by
         hours: Look back this many hours
-        interval_minutes: Bucket breaches into time intervals
+        limit: Number of top parameters to return
     
     Returns:
-        List of dicts with timestamp and breach counts
+        Dict with statistics, severity_distribution and top_parameters
     """
-    try:
-        ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
-        from django.db.models.functions import TruncMinute
-        from django.db.models import Count, Q
+    def build():
+        query = _breach_window(now() - timedelta(hours=hours), station=station)
+        counters = breach_counters(query)
         
-        cutoff = now() - timedelta(hours=hours)
+        top_parameters = query.values('node__tag_name', 'node__tag_units', 'node__id').annotate(
+            count=Count('id'),
+            critical_count=Count('id', filter=Q(level='Critical')),
+            warning_count=Count('id', filter=Q(level='Warning')),
+            last_breach=Max('timestamp')
+        ).order_by('-count')[:limit]
         
-        breaches = (
-            ThresholdBreach.objects
-            .filter(timestamp__gte=cutoff)
-            .annotate(time_bucket=TruncMinute('timestamp', interval=interval_minutes))
+        return {
+            'statistics': _statistics_view(counters),
+            'severity_distribution': _severity_view(counters),
+            'top_parameters': list(top_parameters),
+        }
+    
+    try:
+        return cached_result(
+            "breach-dashboard", BREACH_CACHE_MODELS, build,
+            key=(station, hours, limit), time_bucket=BREACH_CACHE_TIME_BUCKET,
+        )
+        
+    except Exception as e:
+        logger.error(f"Error building breach dashboard: {e}")
+        return {}
+
+
+def _trend_partials(station, width):
+    """compute() for the breach-trend sliding window: counts per interval."""
+    from roams_opcua_mgr.utils.time_buckets import DateBin
+
+    def compute(start, end):
+        rows = (
+            _breach_window(start, station=station)
+            .filter(timestamp__lt=end)
+            .annotate(time_bucket=DateBin(width, F('timestamp')))
             .values('time_bucket')
             .annotate(
                 total=Count('id'),
                 critical=Count('id', filter=Q(level='Critical')),
-                warning=Count('id', filter=Q(level='Warning'))
+                warning=Count('id', filter=Q(level='Warning')),
             )
-            .order_by('time_bucket')
+            .order_by()
         )
-        
-        return list(breaches)
+        return {row.pop('time_bucket'): row for row in rows}
+
+    return compute
+
+
+def get_breach_trend(hours=24, interval_minutes=60, station=None):
+    """
+    Get breach trend data for time-series visualization.
+    
+    Interval counts are kept in a SlidingWindowCache, so repeated polls only
+    query the newest interval and the partial one at the start of the window.
+    
+    Args:
+        hours: Look back this many hours
+        interval_minutes: Bucket breaches into time intervals of any width
+        station: Optional station to filter by
+    
+    Returns:
+        List of dicts with time_bucket and breach counts, one per interval
+        (empty intervals included with zero counts)
+    """
+    from roams_opcua_mgr.utils.sliding_window import SlidingWindowCache
+    
+    try:
+        end = now()
+        width = timedelta(minutes=interval_minutes)
+        window = SlidingWindowCache("breach-trend", width, _trend_partials(station, width))
+        counts = dict(window.buckets(f"{station or '*'}:{hours}:{interval_minutes}", end - timedelta(hours=hours), end))
+        
+        # Every interval of the window, empty ones as zeros
+        trend = []
+        bucket = bucket_start(end - timedelta(hours=hours), int(width.total_seconds()))
+        while bucket <= end:
+            row = counts.get(bucket, {'total': 0, 'critical': 0, 'warning': 0})
+            trend.append({'time_bucket': bucket, 'total': row['total'], 'critical': row['critical'], 'warning': row['warning']})
+            bucket += width
+        return trend
         
     except Exception as e:
         logger.error(f"Error getting breach trend: {e}")
@@ -137,18 +310,7 @@ def get_breach_severity_distribution(station=None, hours=24):
         Dict with severity breakdown
     """
     try:
-        ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
-        
-        cutoff = now() - timedelta(hours=hours)
-        
-        query = ThresholdBreach.objects.filter(timestamp__gte=cutoff)
-        
-        if station:
-            query = query.filter(node__client_config__station_name=station)
-        
-        distribution = query.values('level').annotate(count=Count('id')).order_by('level')
-        
-        return {item['level']: item['count'] for item in distribution}
+        return _severity_view(_cached_counters(station, hours))
         
     except Exception as e:
         logger.error(f"Error getting severity distribution: {e}")
@@ -219,27 +381,23 @@ def get_daily_breach_report(date_=None):
         Dict with daily statistics
     """
     try:
-        ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
-        
         if date_ is None:
             date_ = date.today()
         
         start = datetime.combine(date_, datetime.min.time())
         end = datetime.combine(date_, datetime.max.time())
         
-        breaches = ThresholdBreach.objects.filter(
-            timestamp__gte=start,
-            timestamp__lte=end
-        )
+        breaches = _breach_window(start, end)
+        counters = breach_counters(breaches)
         
         report = {
             'date': date_.isoformat(),
-            'total_breaches': breaches.count(),
-            'critical_breaches': breaches.filter(level='Critical').count(),
-            'warning_breaches': breaches.filter(level='Warning').count(),
-            'acknowledged': breaches.filter(acknowledged=True).count(),
-            'unacknowledged': breaches.filter(acknowledged=False).count(),
-            'affected_parameters': breaches.values('node_id').distinct().count(),
+            'total_breaches': counters['total'],
+            'critical_breaches': counters['critical'],
+            'warning_breaches': counters['warning'],
+            'acknowledged': counters['acknowledged_count'],
+            'unacknowledged': counters['unacknowledged_count'],
+            'affected_parameters': counters['affected_parameters'],
             'top_parameters': list(
                 breaches.values('node__tag_name')
                 .annotate(count=Count('id'))
@@ -0,0 +1,155 @@
+"""
+Live push - stream value changes, new breaches and connection transitions to
+WebSocket clients over the Channels layer (Redis).
+
+Each station has one group, "live.station.<pk>"; LiveDataConsumer joins the
+groups a client subscribes to. The ingest loop calls publish_station_tick()
+once per station per read cycle, so a client receives at most one "values"
+message per station per tick, holding only the nodes whose value or quality
+changed since the previous tick:
+
+    {"type": "live.update", "station": "Bombo", "version": 1718000000000,
+     "values": {"12": {"value": 3.5, "timestamp": "...", "quality": "Good"}},
+     "breaches": [{"id": 7, "node": 12, "level": "Critical", ...}]}
+
+    {"type": "live.status", "station": "Bombo", "status": "Disconnected"}
+
+    {"type": "live.job", "station": "Bombo",
+     "job": {"id": "...", "node": 12, "status": "succeeded", "message": "..."}}
+
+    {"type": "live.control", "station": "Bombo",
+     "controls": {"3": {"node": 12, "current_value": true, "plc_value": true, "is_synced_with_plc": true}}}
+
+`version` matches the live snapshot version (live_snapshot.py): a client loads
+/api/live-snapshot/ first and then applies pushes with a higher version.
+
+Channel layer errors are logged and swallowed - the ingest loop must keep going.
+"""
+
+import json
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from roams_opcua_mgr.live_snapshot import LiveValueEncoder
+
+logger = logging.getLogger(__name__)
+
+# (value, quality) last pushed per station pk and node pk
+_last_pushed = {}
+
+
+def station_group(station_pk):
+    """Channels group name for one station (names may hold spaces, so key on pk)."""
+    return f"live.station.{station_pk}"
+
+
+def _jsonable(data):
+    """Messages travel as msgpack: turn datetimes and OPC UA oddities into JSON types."""
+    return json.loads(json.dumps(data, cls=LiveValueEncoder))
+
+
+def _group_send(station_pk, message):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return False
+    try:
+        async_to_sync(channel_layer.group_send)(station_group(station_pk), _jsonable(message))
+    except Exception as e:
+        logger.warning(f"⚠️ Live push to station {station_pk} failed: {e}")
+        return False
+    return True
+
+
+def breach_payload(breach):
+    """Fields of a new ThresholdBreach a live view needs to raise it."""
+    return {
+        "id": breach.id,
+        "node": breach.node_id,
+        "level": breach.level,
+        "value": breach.value,
+        "timestamp": breach.timestamp,
+    }
+
+
+def publish_station_tick(station_pk, station_name, values, breaches=(), version=None):
+    """
+    Push one read cycle of a station: changed values and new breaches, as a single message.
+
+    Args:
+        station_pk: OpcUaClientConfig pk
+        station_name: Station name, echoed in the message
+        values: Dict of node pk -> {"value", "timestamp", "quality"} for this cycle
+        breaches: breach_payload() dicts created this cycle
+        version: Live snapshot version of this cycle
+
+    Returns:
+        True if a message was sent
+    """
+    previous = _last_pushed.setdefault(station_pk, {})
+    changed = {
+        node_pk: entry
+        for node_pk, entry in values.items()
+        if previous.get(node_pk) != (entry["value"], entry["quality"])
+    }
+    if not changed and not breaches:
+        return False
+
+    sent = _group_send(station_pk, {
+        "type": "live.update",
+        "station": station_name,
+        "version": version,
+        "values": {str(node_pk): entry for node_pk, entry in changed.items()},
+        "breaches": list(breaches),
+    })
+    if sent:
+        # Only remember what actually went out, so a failed push is retried next tick
+        previous.update({node_pk: (entry["value"], entry["quality"]) for node_pk, entry in changed.items()})
+    return sent
+
+
+def publish_connection_status(station_pk, station_name, status):
+    """Push a connection status transition (the caller only calls this when it changed)."""
+    return _group_send(station_pk, {
+        "type": "live.status",
+        "station": station_name,
+        "status": status,
+    })
+
+
+def write_job_payload(job):
+    """Fields of a ControlWriteJob a client needs to follow its write."""
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "node": job.node_id,
+        "value": job.value,
+        "status": job.status,
+        "message": job.message,
+        "finished_at": job.finished_at,
+    }
+
+
+def publish_write_job(station_pk, station_name, job):
+    """Push a write job's new status (write_queue.py calls this as jobs start and finish)."""
+    return _group_send(station_pk, {
+        "type": "live.job",
+        "station": station_name,
+        "job": write_job_payload(job),
+    })
+
+
+def publish_control_states(station_pk, station_name, control_states):
+    """Push ControlState rows the reconciler just brought in line with the PLC."""
+    return _group_send(station_pk, {
+        "type": "live.control",
+        "station": station_name,
+        "controls": {
+            str(state.pk): {
+                "node": state.node_id,
+                "current_value": state.current_value,
+                "plc_value": state.plc_value,
+                "is_synced_with_plc": state.is_synced_with_plc,
+            }
+            for state in control_states
+        },
+    })
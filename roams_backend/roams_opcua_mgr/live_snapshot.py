@@ -0,0 +1,141 @@
+"""
+Live value snapshot - the latest value, timestamp and quality of every node, kept in Redis.
+
+The ingest loop (read_data.py) publishes one hash per station after each read
+cycle, so dashboards can poll current values without touching PostgreSQL:
+
+    roams:live:<station>          hash  node pk -> {"value", "timestamp", "quality"} (JSON)
+    roams:live:<station>:version  str   version of the hash, bumped when its content changes
+
+Each publish replaces the whole hash in one server-side script, so nodes that
+left the station's read cycle disappear, and the version only moves when the
+content differs from what is stored (an unchanged cycle keeps its ETag).
+A bump is +1, but never below the publish time in epoch milliseconds: versions
+only move forward and can't repeat after Redis loses its data, so an ETag built
+from them never matches a snapshot it didn't describe.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+LIVE_KEY_PREFIX = "roams:live"
+
+# Stations that stop publishing (removed, disabled) drop out after a day
+LIVE_KEY_TTL = 86400
+
+# KEYS: values hash, version. ARGV: publish time (epoch ms), TTL, field, value, ...
+_PUBLISH_SCRIPT = """
+local stored = redis.call('HGETALL', KEYS[1])
+local changed = #stored ~= #ARGV - 2
+if not changed then
+    local old = {}
+    for i = 1, #stored, 2 do old[stored[i]] = stored[i + 1] end
+    for i = 3, #ARGV, 2 do
+        if old[ARGV[i]] ~= ARGV[i + 1] then changed = true break end
+    end
+end
+local version = tonumber(redis.call('GET', KEYS[2]))
+if changed or version == nil then
+    redis.call('DEL', KEYS[1])
+    for i = 3, #ARGV, 1000 do
+        redis.call('HSET', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+    version = math.max((version or 0) + 1, tonumber(ARGV[1]))
+    redis.call('SET', KEYS[2], string.format('%d', version))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return version
+"""
+
+QUALITY_GOOD = "Good"
+QUALITY_BAD = "Bad"
+
+
+class LiveValueEncoder(DjangoJSONEncoder):
+    """ISO datetimes like the API; anything exotic from OPC UA falls back to str()."""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def _values_key(station_name):
+    return f"{LIVE_KEY_PREFIX}:{station_name}"
+
+
+def _version_key(station_name):
+    return f"{LIVE_KEY_PREFIX}:{station_name}:version"
+
+
+def publish_station_values(station_name, values):
+    """
+    Replace a station's values with one read cycle's, bumping the version if they changed.
+    Runs as a single Lua script so readers never see a half-written cycle.
+    Redis errors are logged and swallowed: the ingest loop must keep going.
+
+    Args:
+        station_name: Station the values belong to
+        values: Dict of node pk -> {"value", "timestamp", "quality"}
+
+    Returns:
+        The station's version after the publish, or None if nothing was published
+    """
+    if not values:
+        return None
+
+    args = [int(time.time() * 1000), LIVE_KEY_TTL]
+    for node_pk, entry in values.items():
+        args += [str(node_pk), json.dumps(entry, cls=LiveValueEncoder, separators=(",", ":"))]
+    try:
+        redis = get_redis_connection("default")
+        version = redis.register_script(_PUBLISH_SCRIPT)(
+            keys=[_values_key(station_name), _version_key(station_name)], args=args
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not publish live values for {station_name}: {e}")
+        return None
+    return int(version)
+
+
+def get_snapshot(station_names):
+    """
+    Read the live values of several stations in one Redis round trip.
+
+    Returns:
+        Dict of station name -> {"version": int or None, "nodes": {node pk: entry}}
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    pipe = get_redis_connection("default").pipeline(transaction=True)
+    for station_name in station_names:
+        pipe.get(_version_key(station_name))
+        pipe.hgetall(_values_key(station_name))
+    results = pipe.execute()
+
+    snapshot = {}
+    for i, station_name in enumerate(station_names):
+        version, values = results[2 * i], results[2 * i + 1]
+        snapshot[station_name] = {
+            "version": int(version) if version is not None else None,
+            "nodes": {
+                int(node_pk): json.loads(entry)
+                for node_pk, entry in values.items()
+            },
+        }
+    return snapshot
+
+
+def snapshot_etag(snapshot):
+    """Strong ETag for a snapshot, derived from the station versions only."""
+    versions = ";".join(f"{name}={station['version']}" for name, station in sorted(snapshot.items()))
+    return '"' + hashlib.md5(versions.encode("utf-8")).hexdigest() + '"'
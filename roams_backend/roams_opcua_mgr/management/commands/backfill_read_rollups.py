@@ -0,0 +1,84 @@
+"""
+Management command to build reading rollups (1 min / 1 h / 1 day) from historical OpcUaReadLog rows.
+Usage: python manage.py backfill_read_rollups --days 90 [--station NAME] [--tier 1h]
+"""
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+from roams_opcua_mgr.models import OPCUANode
+from roams_opcua_mgr.rollups import ROLLUP_TIERS, bucket_start, backfill_rollups
+import logging
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+
+class Command(BaseCommand):
+    help = 'Build per-node reading rollups from historical OpcUaReadLog data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Rebuild rollups for this many days of history (default: 30)'
+        )
+
+        parser.add_argument(
+            '--station',
+            type=str,
+            default=None,
+            help='Only rebuild rollups for nodes of this station'
+        )
+
+        parser.add_argument(
+            '--tier',
+            action='append',
+            choices=[name for name, _model_name, _width in ROLLUP_TIERS],
+            help='Rollup tier to rebuild (repeatable, default: all tiers)'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days < 1:
+            raise CommandError('--days must be at least 1')
+
+        node_ids = None
+        if options['station']:
+            node_ids = list(
+                OPCUANode.objects.filter(
+                    client_config__station_name=options['station']
+                ).values_list('id', flat=True)
+            )
+            if not node_ids:
+                raise CommandError(f"No nodes found for station '{options['station']}'")
+
+        # Work one UTC day at a time so every bucket is rebuilt from complete data
+        # and each transaction stays small.
+        end = bucket_start(now(), DAY_SECONDS) + timedelta(days=1)
+        start = end - timedelta(days=days + 1)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n📊 Building reading rollups from {start} to {end}\n')
+        )
+
+        totals = {}
+        day_start = start
+        while day_start < end:
+            day_end = day_start + timedelta(days=1)
+            with transaction.atomic():
+                written = backfill_rollups(day_start, day_end, tiers=options['tier'], node_ids=node_ids)
+            for tier, count in written.items():
+                totals[tier] = totals.get(tier, 0) + count
+            self.stdout.write(f"   {day_start.date()}: " + ", ".join(f"{tier}={count}" for tier, count in written.items()))
+            day_start = day_end
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                '✅ Rollup backfill complete: ' + ", ".join(f"{tier}={count} buckets" for tier, count in totals.items())
+            )
+        )
+        logger.info(f'📊 Reading rollup backfill executed for {days} days: {totals}')
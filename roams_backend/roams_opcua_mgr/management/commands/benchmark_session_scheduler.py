@@ -0,0 +1,82 @@
+"""
+Management command to measure control write latency under a full read load.
+Runs against a simulated OPC UA session (no PLC or database needed): one thread
+reads every node back to back, another writes at a fixed rate, first with
+whole-cycle FIFO access to the session, then with priorities and read slices.
+Usage: python manage.py benchmark_session_scheduler [--nodes 500] [--writes 200]
+"""
+
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from roams_opcua_mgr.session_scheduler import (
+    SessionScheduler, CONTROL_WRITE, READ, READ_SLICE_SIZE, percentile,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure p99 control write latency while the session is saturated with reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nodes', type=int, default=500, help='Nodes per read cycle (default: 500)')
+        parser.add_argument('--slice', type=int, default=READ_SLICE_SIZE,
+                            help=f'Nodes per Read request (default: {READ_SLICE_SIZE})')
+        parser.add_argument('--writes', type=int, default=200, help='Writes to time (default: 200)')
+        parser.add_argument('--interval-ms', type=float, default=15.0,
+                            help='Pause between writes (default: 15)')
+        parser.add_argument('--request-ms', type=float, default=2.0,
+                            help='Simulated round trip per request (default: 2)')
+        parser.add_argument('--node-us', type=float, default=100.0,
+                            help='Simulated server time per node read (default: 100)')
+
+    def handle(self, *args, **options):
+        if options['nodes'] < 1 or options['slice'] < 1 or options['writes'] < 1:
+            raise CommandError('--nodes, --slice and --writes must be at least 1')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n⏱️ {options['writes']} writes against {options['nodes']} nodes read back to back\n"
+        ))
+        runs = [
+            ('FIFO, whole cycle', options['nodes'], READ),
+            (f"priority, {options['slice']}-node slices", options['slice'], CONTROL_WRITE),
+        ]
+        for label, slice_size, write_priority in runs:
+            latencies = self._run(options, slice_size, write_priority)
+            self.stdout.write(
+                f"   {label:<28} p50 {_ms(percentile(latencies, 50)):>8}  "
+                f"p99 {_ms(percentile(latencies, 99)):>8}  max {_ms(max(latencies)):>8}"
+            )
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark complete'))
+
+    def _run(self, options, slice_size, write_priority):
+        session = SessionScheduler("benchmark")
+        request_s = options['request_ms'] / 1000
+        node_s = options['node_us'] / 1_000_000
+        stop = threading.Event()
+
+        def read_load():
+            while not stop.is_set():
+                for offset in range(0, options['nodes'], slice_size):
+                    batch = min(slice_size, options['nodes'] - offset)
+                    with session.slot(READ):
+                        time.sleep(request_s + batch * node_s)
+
+        reader = threading.Thread(target=read_load, daemon=True)
+        reader.start()
+        time.sleep(request_s * 5)  # Let the read loop saturate the session
+
+        latencies = []
+        for _ in range(options['writes']):
+            started = time.perf_counter()
+            with session.slot(write_priority):
+                time.sleep(request_s)
+            latencies.append(time.perf_counter() - started)
+            time.sleep(options['interval_ms'] / 1000)
+
+        stop.set()
+        reader.join()
+        return latencies
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.1f}ms"
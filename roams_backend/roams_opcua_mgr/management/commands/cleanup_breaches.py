@@ -6,6 +6,7 @@ Archivable records are those that are acknowledged and older than the specified
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.timezone import now, timedelta
 from roams_opcua_mgr.models import ThresholdBreach
+from roams_opcua_mgr.model_versions import bump_model_version_on_commit
 from django.db import models
 import logging
 
@@ -87,7 +88,10 @@ class Command(BaseCommand):
         else:
             # Actually delete
             try:
+                # Bulk delete, no tombstones: rows this old are past every sync token
                 deleted_count, _ = query.delete()
+                if deleted_count:
+                    bump_model_version_on_commit("roams_opcua_mgr.thresholdbreach")
                 
                 self.stdout.write(
                     self.style.SUCCESS(f'✅ Successfully deleted {deleted_count} breach records')
@@ -6,6 +6,8 @@ Usage: python manage.py cleanup_old_alarms
 from django.core.management.base import BaseCommand
 from django.utils.timezone import now, timedelta
 from django.apps import apps
+from roams_opcua_mgr.models.sync_model import SYNC_TOMBSTONE_RETENTION_DAYS
+from roams_opcua_mgr.model_versions import bump_model_version_on_commit
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,15 @@ class Command(BaseCommand):
         AlarmRetentionPolicy = apps.get_model('roams_opcua_mgr', 'AlarmRetentionPolicy')
         AlarmLog = apps.get_model('roams_opcua_mgr', 'AlarmLog')
         ThresholdBreach = apps.get_model('roams_opcua_mgr', 'ThresholdBreach')
+        SyncTombstone = apps.get_model('roams_opcua_mgr', 'SyncTombstone')
+        
+        # Delta-sync tombstones only need to outlive the oldest token still answered,
+        # so they are purged whether or not alarm cleanup is enabled
+        tombstone_count, _ = SyncTombstone.objects.filter(
+            deleted_at__lt=now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+        ).delete()
+        if tombstone_count:
+            self.stdout.write(f'🪦 Purged {tombstone_count} sync tombstones')
         
         # Get the retention policy
         policy = AlarmRetentionPolicy.get_policy()
@@ -34,6 +45,9 @@ class Command(BaseCommand):
             alarm_cutoff = now() - timedelta(days=policy.alarm_log_retention_days)
             breach_cutoff = now() - timedelta(days=policy.breach_retention_days)
             
+            # Plain bulk deletes, no tombstones: rows past retention are far older
+            # than any sync token still answered (see sync_tombstones.py)
+
             # Clean up old alarm logs
             alarm_count, _ = AlarmLog.objects.filter(timestamp__lt=alarm_cutoff).delete()
             
@@ -45,6 +59,8 @@ class Command(BaseCommand):
                 breach_filter = breach_filter.filter(acknowledged=True)
             
             breach_count, _ = breach_filter.delete()
+            if breach_count:
+                bump_model_version_on_commit("roams_opcua_mgr.thresholdbreach")
             
             # Update policy's last cleanup timestamp
             policy.last_cleanup_at = now()
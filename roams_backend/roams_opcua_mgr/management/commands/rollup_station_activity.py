@@ -0,0 +1,58 @@
+"""
+Management command to settle hourly station activity (connected time, stored readings).
+Run hourly from cron; use a larger --hours once to backfill history.
+Usage: python manage.py rollup_station_activity [--hours 48]
+"""
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+from roams_opcua_mgr.rollups import bucket_start
+from roams_opcua_mgr.station_activity import HOUR_SECONDS, rollup_station_activity
+import logging
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+
+class Command(BaseCommand):
+    help = 'Settle per-station hourly activity for closed hours'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=48,
+            help='Settle this many closed hours back from now (default: 48)'
+        )
+
+    def handle(self, *args, **options):
+        hours = options['hours']
+        if hours < 1:
+            raise CommandError('--hours must be at least 1')
+
+        # Closed hours only: the current one is still being written by the ingest loop
+        end = bucket_start(now(), HOUR_SECONDS)
+        start = end - timedelta(hours=hours)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'\n📈 Settling station activity from {start} to {end}\n')
+        )
+
+        # One UTC day per transaction, so a long backfill doesn't hold one huge one
+        total = 0
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + timedelta(seconds=DAY_SECONDS), end)
+            with transaction.atomic():
+                written = rollup_station_activity(chunk_start, chunk_end)
+            total += written
+            self.stdout.write(f"   {chunk_start} → {chunk_end}: {written} station-hours")
+            chunk_start = chunk_end
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Station activity settled: {total} station-hours')
+        )
+        logger.info(f'📈 Station activity rollup executed for {hours} hours: {total} rows')
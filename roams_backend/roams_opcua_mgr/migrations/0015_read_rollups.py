@@ -0,0 +1,95 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0014_stationdevicespecifications_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpcUaReadRollupMinute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the aggregation bucket')),
+                ('sample_count', models.PositiveIntegerField(default=0, help_text='Number of numeric readings aggregated into this bucket')),
+                ('min_value', models.FloatField(help_text='Lowest reading in the bucket')),
+                ('max_value', models.FloatField(help_text='Highest reading in the bucket')),
+                ('sum_value', models.FloatField(help_text='Sum of readings (avg = sum_value / sample_count)')),
+                ('first_value', models.FloatField(help_text='Earliest reading in the bucket')),
+                ('first_at', models.DateTimeField(help_text='Timestamp of the earliest reading')),
+                ('last_value', models.FloatField(help_text='Latest reading in the bucket')),
+                ('last_at', models.DateTimeField(help_text='Timestamp of the latest reading')),
+                ('node', models.ForeignKey(db_index=False, help_text='The node these readings belong to', on_delete=django.db.models.deletion.CASCADE, to='roams_opcua_mgr.opcuanode')),
+            ],
+            options={
+                'verbose_name': 'Reading Rollup (1 min)',
+                'verbose_name_plural': 'Reading Rollups (1 min)',
+                'db_table': 'roams_opcua_mgr_read_rollup_1m',
+                'ordering': ['bucket'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OpcUaReadRollupHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the aggregation bucket')),
+                ('sample_count', models.PositiveIntegerField(default=0, help_text='Number of numeric readings aggregated into this bucket')),
+                ('min_value', models.FloatField(help_text='Lowest reading in the bucket')),
+                ('max_value', models.FloatField(help_text='Highest reading in the bucket')),
+                ('sum_value', models.FloatField(help_text='Sum of readings (avg = sum_value / sample_count)')),
+                ('first_value', models.FloatField(help_text='Earliest reading in the bucket')),
+                ('first_at', models.DateTimeField(help_text='Timestamp of the earliest reading')),
+                ('last_value', models.FloatField(help_text='Latest reading in the bucket')),
+                ('last_at', models.DateTimeField(help_text='Timestamp of the latest reading')),
+                ('node', models.ForeignKey(db_index=False, help_text='The node these readings belong to', on_delete=django.db.models.deletion.CASCADE, to='roams_opcua_mgr.opcuanode')),
+            ],
+            options={
+                'verbose_name': 'Reading Rollup (1 h)',
+                'verbose_name_plural': 'Reading Rollups (1 h)',
+                'db_table': 'roams_opcua_mgr_read_rollup_1h',
+                'ordering': ['bucket'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OpcUaReadRollupDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the aggregation bucket')),
+                ('sample_count', models.PositiveIntegerField(default=0, help_text='Number of numeric readings aggregated into this bucket')),
+                ('min_value', models.FloatField(help_text='Lowest reading in the bucket')),
+                ('max_value', models.FloatField(help_text='Highest reading in the bucket')),
+                ('sum_value', models.FloatField(help_text='Sum of readings (avg = sum_value / sample_count)')),
+                ('first_value', models.FloatField(help_text='Earliest reading in the bucket')),
+                ('first_at', models.DateTimeField(help_text='Timestamp of the earliest reading')),
+                ('last_value', models.FloatField(help_text='Latest reading in the bucket')),
+                ('last_at', models.DateTimeField(help_text='Timestamp of the latest reading')),
+                ('node', models.ForeignKey(db_index=False, help_text='The node these readings belong to', on_delete=django.db.models.deletion.CASCADE, to='roams_opcua_mgr.opcuanode')),
+            ],
+            options={
+                'verbose_name': 'Reading Rollup (1 day)',
+                'verbose_name_plural': 'Reading Rollups (1 day)',
+                'db_table': 'roams_opcua_mgr_read_rollup_1d',
+                'ordering': ['bucket'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='opcuareadrollupminute',
+            constraint=models.UniqueConstraint(fields=('node', 'bucket'), name='unique_read_rollup_1m_node_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='opcuareadrolluphour',
+            constraint=models.UniqueConstraint(fields=('node', 'bucket'), name='unique_read_rollup_1h_node_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='opcuareadrollupday',
+            constraint=models.UniqueConstraint(fields=('node', 'bucket'), name='unique_read_rollup_1d_node_bucket'),
+        ),
+    ]
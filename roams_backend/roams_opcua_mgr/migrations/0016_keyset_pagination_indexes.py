@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0015_read_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alarmlog',
+            index=models.Index(fields=['timestamp', 'id'], name='roams_opcua_timesta_d678e3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='opcuareadlog',
+            index=models.Index(fields=['client_config', 'timestamp', 'id'], name='roams_opcua_client__8b11a2_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:04
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0016_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alarmlog',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='thresholdbreach',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='Last change (creation, acknowledgement); drives `?since=` delta sync'),
+        ),
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='app_label.model_name of the deleted row', max_length=100)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the deleted row')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model_label', 'deleted_at'], name='roams_opcua_model_l_fd5524_idx'), models.Index(fields=['deleted_at'], name='roams_opcua_deleted_478e67_idx')],
+            },
+        ),
+    ]
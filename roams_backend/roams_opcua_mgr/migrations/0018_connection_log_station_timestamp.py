@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0017_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connectionlog',
+            index=models.Index(fields=['station', 'timestamp'], name='roams_opcua_station_87d826_idx'),
+        ),
+    ]
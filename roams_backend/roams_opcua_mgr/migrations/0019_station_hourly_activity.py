@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0018_connection_log_station_timestamp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StationHourlyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField(help_text='Start of the hour (UTC)')),
+                ('read_count', models.PositiveIntegerField(default=0, help_text='Node reads attempted by the ingest loop')),
+                ('success_count', models.PositiveIntegerField(default=0, help_text='Node reads that returned a value')),
+                ('logged_count', models.PositiveIntegerField(default=0, help_text='Readings stored in OpcUaReadLog')),
+                ('connected_seconds', models.FloatField(blank=True, help_text='Seconds the station was online; empty until the hour is rolled up', null=True)),
+                ('station', models.ForeignKey(db_index=False, help_text='The station this activity belongs to', on_delete=django.db.models.deletion.CASCADE, to='roams_opcua_mgr.opcuaclientconfig')),
+            ],
+            options={
+                'verbose_name': 'Station Activity (1 h)',
+                'verbose_name_plural': 'Station Activity (1 h)',
+                'db_table': 'roams_opcua_mgr_station_activity_1h',
+                'ordering': ['bucket'],
+                'indexes': [models.Index(fields=['bucket'], name='roams_opcua_bucket_292739_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stationhourlyactivity',
+            constraint=models.UniqueConstraint(fields=('station', 'bucket'), name='unique_station_activity_1h_station_bucket'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:22
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('roams_opcua_mgr', '0019_station_hourly_activity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ControlWriteJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('node_write', 'Node Write'), ('control_change', 'Control State Change')], default='node_write', max_length=20)),
+                ('value', models.JSONField(help_text="Value to write, already converted to the node's data type")),
+                ('command', models.CharField(blank=True, help_text='Optional command like STOP or START', max_length=255, null=True)),
+                ('reason', models.TextField(blank=True, default='')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Writing to PLC'), ('succeeded', 'Succeeded'), ('failed', 'Failed'), ('expired', 'Expired Before Execution')], db_index=True, default='queued', max_length=20)),
+                ('message', models.TextField(blank=True, default='', help_text='Outcome or error message')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('control_request', models.ForeignKey(blank=True, help_text='Confirmed request this write executes', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='write_jobs', to='roams_opcua_mgr.controlstaterequest')),
+                ('control_state', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='write_jobs', to='roams_opcua_mgr.controlstate')),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='write_jobs', to='roams_opcua_mgr.opcuanode')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='control_write_jobs', to=settings.AUTH_USER_MODEL)),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='write_jobs', to='roams_opcua_mgr.opcuaclientconfig')),
+            ],
+            options={
+                'verbose_name': 'Control Write Job',
+                'verbose_name_plural': 'Control Write Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['station', 'status', 'created_at'], name='roams_opcua_station_63251b_idx')],
+            },
+        ),
+    ]
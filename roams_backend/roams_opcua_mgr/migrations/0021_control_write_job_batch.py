@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-19 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roams_opcua_mgr', '0020_control_write_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='controlwritejob',
+            name='batch_id',
+            field=models.UUIDField(blank=True, db_index=True, help_text='Shared by the jobs of one bulk write (written in a single OPC UA Write call)', null=True),
+        ),
+        migrations.AddField(
+            model_name='controlwritejob',
+            name='status_code',
+            field=models.CharField(blank=True, default='', help_text='OPC UA status the server returned for this node in a bulk write, e.g. BadNotWritable', max_length=64),
+        ),
+    ]
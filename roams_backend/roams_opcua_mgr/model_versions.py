@@ -0,0 +1,94 @@
+"""
+Per-model version counters, kept in Redis.
+
+Every committed save/delete of a tracked model bumps its counter (see
+signals.py), so read endpoints can build ETag / Last-Modified validators from a
+single MGET instead of re-running their queries (roams_api/conditional.py):
+
+    roams:ver:<app_label.model>      int   version, +1 per change
+    roams:ver:<app_label.model>:at   int   epoch ms of the last change
+
+Counters start from the current epoch ms rather than 0, so after Redis loses
+its data a version never repeats one a client may still hold.
+"""
+
+import logging
+import time
+from functools import partial
+from django.db import transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = "roams:ver"
+
+# OPCUANode fields the ingest loop rewrites every read cycle. Saves touching only
+# these don't change any configuration payload, so they don't bump the version.
+LIVE_NODE_FIELDS = frozenset({"last_value", "last_updated", "last_whole_number"})
+
+
+def _version_key(label):
+    return f"{VERSION_KEY_PREFIX}:{label}"
+
+
+def _changed_at_key(label):
+    return f"{VERSION_KEY_PREFIX}:{label}:at"
+
+
+def bump_model_version(label):
+    """
+    Record a change to a model (label: "app_label.model_name").
+    Redis errors are logged and swallowed: a save must never fail because of them.
+    """
+    now_ms = int(time.time() * 1000)
+    try:
+        pipe = get_redis_connection("default").pipeline(transaction=True)
+        pipe.set(_version_key(label), now_ms, nx=True)
+        pipe.incr(_version_key(label))
+        pipe.set(_changed_at_key(label), now_ms)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not bump version of {label}: {e}")
+
+
+def bump_model_version_on_commit(label):
+    """
+    Bump once the current transaction commits, so a reader can't pair the new
+    version with the old rows. A bulk delete firing thousands of signals in one
+    transaction still costs a single bump.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _, callback, *_ in connection.run_on_commit:
+            if getattr(callback, "model_label", None) == label:
+                return
+    callback = partial(bump_model_version, label)
+    callback.model_label = label
+    transaction.on_commit(callback)
+
+
+def get_model_versions(labels):
+    """
+    Read the versions of several models in one round trip.
+
+    Returns:
+        Dict of label -> (version, changed_at epoch ms); models never bumped are
+        initialised now and returned as None for this call
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    keys = []
+    for label in labels:
+        keys += [_version_key(label), _changed_at_key(label)]
+    values = get_redis_connection("default").mget(keys)
+
+    versions = {}
+    for i, label in enumerate(labels):
+        version, changed_at = values[2 * i], values[2 * i + 1]
+        if version is None or changed_at is None:
+            bump_model_version(label)
+            versions[label] = None
+        else:
+            versions[label] = (int(version), int(changed_at))
+    return versions
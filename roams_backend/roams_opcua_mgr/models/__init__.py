@@ -7,9 +7,12 @@ from .notification_model import NotificationRecipient
 from .alarm_retention_model import AlarmRetentionPolicy
 from .notification_schedule_model import NotificationSchedule
 from .control_state_model import (
-    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest
+    ControlState, ControlStateHistory, ControlPermission, ControlStateRequest, ControlWriteJob
 )
 from .device_specs_model import StationDeviceSpecifications
+from .rollup_model import OpcUaReadRollupMinute, OpcUaReadRollupHour, OpcUaReadRollupDay
+from .sync_model import SyncTombstone
+from .activity_model import StationHourlyActivity
 
 # Note: TagThreshold has been consolidated into OPCUANode model fields
 # (warning_level, critical_level, severity, threshold_active)
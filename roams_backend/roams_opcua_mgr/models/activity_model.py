@@ -0,0 +1,55 @@
+"""
+Station Activity Models
+Per-station, per-hour counters behind the uptime trend (/api/uptime-trend/).
+Read counters are maintained by the ingest loop; connected_seconds is filled in
+for closed hours by `manage.py rollup_station_activity` (see
+roams_opcua_mgr/station_activity.py).
+"""
+
+from django.db import models
+from .client_config_model import OpcUaClientConfig
+
+
+class StationHourlyActivity(models.Model):
+    """One station during one UTC hour."""
+
+    station = models.ForeignKey(
+        OpcUaClientConfig,
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (station, bucket) unique constraint
+        help_text="The station this activity belongs to"
+    )
+    bucket = models.DateTimeField(help_text="Start of the hour (UTC)")
+
+    read_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Node reads attempted by the ingest loop"
+    )
+    success_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Node reads that returned a value"
+    )
+    logged_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Readings stored in OpcUaReadLog"
+    )
+    connected_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Seconds the station was online; empty until the hour is rolled up"
+    )
+
+    class Meta:
+        db_table = 'roams_opcua_mgr_station_activity_1h'
+        ordering = ['bucket']
+        verbose_name = "Station Activity (1 h)"
+        verbose_name_plural = "Station Activity (1 h)"
+        constraints = [
+            models.UniqueConstraint(fields=['station', 'bucket'], name='unique_station_activity_1h_station_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket']),  # Trend over all stations
+        ]
+
+    def __str__(self):
+        return f"{self.station_id} @ {self.bucket}: reads={self.read_count} logged={self.logged_count}"
@@ -252,5 +252,11 @@ class ConnectionLog(models.Model):
     )
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Uptime: last state before a window, then the transitions inside it
+            models.Index(fields=['station', 'timestamp']),
+        ]
+
     def __str__(self):
         return f"{self.station.station_name} - {self.status} at {self.timestamp}"
@@ -11,6 +11,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
@@ -136,18 +137,9 @@ class ControlState(models.Model):
         return f"{self.node.tag_name} - {status}"
     
     def can_change_state(self, user):
-        """Check if user has permission to change this control"""
-        if not user or not user.is_active:
-            return False
-        
-        if user.is_superuser:
-            return True
-        
-        return ControlPermission.objects.filter(
-            user=user,
-            control_state=self,
-            is_active=True
-        ).exists()
+        """Check if user has permission to change this control (cached per user)"""
+        from roams_opcua_mgr.control_permissions import user_can_control
+        return user_can_control(user, self.pk)
     
     def is_rate_limited(self):
         """Check if this control is rate-limited"""
@@ -418,3 +410,118 @@ class ControlStateRequest(models.Model):
         """Get seconds until request expires"""
         remaining = (self.expires_at - timezone.now()).total_seconds()
         return max(0, remaining)
+
+
+class ControlWriteJob(models.Model):
+    """
+    A PLC write waiting for, or done by, the station's ingest-side write queue.
+    Requests return 202 with the job id; the outcome is read back from
+    /api/write-jobs/<id>/ or pushed over ws/live/ (see roams_opcua_mgr/write_queue.py).
+    """
+    
+    KIND_CHOICES = [
+        ('node_write', 'Node Write'),
+        ('control_change', 'Control State Change'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Writing to PLC'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired Before Execution'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='node_write')
+    
+    station = models.ForeignKey(
+        'OpcUaClientConfig',
+        on_delete=models.CASCADE,
+        related_name='write_jobs'
+    )
+    
+    node = models.ForeignKey(
+        'OPCUANode',
+        on_delete=models.CASCADE,
+        related_name='write_jobs'
+    )
+    
+    value = models.JSONField(help_text="Value to write, already converted to the node's data type")
+    
+    batch_id = models.UUIDField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Shared by the jobs of one bulk write (written in a single OPC UA Write call)"
+    )
+    
+    command = models.CharField(max_length=255, blank=True, null=True, help_text="Optional command like STOP or START")
+    
+    control_state = models.ForeignKey(
+        ControlState,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='write_jobs'
+    )
+    
+    control_request = models.ForeignKey(
+        ControlStateRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='write_jobs',
+        help_text="Confirmed request this write executes"
+    )
+    
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='control_write_jobs'
+    )
+    
+    reason = models.TextField(blank=True, default="")
+    
+    ip_address = models.GenericIPAddressField(
+        null=True,
+        blank=True
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        db_index=True
+    )
+    
+    message = models.TextField(blank=True, default="", help_text="Outcome or error message")
+    
+    status_code = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="OPC UA status the server returned for this node in a bulk write, e.g. BadNotWritable"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Control Write Job"
+        verbose_name_plural = "Control Write Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['station', 'status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.node.tag_name} = {self.value} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed', 'expired')
@@ -20,6 +20,11 @@ class OpcUaReadLog(models.Model):
     value = models.TextField()
     timestamp = models.DateTimeField(default=now, db_index=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client_config', 'timestamp', 'id']),  # Keyset paging per station
+        ]
+
     def __str__(self):
         return f"[READ] {self.client_config.station_name} | {self.node.tag_name} = {self.value} @ {self.timestamp}"
 
@@ -282,6 +282,13 @@ class AlarmLog(models.Model):
     severity = models.CharField(max_length=20, default="Warning")
     timestamp = models.DateTimeField(auto_now_add=True)
     acknowledged = models.BooleanField(default=False)
+    # Bumped on every save; drives `?since=` delta sync
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),  # Keyset paging of the alarm list
+        ]
 
     def __str__(self):
         return f"{self.station_name} - {self.message}"
@@ -337,6 +344,11 @@ class ThresholdBreach(models.Model):
         db_index=True,
         help_text="When the breach occurred"
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        help_text="Last change (creation, acknowledgement); drives `?since=` delta sync"
+    )
     
     class Meta:
         db_table = 'roams_opcua_mgr_threshold_breach'
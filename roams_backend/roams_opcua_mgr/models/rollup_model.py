@@ -0,0 +1,77 @@
+"""
+Reading Rollup Models
+Per-node aggregates of OpcUaReadLog values at fixed resolutions (1 minute, 1 hour, 1 day).
+Rows are maintained incrementally by the ingest loop (see roams_opcua_mgr/rollups.py)
+and can be rebuilt from raw history with `manage.py backfill_read_rollups`.
+"""
+
+from django.db import models
+from .node_config_model import OPCUANode
+
+
+class ReadingRollupBase(models.Model):
+    """Shared columns for every rollup resolution. Buckets are aligned on UTC epoch multiples."""
+
+    node = models.ForeignKey(
+        OPCUANode,
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (node, bucket) unique constraint
+        help_text="The node these readings belong to"
+    )
+    bucket = models.DateTimeField(
+        help_text="Start of the aggregation bucket"
+    )
+
+    sample_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of numeric readings aggregated into this bucket"
+    )
+    min_value = models.FloatField(help_text="Lowest reading in the bucket")
+    max_value = models.FloatField(help_text="Highest reading in the bucket")
+    sum_value = models.FloatField(help_text="Sum of readings (avg = sum_value / sample_count)")
+
+    first_value = models.FloatField(help_text="Earliest reading in the bucket")
+    first_at = models.DateTimeField(help_text="Timestamp of the earliest reading")
+    last_value = models.FloatField(help_text="Latest reading in the bucket")
+    last_at = models.DateTimeField(help_text="Timestamp of the latest reading")
+
+    class Meta:
+        abstract = True
+        ordering = ['bucket']
+
+    @property
+    def avg_value(self):
+        return self.sum_value / self.sample_count if self.sample_count else None
+
+    def __str__(self):
+        return f"{self.node_id} @ {self.bucket}: n={self.sample_count} avg={self.avg_value}"
+
+
+class OpcUaReadRollupMinute(ReadingRollupBase):
+    class Meta(ReadingRollupBase.Meta):
+        db_table = 'roams_opcua_mgr_read_rollup_1m'
+        verbose_name = "Reading Rollup (1 min)"
+        verbose_name_plural = "Reading Rollups (1 min)"
+        constraints = [
+            models.UniqueConstraint(fields=['node', 'bucket'], name='unique_read_rollup_1m_node_bucket'),
+        ]
+
+
+class OpcUaReadRollupHour(ReadingRollupBase):
+    class Meta(ReadingRollupBase.Meta):
+        db_table = 'roams_opcua_mgr_read_rollup_1h'
+        verbose_name = "Reading Rollup (1 h)"
+        verbose_name_plural = "Reading Rollups (1 h)"
+        constraints = [
+            models.UniqueConstraint(fields=['node', 'bucket'], name='unique_read_rollup_1h_node_bucket'),
+        ]
+
+
+class OpcUaReadRollupDay(ReadingRollupBase):
+    class Meta(ReadingRollupBase.Meta):
+        db_table = 'roams_opcua_mgr_read_rollup_1d'
+        verbose_name = "Reading Rollup (1 day)"
+        verbose_name_plural = "Reading Rollups (1 day)"
+        constraints = [
+            models.UniqueConstraint(fields=['node', 'bucket'], name='unique_read_rollup_1d_node_bucket'),
+        ]
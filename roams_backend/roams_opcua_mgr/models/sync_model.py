@@ -0,0 +1,33 @@
+"""
+Delta Sync Models
+Tombstones for rows deleted from tables the API serves with `?since=<token>`
+(nodes, threshold breaches, alarms), so clients can drop rows they still hold.
+Rows are written by the delete paths (roams_opcua_mgr/sync_tombstones.py) and
+purged by `manage.py cleanup_old_alarms` after SYNC_TOMBSTONE_RETENTION_DAYS.
+"""
+
+from django.db import models
+from django.utils.timezone import now
+
+# Tokens older than this can't be answered from tombstones: clients must reload
+SYNC_TOMBSTONE_RETENTION_DAYS = 7
+
+
+class SyncTombstone(models.Model):
+    """One deleted row: which table, which primary key, when."""
+
+    model_label = models.CharField(
+        max_length=100,
+        help_text="app_label.model_name of the deleted row"
+    )
+    object_id = models.BigIntegerField(help_text="Primary key of the deleted row")
+    deleted_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_label', 'deleted_at']),
+            models.Index(fields=['deleted_at']),  # Purge by age
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id} deleted at {self.deleted_at}"
@@ -7,6 +7,9 @@ from typing import TYPE_CHECKING, Optional
 from django.utils.timezone import now
 from django.apps import apps
 from .auth_ua import authenticate_client  # Import authentication
+from .live_push import publish_connection_status
+from .process_registry import register_process, list_processes
+from .session_scheduler import SessionScheduler, CONTROL_WRITE, KEEPALIVE
 from opcua import Client
 from colorama import Fore, Style 
 from django.core.exceptions import ObjectDoesNotExist
@@ -37,6 +40,8 @@ class OPCUAClientHandler:
         self.connected: bool = False
         self.username: Optional[str] = getattr(client_config, "username", None)
         self.password: Optional[str] = getattr(client_config, "password", None)
+        # Reads, writes and health checks take turns on the session by priority
+        self.session: SessionScheduler = SessionScheduler(client_config.station_name)
 
    
     def update_connection_status(self, status):
@@ -52,6 +57,7 @@ class OPCUAClientHandler:
             try:
                 # Refresh instance to get the latest DB values
                 self.config.refresh_from_db()
+                previous_status = self.config.connection_status
 
                 # Ensure the status is not None
                 self.config.connection_status = status if status else "Disconnected"
@@ -59,13 +65,20 @@ class OPCUAClientHandler:
                 # Use a transaction to ensure consistency
                 with transaction.atomic():
                     self.config.save(update_fields=["connection_status"])
+                    self.record_connection_transition()
                     
                     # Log the update with timestamp
                     log_msg = f"{Fore.CYAN}✅ {self.config.station_name}: Status updated to '{status}'{Style.RESET_ALL}"
                     logger.info(log_msg)
-                    
-                    # Return success
-                    return True
+
+                # 📣 Push transitions only; repeated "Connected" keepalives stay quiet
+                if self.config.connection_status != previous_status:
+                    publish_connection_status(
+                        self.config.pk, self.config.station_name, self.config.connection_status
+                    )
+
+                # Return success
+                return True
 
             except ObjectDoesNotExist:
                 logger.error(f"{Fore.RED}❌ Error: Config object does not exist in the database.{Style.RESET_ALL}")
@@ -85,6 +98,24 @@ class OPCUAClientHandler:
                 return False
 
 
+    def record_connection_transition(self):
+        """
+        Append an online/offline row to ConnectionLog when the station's state
+        differs from the last one logged. Compared against the log rather than
+        connection_status, which may be stale after the process was killed.
+        """
+        ConnectionLog = apps.get_model("roams_opcua_mgr", "ConnectionLog")
+        state = "online" if self.config.connection_status == "Connected" else "offline"
+        last_state = (
+            ConnectionLog.objects.filter(station=self.config)
+            .order_by("-timestamp")
+            .values_list("status", flat=True)
+            .first()
+        )
+        if last_state != state:
+            ConnectionLog.objects.create(station=self.config, status=state)
+            logger.info(f"{Fore.CYAN}📒 {self.config.station_name}: went {state}{Style.RESET_ALL}")
+
     def connect(self):
         """Connect to the OPC UA server with exponential backoff retry."""
         if not self.config.active:
@@ -181,7 +212,8 @@ class OPCUAClientHandler:
                     try:
                         # Try to read server node to verify connection is still active
                         server_node = self.client.get_node("i=20")  # Server node
-                        _ = server_node.get_display_name()
+                        with self.session.slot(KEEPALIVE):
+                            _ = server_node.get_display_name()
                         
                         # Connection is healthy
                         current_status = self.config.connection_status
@@ -305,13 +337,14 @@ class OPCUAClientHandler:
         while True:
             time.sleep(60)
 
-    def write_node_value(self, node, value):
+    def write_node_value(self, node, value, priority=CONTROL_WRITE):
         """
         Write a value to an OPC UA node (for boolean controls).
         
         Args:
             node: OPCUANode instance
             value: Boolean or numeric value to write
+            priority: Session priority (session_scheduler.EMERGENCY_STOP for e-stops)
         
         Returns:
             Tuple: (success: bool, message: str)
@@ -338,7 +371,8 @@ class OPCUAClientHandler:
             
             # Write the value
             logger.info(f"✍️ Writing {node.tag_name} = {value}")
-            ua_node.set_value(value)
+            with self.session.slot(priority):
+                ua_node.set_value(value)
             
             # Update local record
             node.last_value = str(value)
@@ -364,11 +398,22 @@ opcua_client_lock = threading.Lock()
 def start_opcua_clients():
     """Start OPC UA clients for all active servers and monitor for status changes."""
     from .read_data import start_station_monitoring
+    from .write_queue import serve_write_queue
+    from .control_reconciler import ControlStateReconciler
     
     if not opcua_client_lock.acquire(blocking=False):
         logger.warning("⚠️ OPC UA client check already running. Skipping duplicate execution.")
         return
 
+    # 🫀 Announce this ingest process; a second one would double every write
+    register_process("ingest")
+    try:
+        ingest_processes = list_processes("ingest")
+        if len(ingest_processes) > 1:
+            logger.warning(f"⚠️ {len(ingest_processes)} ingest processes are alive: {', '.join(p['id'] for p in ingest_processes)}")
+    except Exception as e:
+        logger.debug(f"⚠️ Could not list ingest processes: {e}")
+
     try:
         OpcUaClientConfig = get_opcua_client_config()
         logger.info("⏳ Waiting for database to be ready...")
@@ -403,6 +448,10 @@ def start_opcua_clients():
                     active_clients[station_name] = client_handler
                     thread = threading.Thread(target=client_handler.run, daemon=True)
                     thread.start()
+                    # PLC writes requested through the API run here, next to the session
+                    threading.Thread(target=serve_write_queue, args=(client_handler,), daemon=True).start()
+                    # PLC-side changes to boolean controls, via subscription
+                    threading.Thread(target=ControlStateReconciler(client_handler).run, daemon=True).start()
 
             logger.info("🔄 Next server status check in 30 seconds...")
             # ✅ START NODE READING PROCESS AFTER CONNECTIONS ARE ESTABLISHED
@@ -0,0 +1,209 @@
+"""
+Process registry: which web and ingest processes are alive, kept in Redis.
+
+Each process registers once (wsgi.py / asgi.py for "web", start_opcua_clients
+for "ingest") and a daemon thread refreshes its heartbeat. A clean shutdown
+removes the record (atexit, and gunicorn's on_exit hook); after a crash it
+simply expires:
+
+    roams:proc:<host>:<pid>:<role>   hash   pid, host, role, started_at, heartbeat_at
+                                            (expires after PROCESS_TTL seconds)
+    roams:proc:index                 set    ids of registered processes
+    roams:proc:up:<role>             int    epoch s since some process of the role
+                                            has been running without interruption
+
+`up:<role>` is what server uptime reports: gunicorn recycling one worker
+(max_requests) leaves it untouched, it only restarts once every process of
+the role was gone. A record is only counted as alive while its heartbeat is
+recent and, for processes on this host, while its pid still exists; so a
+restart resets the marker even before a crashed process's record expires.
+"""
+
+import atexit
+import logging
+import os
+import socket
+import threading
+import time
+
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+PROCESS_KEY_PREFIX = "roams:proc"
+PROCESS_INDEX_KEY = f"{PROCESS_KEY_PREFIX}:index"
+HEARTBEAT_INTERVAL = 30  # seconds
+HEARTBEAT_GRACE = 10  # seconds a heartbeat may be late before the process counts as gone
+PROCESS_TTL = HEARTBEAT_INTERVAL * 3
+
+_registered = {}  # role -> pid that registered it (a forked child must register again)
+_lock = threading.Lock()
+
+
+def _process_key(process_id):
+    return f"{PROCESS_KEY_PREFIX}:{process_id}"
+
+
+def _up_key(role):
+    return f"{PROCESS_KEY_PREFIX}:up:{role}"
+
+
+def _own_process_id(role):
+    return f"{socket.gethostname()}:{os.getpid()}:{role}"
+
+
+def register_process(role):
+    """
+    Record this process under `role` and start its heartbeat thread.
+    Safe to call repeatedly; Redis errors are logged, never raised.
+    """
+    with _lock:
+        if _registered.get(role) == os.getpid():
+            return
+        _registered[role] = os.getpid()
+
+    process_id = _own_process_id(role)
+    now = int(time.time())
+    try:
+        # Nothing of this role alive: the service (re)starts now
+        if not list_processes(role):
+            get_redis_connection("default").set(_up_key(role), now)
+        _heartbeat(process_id, role, started_at=now)
+        logger.info(f"🫀 Registered {role} process {process_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not register {role} process: {e}")
+
+    atexit.register(unregister_process, role)
+    thread = threading.Thread(target=_heartbeat_loop, args=(process_id, role, now), daemon=True)
+    thread.start()
+
+
+def unregister_process(role):
+    """
+    Remove this process's record on a clean shutdown, so a restart is seen as one.
+    Only the process that registered `role` removes it (forked children inherit
+    atexit handlers); Redis errors are logged, never raised.
+    """
+    with _lock:
+        if _registered.get(role) != os.getpid():
+            return
+        del _registered[role]
+
+    process_id = _own_process_id(role)
+    try:
+        pipe = get_redis_connection("default").pipeline(transaction=True)
+        pipe.delete(_process_key(process_id))
+        pipe.srem(PROCESS_INDEX_KEY, process_id)
+        pipe.execute()
+        logger.info(f"🫀 Unregistered {role} process {process_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not unregister {role} process: {e}")
+
+
+def _heartbeat(process_id, role, started_at=None):
+    fields = {"heartbeat_at": int(time.time())}
+    if started_at is not None:
+        fields.update({
+            "pid": os.getpid(),
+            "host": socket.gethostname(),
+            "role": role,
+            "started_at": started_at,
+        })
+    pipe = get_redis_connection("default").pipeline(transaction=True)
+    pipe.hset(_process_key(process_id), mapping=fields)
+    pipe.expire(_process_key(process_id), PROCESS_TTL)
+    pipe.sadd(PROCESS_INDEX_KEY, process_id)
+    # Covers Redis restarts: keep the marker as long as the role is alive
+    pipe.set(_up_key(role), started_at or fields["heartbeat_at"], nx=True)
+    pipe.execute()
+
+
+def _heartbeat_loop(process_id, role, started_at):
+    while True:
+        time.sleep(HEARTBEAT_INTERVAL)
+        if _registered.get(role) != os.getpid():
+            return  # Unregistered: shutting down
+        try:
+            if not get_redis_connection("default").exists(_process_key(process_id)):
+                # Expired (Redis restart or a long stall): write the full record again
+                _heartbeat(process_id, role, started_at=started_at)
+            else:
+                _heartbeat(process_id, role)
+        except Exception as e:
+            logger.warning(f"⚠️ Heartbeat failed for {process_id}: {e}")
+
+
+def list_processes(role=None):
+    """
+    Alive processes, oldest first.
+
+    Returns:
+        List of dicts (id, pid, host, role, started_at, heartbeat_at; epoch s)
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    redis = get_redis_connection("default")
+    process_ids = sorted(p.decode() for p in redis.smembers(PROCESS_INDEX_KEY))
+    pipe = redis.pipeline(transaction=False)
+    for process_id in process_ids:
+        pipe.hgetall(_process_key(process_id))
+
+    processes, expired = [], []
+    now = int(time.time())
+    for process_id, fields in zip(process_ids, pipe.execute()):
+        if not fields:
+            expired.append(process_id)
+            continue
+        fields = {k.decode(): v.decode() for k, v in fields.items()}
+        if _pid_gone(fields):
+            expired.append(process_id)
+            continue
+        if now - int(fields.get("heartbeat_at", 0)) > HEARTBEAT_INTERVAL + HEARTBEAT_GRACE:
+            continue  # Missed its heartbeat: stalled or dead elsewhere, left to expire
+        if role is not None and fields.get("role") != role:
+            continue
+        processes.append({
+            "id": process_id,
+            "pid": int(fields.get("pid", 0)),
+            "host": fields.get("host", ""),
+            "role": fields.get("role", ""),
+            "started_at": int(fields.get("started_at", 0)),
+            "heartbeat_at": int(fields.get("heartbeat_at", 0)),
+        })
+    if expired:
+        pipe = redis.pipeline(transaction=False)
+        pipe.delete(*(_process_key(process_id) for process_id in expired))
+        pipe.srem(PROCESS_INDEX_KEY, *expired)
+        pipe.execute()
+    return sorted(processes, key=lambda p: p["started_at"])
+
+
+def _pid_gone(fields):
+    """Whether the record belongs to this host and its pid no longer runs."""
+    if fields.get("host") != socket.gethostname():
+        return False
+    try:
+        os.kill(int(fields.get("pid", 0)), 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, ValueError):
+        pass  # Someone else's process, or no pid recorded
+    return False
+
+
+def role_up_since(role):
+    """
+    Epoch seconds since processes of `role` have been running without a gap,
+    or None if none is alive.
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    processes = list_processes(role)
+    if not processes:
+        return None
+    up_since = get_redis_connection("default").get(_up_key(role))
+    if up_since is None:
+        return processes[0]["started_at"]
+    return min(int(up_since), processes[0]["started_at"])
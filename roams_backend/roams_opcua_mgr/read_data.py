@@ -7,6 +7,11 @@ from django.apps import apps
 from opcua import ua
 from django.db import close_old_connections, transaction, OperationalError
 from roams_opcua_mgr.services import evaluate_threshold
+from roams_opcua_mgr.rollups import record_reading
+from roams_opcua_mgr.station_activity import record_station_activity
+from roams_opcua_mgr.live_snapshot import publish_station_values, QUALITY_GOOD, QUALITY_BAD
+from roams_opcua_mgr.live_push import publish_station_tick, breach_payload
+from roams_opcua_mgr.session_scheduler import READ, READ_SLICE_SIZE
 
 logger = logging.getLogger(__name__)
 logger.debug("📡 read_data.py started reading OPC UA nodes")
@@ -44,6 +49,31 @@ def should_log_reading(node_config, value):
         return True
 
 
+def read_node_slice(client_handler, batch):
+    """
+    Read one slice of nodes in a single Read request. The station's session is
+    held at READ priority, so writes queued meanwhile go before the next slice.
+
+    Returns:
+        One DataValue per node (None where the node id does not parse)
+    """
+    node_ids = {}
+    for node_config in batch:
+        try:
+            node_ids[node_config.id] = ua.NodeId.from_string(node_config.node_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Invalid node id {node_config.node_id}: {e}")
+    if not node_ids:
+        return [None] * len(batch)
+
+    with client_handler.session.slot(READ):
+        results = client_handler.client.uaclient.get_attributes(
+            list(node_ids.values()), ua.AttributeIds.Value
+        )
+    by_node = dict(zip(node_ids, results))
+    return [by_node.get(node_config.id) for node_config in batch]
+
+
 def read_and_log_nodes(active_clients):
     """
     Read values from all nodes in all active clients and log them.
@@ -60,102 +90,159 @@ def read_and_log_nodes(active_clients):
                 continue
 
             try:
-                nodes = OPCUANode.objects.filter(
+                node_list = list(OPCUANode.objects.filter(
                     client_config=client_handler.config
-                ).only("id", "node_id", "tag_name", "is_alarm", "sample_on_whole_number_change", "last_whole_number")
+                ).only(
+                    "id", "node_id", "tag_name", "is_alarm", "sample_on_whole_number_change",
+                    "last_whole_number", "last_value", "last_updated",
+                ))
 
-                if not nodes.exists():
+                if not node_list:
                     logger.info(f"ℹ️ No nodes configured for {station_name}.")
                     continue
 
-                for node_config in nodes:
+                # 📡 Latest value/quality of every node this cycle, published to Redis afterwards
+                live_values = {}
+                live_breaches = []
+                # 📈 Hourly activity counters (reads tried / answered / stored)
+                reads = successes = logged = 0
+                # 🕒 One timestamp for the whole cycle, so a station's readings line up
+                # across parameters (columnar telemetry shares timestamps between series)
+                cycle_at = now()
+
+                for offset in range(0, len(node_list), READ_SLICE_SIZE):
+                    batch = node_list[offset:offset + READ_SLICE_SIZE]
+                    reads += len(batch)
                     try:
-                        opc_node = client_handler.client.get_node(node_config.node_id)
-                        value = opc_node.get_value()
-
-                        max_retries = 3
-                        retry_delay = 5  # seconds
-
-                        for attempt in range(max_retries):
-                            try:
-                                with transaction.atomic():
-                                    # ✅ Round numeric values to 2 decimal places
-                                    try:
-                                        if isinstance(value, (int, float)):
-                                            value = round(float(value), 2)
-                                    except (TypeError, ValueError):
-                                        pass  # Keep non-numeric values as-is
+                        results = read_node_slice(client_handler, batch)
+                    except (ua.uaerrors.BadSessionIdInvalid, ua.uaerrors.BadConnectionClosed) as e:
+                        client_handler.connected = False
+                        client_handler.update_connection_status("Disconnected")
+                        logger.warning(f"🔌 Lost connection while reading {station_name}: {e}")
+                        break
+                    except Exception as e:
+                        logger.error(f" Unexpected error reading {len(batch)} nodes from {station_name}: {e}")
+                        results = [None] * len(batch)
+
+                    for node_config, data_value in zip(batch, results):
+                        if data_value is None or not data_value.StatusCode.is_good():
+                            if data_value is not None:
+                                logger.warning(
+                                    f"⚠️ Node read failed for {node_config.node_id}: {data_value.StatusCode.name}"
+                                )
+                            live_values[node_config.id] = {
+                                "value": node_config.last_value,
+                                "timestamp": node_config.last_updated,
+                                "quality": QUALITY_BAD,
+                            }
+                            continue
+
+                        value = data_value.Value.Value
+                        successes += 1
+                        try:
+                            max_retries = 3
+                            retry_delay = 5  # seconds
+
+                            for attempt in range(max_retries):
+                                breach = None
+                                read_log = None
+                                try:
+                                    with transaction.atomic():
+                                        # ✅ Round numeric values to 2 decimal places
+                                        try:
+                                            if isinstance(value, (int, float)):
+                                                value = round(float(value), 2)
+                                        except (TypeError, ValueError):
+                                            pass  # Keep non-numeric values as-is
                                     
-                                    # ✅ Update last value and time
-                                    node_config.last_value = value
-                                    node_config.last_updated = now()
+                                        # ✅ Update last value and time
+                                        node_config.last_value = value
+                                        node_config.last_updated = now()
                                     
-                                    # 🚨 If it's an alarm node, log differently
-                                    if getattr(node_config, "is_alarm", False):
-                                        # Always log alarm nodes
-                                        AlarmLog.objects.create(
-                                            node=node_config,
-                                            station_name=station_name,
-                                            message=f"{node_config.tag_name or node_config.node_id} triggered",
-                                            severity="High" if value else "Normal",
-                                            timestamp=now(),
-                                            acknowledged=False,
-                                        )
-                                        logger.warning(
-                                            f"🚨 [ALARM] {station_name} | {node_config.tag_name} = {value}"
-                                        )
-                                        node_config.save(update_fields=["last_value", "last_updated"])
-                                    else:
-                                        # 🧾 For parameter nodes, check if we should log based on whole number changes
-                                        should_log = should_log_reading(node_config, value)
-                                        
-                                        if should_log:
-                                            OpcUaReadLog.objects.create(
-                                                client_config=client_handler.config,
+                                        # 🚨 If it's an alarm node, log differently
+                                        if getattr(node_config, "is_alarm", False):
+                                            # Always log alarm nodes
+                                            AlarmLog.objects.create(
                                                 node=node_config,
-                                                value=str(value),
+                                                station_name=station_name,
+                                                message=f"{node_config.tag_name or node_config.node_id} triggered",
+                                                severity="High" if value else "Normal",
                                                 timestamp=now(),
+                                                acknowledged=False,
                                             )
-                                            logger.info(
-                                                f"📥 [READ] {station_name} | {node_config.tag_name} = {value}"
+                                            logger.warning(
+                                                f"🚨 [ALARM] {station_name} | {node_config.tag_name} = {value}"
                                             )
+                                            node_config.save(update_fields=["last_value", "last_updated"])
+                                        else:
+                                            # 🧾 For parameter nodes, check if we should log based on whole number changes
+                                            should_log = should_log_reading(node_config, value)
+                                        
+                                            if should_log:
+                                                read_log = OpcUaReadLog.objects.create(
+                                                    client_config=client_handler.config,
+                                                    node=node_config,
+                                                    value=str(value),
+                                                    timestamp=cycle_at,
+                                                )
+                                                # 📊 Keep 1m/1h/1d rollups in step with the raw log
+                                                record_reading(node_config.id, read_log.timestamp, value)
+                                                logger.info(
+                                                    f"📥 [READ] {station_name} | {node_config.tag_name} = {value}"
+                                                )
                                             
-                                            # Update the last whole number value
-                                            try:
-                                                numeric_value = float(value)
-                                                node_config.last_whole_number = int(numeric_value)
-                                            except (TypeError, ValueError):
-                                                pass
+                                                # Update the last whole number value
+                                                try:
+                                                    numeric_value = float(value)
+                                                    node_config.last_whole_number = int(numeric_value)
+                                                except (TypeError, ValueError):
+                                                    pass
                                         
-                                        # 🚨 Always evaluate thresholds (regardless of logging)
-                                        breach = evaluate_threshold(node_config, value)
-                                        if breach:
-                                            logger.warning(
-                                                f"⚠️ {breach.level} breach for {node_config.tag_name}: "
-                                                f"value={value}"
-                                            )
+                                            # 🚨 Always evaluate thresholds (regardless of logging)
+                                            breach = evaluate_threshold(node_config, value)
+                                            if breach:
+                                                logger.warning(
+                                                    f"⚠️ {breach.level} breach for {node_config.tag_name}: "
+                                                    f"value={value}"
+                                                )
                                         
-                                        node_config.save(update_fields=["last_value", "last_updated", "last_whole_number"])
+                                            node_config.save(update_fields=["last_value", "last_updated", "last_whole_number"])
+
+                                    # 📣 Committed, so clients can be told about it
+                                    if breach:
+                                        live_breaches.append(breach_payload(breach))
+                                    if read_log:
+                                        logged += 1
+                                    break  # ✅ Success, exit retry loop
+
+                                except OperationalError as e:
+                                    if attempt < max_retries - 1:
+                                        time.sleep(retry_delay)
+                                        continue
+                                    else:
+                                        logger.error(
+                                            f"🧨 DB write failed after retries for {node_config.node_id}: {e}"
+                                        )
 
-                                break  # ✅ Success, exit retry loop
+                            # The value is live even if the DB write failed
+                            live_values[node_config.id] = {
+                                "value": value,
+                                "timestamp": node_config.last_updated,
+                                "quality": QUALITY_GOOD,
+                            }
 
-                            except OperationalError as e:
-                                if attempt < max_retries - 1:
-                                    time.sleep(retry_delay)
-                                    continue
-                                else:
-                                    logger.error(
-                                        f"🧨 DB write failed after retries for {node_config.node_id}: {e}"
-                                    )
+                        except Exception as e:
+                            logger.error(f" Unexpected error storing node {node_config.node_id}: {e}")
 
-                    except ua.UaStatusCodeError as e:
-                        logger.warning(f"⚠️ Node read failed for {node_config.node_id}: {e}")
-                    except (ua.uaerrors.BadSessionIdInvalid, ua.uaerrors.BadConnectionClosed) as e:
-                        client_handler.connected = False
-                        client_handler.update_connection_status("Disconnected")
-                        logger.warning(f"🔌 Lost connection while reading {station_name}: {e}")
-                    except Exception as e:
-                        logger.error(f" Unexpected error reading node {node_config.node_id}: {e}")
+                try:
+                    record_station_activity(client_handler.config.pk, now(), reads, successes, logged)
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not record activity for {station_name}: {e}")
+
+                version = publish_station_values(station_name, live_values)
+                publish_station_tick(
+                    client_handler.config.pk, station_name, live_values, live_breaches, version
+                )
 
             except Exception as e:
                 logger.error(f" Error processing station {station_name}: {e}")
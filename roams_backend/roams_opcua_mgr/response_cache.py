@@ -0,0 +1,129 @@
+"""
+Version-keyed result cache with single-flight recomputation.
+
+    stats = cached_result(
+        "breach-stats", ["roams_opcua_mgr.thresholdbreach"],
+        lambda: compute_stats(station), key=(station,), time_bucket=60,
+    )
+
+Cache keys embed the current versions of the models a result is built from
+(roams_opcua_mgr/model_versions.py, bumped by post_save/post_delete in
+signals.py), so a write makes every dependent entry unreachable at once:
+nothing has to be deleted, stale entries just expire. `time_bucket` adds the
+clock to the key for results over rolling windows.
+
+When an entry is missing, one caller recomputes it under a short lock while
+the others wait for its result instead of all hitting the database together
+(the dashboards that poll the same endpoints all miss right after a write).
+
+Hits, misses and coalesced waits are counted per cache name in Redis; see
+get_cache_metrics() and /health/detailed/.
+"""
+
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from roams_opcua_mgr.model_versions import get_model_versions
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TIMEOUT = 300  # seconds; versions invalidate entries long before
+LOCK_TIMEOUT = 30  # seconds a recompute may hold the single-flight lock
+WAIT_TIMEOUT = 5  # seconds a caller waits for another's recompute
+WAIT_INTERVAL = 0.05
+METRICS_KEY = "roams:rcache:stats"
+
+_MISSING = object()
+
+
+def _count(name, event):
+    try:
+        get_redis_connection("default").hincrby(METRICS_KEY, f"{name}:{event}", 1)
+    except Exception:
+        pass  # Metrics must never fail a request
+
+
+def _cache_key(name, models, key, time_bucket):
+    versions = get_model_versions(models)
+    if any(version is None for version in versions.values()):
+        return None  # Counters were just initialised: nothing cached can match yet
+    parts = [str(part) for part in key]
+    parts += [f"{label}={versions[label][0]}" for label in models]
+    if time_bucket:
+        parts.append(f"t={int(time.time() // time_bucket)}")
+    digest = hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+    return f"rc:{name}:{digest}"
+
+
+def cached_result(name, models, compute, key=(), time_bucket=None, timeout=RESPONSE_CACHE_TIMEOUT):
+    """
+    Return compute()'s result, from cache while none of `models` changed.
+
+    Args:
+        name: Cache name (metrics are counted per name)
+        models: Model labels ("app_label.model_name") the result is built from
+        compute: Zero-argument callable producing a picklable result
+        key: Extra key parts the result depends on (filters, path, ...)
+        time_bucket: Seconds after which the result changes even without writes
+        timeout: Seconds an entry is kept
+
+    Exceptions raised by compute() propagate and nothing is cached.
+    """
+    try:
+        cache_key = _cache_key(name, models, key, time_bucket)
+        value = cache.get(cache_key, _MISSING) if cache_key else _MISSING
+    except Exception as e:
+        logger.warning(f"⚠️ Response cache unavailable for {name}: {e}")
+        return compute()
+    if cache_key is None:
+        _count(name, "miss")
+        return compute()
+
+    if value is not _MISSING:
+        _count(name, "hit")
+        return value
+
+    lock_key = f"{cache_key}:lock"
+    if not cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        # 🔒 Someone else is recomputing this entry: wait for their result
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                _count(name, "coalesced")
+                return value
+            if cache.get(lock_key) is None:
+                break  # The holder gave up (error): compute ourselves
+        _count(name, "miss")
+        return compute()
+
+    try:
+        _count(name, "miss")
+        value = compute()
+        cache.set(cache_key, value, timeout=timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def get_cache_metrics():
+    """
+    Hit/miss counters since Redis last lost them.
+
+    Returns:
+        Dict of cache name -> {hit, miss, coalesced, hit_ratio}
+    """
+    counters = get_redis_connection("default").hgetall(METRICS_KEY)
+    metrics = {}
+    for field, count in counters.items():
+        name, _, event = field.decode().rpartition(":")
+        metrics.setdefault(name, {"hit": 0, "miss": 0, "coalesced": 0})[event] = int(count)
+    for stats in metrics.values():
+        served = stats["hit"] + stats["miss"] + stats["coalesced"]
+        stats["hit_ratio"] = round((stats["hit"] + stats["coalesced"]) / served, 3) if served else None
+    return metrics
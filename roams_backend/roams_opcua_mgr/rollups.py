@@ -0,0 +1,180 @@
+"""
+Reading rollups - per-node count/min/max/sum/first/last aggregates of OpcUaReadLog.
+
+Rollups are kept at three resolutions (1 minute, 1 hour, 1 day) and updated
+incrementally as readings are persisted by read_data.py. Charts over long
+ranges read these small tables instead of scanning raw OpcUaReadLog rows.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone as dt_timezone
+from django.apps import apps
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# (tier, model name, bucket width in seconds) - ordered finest to coarsest
+ROLLUP_TIERS = (
+    ("1m", "OpcUaReadRollupMinute", 60),
+    ("1h", "OpcUaReadRollupHour", 3600),
+    ("1d", "OpcUaReadRollupDay", 86400),
+)
+
+# Matches the text values that to_numeric() accepts, for SQL-side filtering
+NUMERIC_VALUE_REGEX = r'^\s*[-+]?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?\s*$'
+
+_UPSERT_SQL = """
+    INSERT INTO {table} AS r
+        (node_id, bucket, sample_count, min_value, max_value, sum_value,
+         first_value, first_at, last_value, last_at)
+    VALUES (%s, %s, 1, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (node_id, bucket) DO UPDATE SET
+        sample_count = r.sample_count + 1,
+        min_value = LEAST(r.min_value, EXCLUDED.min_value),
+        max_value = GREATEST(r.max_value, EXCLUDED.max_value),
+        sum_value = r.sum_value + EXCLUDED.sum_value,
+        first_value = CASE WHEN EXCLUDED.first_at < r.first_at THEN EXCLUDED.first_value ELSE r.first_value END,
+        first_at = LEAST(r.first_at, EXCLUDED.first_at),
+        last_value = CASE WHEN EXCLUDED.last_at >= r.last_at THEN EXCLUDED.last_value ELSE r.last_value END,
+        last_at = GREATEST(r.last_at, EXCLUDED.last_at)
+"""
+
+_BACKFILL_SQL = """
+    INSERT INTO {table}
+        (node_id, bucket, sample_count, min_value, max_value, sum_value,
+         first_value, first_at, last_value, last_at)
+    SELECT
+        node_id,
+        to_timestamp(floor(extract(epoch FROM "timestamp") / %(width)s) * %(width)s) AS bucket,
+        count(*),
+        min(v), max(v), sum(v),
+        (array_agg(v ORDER BY "timestamp" ASC))[1], min("timestamp"),
+        (array_agg(v ORDER BY "timestamp" DESC))[1], max("timestamp")
+    FROM (
+        SELECT node_id, "timestamp", value::double precision AS v
+        FROM roams_opcua_mgr_opcuareadlog
+        WHERE "timestamp" >= %(start)s AND "timestamp" < %(end)s
+          AND value ~ %(numeric_regex)s
+          {node_filter}
+    ) readings
+    GROUP BY node_id, bucket
+    ON CONFLICT (node_id, bucket) DO UPDATE SET
+        sample_count = EXCLUDED.sample_count,
+        min_value = EXCLUDED.min_value,
+        max_value = EXCLUDED.max_value,
+        sum_value = EXCLUDED.sum_value,
+        first_value = EXCLUDED.first_value,
+        first_at = EXCLUDED.first_at,
+        last_value = EXCLUDED.last_value,
+        last_at = EXCLUDED.last_at
+"""
+
+
+def get_rollup_model(tier):
+    """Return the rollup model class for a tier name ("1m", "1h" or "1d")."""
+    for name, model_name, _width in ROLLUP_TIERS:
+        if name == tier:
+            return apps.get_model("roams_opcua_mgr", model_name)
+    raise ValueError(f"Unknown rollup tier '{tier}'")
+
+
+def get_tier_width(tier):
+    """Return the bucket width in seconds for a tier name."""
+    for name, _model_name, width in ROLLUP_TIERS:
+        if name == tier:
+            return width
+    raise ValueError(f"Unknown rollup tier '{tier}'")
+
+
+def plan_resolution(from_dt, to_dt, points):
+    """
+    Pick the coarsest tier that still yields at least `points` buckets over [from_dt, to_dt].
+    Falls back to "raw" when even the finest rollup would be too coarse.
+
+    Returns:
+        Tier name ("1d", "1h", "1m") or "raw"
+    """
+    span_seconds = (to_dt - from_dt).total_seconds()
+    if points < 1 or span_seconds <= 0:
+        return "raw"
+
+    for tier, _model_name, width in reversed(ROLLUP_TIERS):
+        if span_seconds / width >= points:
+            return tier
+    return "raw"
+
+
+def bucket_start(timestamp, width_seconds):
+    """Floor an aware datetime to the start of its bucket (UTC epoch aligned)."""
+    epoch = int(timestamp.timestamp() // width_seconds) * width_seconds
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+
+
+def to_numeric(value):
+    """Convert a logged reading to float, or None if it can't be aggregated."""
+    if isinstance(value, bool):
+        return None
+    try:
+        numeric_value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return numeric_value if math.isfinite(numeric_value) else None
+
+
+def record_reading(node_id, timestamp, value):
+    """
+    Fold one persisted reading into every rollup tier.
+    Call inside the same transaction that creates the OpcUaReadLog row.
+
+    Returns:
+        bool: True if the value was numeric and rollups were updated
+    """
+    numeric_value = to_numeric(value)
+    if numeric_value is None:
+        return False
+
+    with connection.cursor() as cursor:
+        for tier, _model_name, width in ROLLUP_TIERS:
+            table = get_rollup_model(tier)._meta.db_table
+            cursor.execute(
+                _UPSERT_SQL.format(table=table),
+                [
+                    node_id, bucket_start(timestamp, width),
+                    numeric_value, numeric_value, numeric_value,
+                    numeric_value, timestamp, numeric_value, timestamp,
+                ],
+            )
+    return True
+
+
+def backfill_rollups(start, end, tiers=None, node_ids=None):
+    """
+    Rebuild rollup buckets from raw OpcUaReadLog rows in [start, end).
+    start/end should be aligned to the coarsest tier being rebuilt so that
+    every touched bucket is recomputed from complete data.
+
+    Returns:
+        Dict of tier -> number of bucket rows written
+    """
+    tiers = tiers or [name for name, _model_name, _width in ROLLUP_TIERS]
+    params = {
+        "start": start,
+        "end": end,
+        "numeric_regex": NUMERIC_VALUE_REGEX,
+    }
+    node_filter = ""
+    if node_ids is not None:
+        node_filter = "AND node_id = ANY(%(node_ids)s)"
+        params["node_ids"] = list(node_ids)
+
+    written = {}
+    with connection.cursor() as cursor:
+        for tier in tiers:
+            table = get_rollup_model(tier)._meta.db_table
+            cursor.execute(
+                _BACKFILL_SQL.format(table=table, node_filter=node_filter),
+                {**params, "width": get_tier_width(tier)},
+            )
+            written[tier] = cursor.rowcount
+    return written
@@ -1,6 +1,7 @@
 from django.urls import re_path
-from .consumers import OPCUAServerConsumer
+from .consumers import OPCUAServerConsumer, LiveDataConsumer
 
 websocket_urlpatterns = [
     re_path(r"ws/opcua/$", OPCUAServerConsumer.as_asgi()),
+    re_path(r"ws/live/$", LiveDataConsumer.as_asgi()),
 ]
@@ -0,0 +1,105 @@
+"""
+Session scheduler - one OPC UA session per station, shared by priority.
+
+The read loop, the write queue worker and the connection monitor all use the
+station's session from their own threads. Each request takes a slot first:
+
+    with client_handler.session.slot(READ):
+        results = client.uaclient.get_attributes(node_ids, ua.AttributeIds.Value)
+
+Only one slot is held at a time. When it is released, the waiter with the
+most urgent priority goes next (first come first served within a priority):
+
+    EMERGENCY_STOP  writes to controls tagged "emergency"
+    CONTROL_WRITE   every other operator write
+    KEEPALIVE       connection health checks
+    READ            polling reads
+
+Reads take one slot per slice of READ_SLICE_SIZE nodes, so a write waits for
+at most one slice instead of a whole read cycle. Slot waits are sampled per
+priority (wait_stats) and exercised by `manage.py benchmark_session_scheduler`.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+EMERGENCY_STOP = 0
+CONTROL_WRITE = 1
+KEEPALIVE = 2
+READ = 3
+
+PRIORITY_NAMES = {
+    EMERGENCY_STOP: "emergency_stop",
+    CONTROL_WRITE: "control_write",
+    KEEPALIVE: "keepalive",
+    READ: "read",
+}
+
+READ_SLICE_SIZE = 25  # nodes per Read request
+WAIT_SAMPLES = 1000  # most recent slot waits kept per priority
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class SessionScheduler:
+    """Priority-ordered exclusive access to one station's OPC UA session."""
+
+    def __init__(self, name):
+        self.name = name
+        self._cond = threading.Condition()
+        self._waiting = []  # heap of (priority, ticket)
+        self._tickets = itertools.count()
+        self._busy = False
+        self._waits = {priority: deque(maxlen=WAIT_SAMPLES) for priority in PRIORITY_NAMES}
+
+    @contextmanager
+    def slot(self, priority):
+        """Hold the session for one request; blocks until every more urgent waiter is done."""
+        entry = (priority, next(self._tickets))
+        queued_at = time.perf_counter()
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            while self._busy or self._waiting[0] != entry:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._busy = True
+        self._waits[priority].append(time.perf_counter() - queued_at)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def wait_stats(self):
+        """
+        Slot wait times over the recent samples.
+
+        Returns:
+            Dict of priority name -> {count, p50_ms, p99_ms, max_ms}
+        """
+        stats = {}
+        for priority, waits in self._waits.items():
+            samples = list(waits)
+            stats[PRIORITY_NAMES[priority]] = {
+                "count": len(samples),
+                "p50_ms": _ms(percentile(samples, 50)),
+                "p99_ms": _ms(percentile(samples, 99)),
+                "max_ms": _ms(max(samples) if samples else None),
+            }
+        return stats
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
@@ -4,7 +4,11 @@ from django.db.models.signals import post_migrate
 from django.core.cache import cache
 from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import OpcUaClientConfig, OPCUANode, ThresholdBreach
+from .models import OpcUaClientConfig, OPCUANode, ThresholdBreach, TagName, ConnectionLog, ControlPermission
+from .model_versions import bump_model_version_on_commit, LIVE_NODE_FIELDS
+from .control_permissions import invalidate_control_permissions
+from functools import partial
+from django.db import transaction
 import logging
 
 logger = logging.getLogger(__name__)
@@ -82,3 +86,28 @@ def on_threshold_breach_created(sender, instance, created, **kwargs):
         except Exception as e:
             logger.error(f"Signal handler failed to send notifications for breach {instance.id}: {e}")
 
+
+@receiver(post_save, sender=OpcUaClientConfig)
+@receiver(post_delete, sender=OpcUaClientConfig)
+@receiver(post_save, sender=OPCUANode)
+@receiver(post_save, sender=TagName)
+@receiver(post_delete, sender=TagName)
+@receiver(post_save, sender=ThresholdBreach)
+@receiver(post_save, sender=ConnectionLog)
+@receiver(post_delete, sender=ConnectionLog)
+def bump_version_on_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate ETags of read endpoints built on this model (roams_api/conditional.py).
+    Deletes of nodes and breaches bump through sync_tombstones.delete_with_tombstones
+    instead: a post_delete receiver would turn their bulk deletes into row-by-row ones.
+    """
+    if sender is OPCUANode and update_fields and set(update_fields) <= LIVE_NODE_FIELDS:
+        return  # Ingest value refresh, not a configuration change
+    bump_model_version_on_commit(sender._meta.label_lower)
+
+
+@receiver(post_save, sender=ControlPermission)
+@receiver(post_delete, sender=ControlPermission)
+def invalidate_permissions_on_change(sender, instance, **kwargs):
+    """Rebuild the user's compiled control permissions (control_permissions.py) after commit."""
+    transaction.on_commit(partial(invalidate_control_permissions, instance.user_id))
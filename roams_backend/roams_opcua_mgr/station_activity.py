@@ -0,0 +1,137 @@
+"""
+Station activity - per-station, per-hour read counters and connected time.
+
+The ingest loop adds each read cycle's counts to the current hour
+(record_station_activity). Connected time comes from the ConnectionLog
+transitions and is settled once an hour is over by
+`manage.py rollup_station_activity` (rollup_station_activity); hours not rolled
+up yet keep connected_seconds empty and readers compute them live with
+connected_seconds_by_hour. Rows for past hours never change after that, so the
+uptime trend reads a few hundred small rows instead of scanning OpcUaReadLog.
+"""
+
+import logging
+from django.apps import apps
+from django.db import connection
+from roams_opcua_mgr.rollups import bucket_start
+from roams_opcua_mgr.utils.server_uptime import connection_spans_cte
+
+logger = logging.getLogger(__name__)
+
+HOUR_SECONDS = 3600
+
+_RECORD_SQL = """
+    INSERT INTO {table} AS a (station_id, bucket, read_count, success_count, logged_count)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (station_id, bucket) DO UPDATE SET
+        read_count = a.read_count + EXCLUDED.read_count,
+        success_count = a.success_count + EXCLUDED.success_count,
+        logged_count = a.logged_count + EXCLUDED.logged_count
+"""
+
+# Online spans cut at hour boundaries: seconds online per (station, hour) in [since, until)
+_CONNECTED_CTE = """
+    {spans_cte},
+    hours AS (
+        SELECT generate_series(
+            date_bin('1 hour', %(since)s::timestamptz, 'epoch'::timestamptz),
+            %(until)s::timestamptz - interval '1 microsecond',
+            interval '1 hour'
+        ) AS bucket
+    ),
+    connected AS (
+        SELECT
+            sp.station_id,
+            h.bucket,
+            SUM(EXTRACT(EPOCH FROM
+                LEAST(sp.ends, h.bucket + interval '1 hour') - GREATEST(sp.ts, h.bucket)
+            )) AS seconds
+        FROM spans sp
+        JOIN hours h ON sp.ts < h.bucket + interval '1 hour' AND sp.ends > h.bucket
+        WHERE sp.status = 'online'
+        GROUP BY sp.station_id, h.bucket
+    )
+"""
+
+_CONNECTED_SQL = """
+    WITH {connected_cte}
+    SELECT station_id, bucket, seconds FROM connected
+"""
+
+_ROLLUP_SQL = """
+    WITH {connected_cte},
+    logged AS (
+        SELECT client_config_id AS station_id,
+               date_bin('1 hour', "timestamp", 'epoch'::timestamptz) AS bucket,
+               count(*) AS n
+        FROM {read_log}
+        WHERE "timestamp" >= %(since)s AND "timestamp" < %(until)s
+        GROUP BY 1, 2
+    ),
+    settled AS (
+        SELECT h.bucket, s.id AS station_id
+        FROM hours h CROSS JOIN {stations} s
+    )
+    INSERT INTO {table} AS a (station_id, bucket, read_count, success_count, logged_count, connected_seconds)
+    SELECT st.station_id, st.bucket, 0, 0, COALESCE(l.n, 0), COALESCE(c.seconds, 0)
+    FROM settled st
+    LEFT JOIN connected c ON c.station_id = st.station_id AND c.bucket = st.bucket
+    LEFT JOIN logged l ON l.station_id = st.station_id AND l.bucket = st.bucket
+    WHERE c.seconds IS NOT NULL OR l.n IS NOT NULL
+        OR EXISTS (SELECT 1 FROM {table} e WHERE e.station_id = st.station_id AND e.bucket = st.bucket)
+    ON CONFLICT (station_id, bucket) DO UPDATE SET
+        logged_count = EXCLUDED.logged_count,
+        connected_seconds = EXCLUDED.connected_seconds
+"""
+
+
+def _activity_table():
+    return apps.get_model("roams_opcua_mgr", "StationHourlyActivity")._meta.db_table
+
+
+def record_station_activity(station_id, timestamp, reads, successes, logged):
+    """Add one read cycle's counters to the station's current hour."""
+    if not reads:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _RECORD_SQL.format(table=_activity_table()),
+            [station_id, bucket_start(timestamp, HOUR_SECONDS), reads, successes, logged],
+        )
+
+
+def connected_seconds_by_hour(since, until):
+    """
+    Seconds each station was online, per UTC hour overlapping [since, until).
+
+    Returns:
+        Dict of (station_id, bucket) -> seconds; hours without online time are absent
+    """
+    sql = _CONNECTED_SQL.format(
+        connected_cte=_CONNECTED_CTE.format(spans_cte=connection_spans_cte()),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"since": since, "until": until})
+        return {(station_id, bucket): float(seconds) for station_id, bucket, seconds in cursor.fetchall()}
+
+
+def rollup_station_activity(since, until):
+    """
+    Settle the hours in [since, until): connected_seconds from ConnectionLog and
+    logged_count from OpcUaReadLog. since/until should be whole UTC hours in the
+    past. Read attempt counters only exist from the ingest loop and are kept.
+
+    Returns:
+        Number of station-hour rows written
+    """
+    OpcUaClientConfig = apps.get_model("roams_opcua_mgr", "OpcUaClientConfig")
+    OpcUaReadLog = apps.get_model("roams_opcua_mgr", "OpcUaReadLog")
+    sql = _ROLLUP_SQL.format(
+        connected_cte=_CONNECTED_CTE.format(spans_cte=connection_spans_cte()),
+        read_log=connection.ops.quote_name(OpcUaReadLog._meta.db_table),
+        stations=connection.ops.quote_name(OpcUaClientConfig._meta.db_table),
+        table=_activity_table(),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"since": since, "until": until})
+        return cursor.rowcount
@@ -0,0 +1,97 @@
+"""
+Sync tombstones - remember deleted rows for `?since=` delta sync (roams_api/delta_sync.py).
+
+Deletes that clients must hear about go through delete_with_tombstones, which
+writes the tombstones with one INSERT ... SELECT per table in the deleting
+transaction (a rolled-back delete leaves none):
+
+    delete_with_tombstones(OPCUANode.objects.filter(pk=node.pk))
+
+Rows the delete cascades to are covered as well: deleting stations, tag names
+or nodes also tombstones the nodes' threshold breaches and alarms.
+
+There are deliberately no post_delete signals on the synced models: they would
+make Django load and signal every row of a bulk delete. Retention purges
+(cleanup_old_alarms, cleanup_breaches) skip tombstones on purpose: a purged row
+is far older than any token still answered, and clients drop it on their next
+full reload.
+"""
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from roams_opcua_mgr.model_versions import bump_model_version_on_commit
+
+SYNCED_MODELS = frozenset({
+    "roams_opcua_mgr.opcuanode",
+    "roams_opcua_mgr.thresholdbreach",
+    "roams_opcua_mgr.alarmlog",
+})
+
+
+def record_tombstones(queryset):
+    """
+    Tombstone every row of the queryset with a single INSERT ... SELECT.
+    Call it before deleting the rows, inside the same transaction.
+
+    Returns:
+        Number of tombstones written
+    """
+    SyncTombstone = apps.get_model("roams_opcua_mgr", "SyncTombstone")
+    select_sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(SyncTombstone._meta.db_table)} "
+            f"({quote('model_label')}, {quote('deleted_at')}, {quote('object_id')}) "
+            f"SELECT %s, %s, deleted.* FROM ({select_sql}) AS deleted",
+            [queryset.model._meta.label_lower, now(), *params],
+        )
+        return cursor.rowcount
+
+
+def _synced_rows(queryset):
+    """Querysets of the synced rows a delete of `queryset` removes, itself included."""
+    OPCUANode = apps.get_model("roams_opcua_mgr", "OPCUANode")
+    ThresholdBreach = apps.get_model("roams_opcua_mgr", "ThresholdBreach")
+    AlarmLog = apps.get_model("roams_opcua_mgr", "AlarmLog")
+
+    label = queryset.model._meta.label_lower
+    if label == "roams_opcua_mgr.opcuaclientconfig":
+        nodes = OPCUANode.objects.filter(client_config__in=queryset.order_by().values("pk"))
+    elif label == "roams_opcua_mgr.tagname":
+        nodes = OPCUANode.objects.filter(tag_name__in=queryset.order_by().values("pk"))
+    elif label == "roams_opcua_mgr.opcuanode":
+        nodes = queryset
+    else:
+        return [queryset] if label in SYNCED_MODELS else []
+
+    node_pks = nodes.order_by().values("pk")
+    return [
+        ThresholdBreach.objects.filter(node__in=node_pks),
+        AlarmLog.objects.filter(node__in=node_pks),
+        nodes,
+    ]
+
+
+def tombstone_cascade(queryset):
+    """
+    Tombstone the synced rows a delete of `queryset` will remove, for callers
+    deleting them their own way (raw SQL). Versions are bumped on commit.
+    """
+    for rows in _synced_rows(queryset):
+        record_tombstones(rows)
+        bump_model_version_on_commit(rows.model._meta.label_lower)
+
+
+def delete_with_tombstones(queryset):
+    """
+    Delete the queryset's rows, tombstoning them and the synced rows the delete cascades to.
+
+    Returns:
+        What QuerySet.delete() returns
+    """
+    with transaction.atomic():
+        tombstone_cascade(queryset)
+        return queryset.delete()
@@ -0,0 +1,85 @@
+"""
+Time-series downsampling for chart endpoints.
+Both functions take aligned numpy arrays (x ascending) and return the indices
+of the points to keep, so callers can pick any related columns with them.
+"""
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: keeps the visual shape of the series in n_out points.
+    The first and last points are always kept.
+
+    Args:
+        x: 1-D float array of timestamps (ascending)
+        y: 1-D float array of values
+        n_out: Number of points to return
+
+    Returns:
+        Sorted int64 array of selected indices
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n, dtype=np.int64)
+
+    # n_out - 2 middle buckets over points 1..n-2; the last point is its own bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    bucket_starts = np.append(edges[:-1], n - 1)
+    bucket_sizes = np.diff(np.append(bucket_starts, n))
+
+    # Average point of every bucket, computed in one pass
+    avg_x = np.add.reduceat(x, bucket_starts) / bucket_sizes
+    avg_y = np.add.reduceat(y, bucket_starts) / bucket_sizes
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_x, next_y = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def minmax_indices(x, y, n_out):
+    """
+    Min/max-per-bucket: splits the series into n_out // 2 equal-count buckets and
+    keeps the lowest and highest point of each, so no peak is ever dropped.
+
+    Returns:
+        Sorted int64 array of selected indices (at most n_out)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 2:
+        return np.arange(n, dtype=np.int64)
+
+    n_buckets = n_out // 2
+    bucket_ids = (np.arange(n, dtype=np.int64) * n_buckets) // n
+
+    # Sort by (bucket, value): the first entry of each bucket is its min, the last its max
+    order = np.lexsort((y, bucket_ids))
+    starts = np.flatnonzero(np.r_[True, np.diff(bucket_ids) != 0])
+    ends = np.r_[starts[1:], n] - 1
+
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def downsample_indices(x, y, n_out, method="lttb"):
+    """Dispatch to the requested downsampling method."""
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    if method == "minmax":
+        return minmax_indices(x, y, n_out)
+    raise ValueError(f"downsample must be one of {list(DOWNSAMPLE_METHODS)}")
@@ -1,44 +1,89 @@
 # server_uptime.py
 from datetime import timedelta
+from django.db import connection
 from django.utils import timezone
 
 
+# Connection states as spans: seed each station with the state logged before
+# the window, add the transitions inside it, and let LEAD() end each state where
+# the next begins (or at the window end). Seeding is a LATERAL index probe per
+# station, so it costs the same whether the log holds a week or years of history.
+# Yields `spans(station_id, status, ts, ends)`; also used by station_activity.py.
+CONNECTION_SPANS_CTE = """
+    events AS (
+        SELECT s.id AS station_id, %(since)s::timestamptz AS ts, prev.status
+        FROM {stations} s
+        CROSS JOIN LATERAL (
+            SELECT l.status
+            FROM {logs} l
+            WHERE l.station_id = s.id AND l.timestamp < %(since)s
+            ORDER BY l.timestamp DESC
+            LIMIT 1
+        ) prev
+        UNION ALL
+        SELECT l.station_id, l.timestamp, l.status
+        FROM {logs} l
+        WHERE l.timestamp >= %(since)s AND l.timestamp < %(until)s
+    ),
+    spans AS (
+        SELECT
+            station_id,
+            status,
+            ts,
+            LEAD(ts, 1, %(until)s::timestamptz) OVER (PARTITION BY station_id ORDER BY ts) AS ends
+        FROM events
+    )
+"""
 
-def calculate_uptime(days=30):
-    from roams_opcua_mgr.models import OpcUaClientConfig, ConnectionLog
-    """
-    Calculate station uptime percentage over a given number of days.
-    Uses connection logs from ConnectionLog model.
-    """
-    since = timezone.now() - timedelta(days=days)
-    total_duration = timedelta(days=days).total_seconds()
-    total_duration = total_duration if total_duration > 0 else 1  # Avoid zero division
+_UPTIME_SQL = """
+    WITH {spans_cte}
+    SELECT
+        s.station_name,
+        COALESCE(SUM(EXTRACT(EPOCH FROM sp.ends - sp.ts)) FILTER (WHERE sp.status = 'online'), 0)
+    FROM {stations} s
+    LEFT JOIN spans sp ON sp.station_id = s.id
+    GROUP BY s.id, s.station_name
+"""
 
-    stations = OpcUaClientConfig.objects.all()
-    result = {}
 
-    for station in stations:
-        logs = (
-            ConnectionLog.objects.filter(station=station, timestamp__gte=since)
-            .order_by("timestamp")
-            .only("status", "timestamp")
-        )
+def connection_spans_cte():
+    """CONNECTION_SPANS_CTE with the table names filled in."""
+    from roams_opcua_mgr.models import OpcUaClientConfig, ConnectionLog
+    return CONNECTION_SPANS_CTE.format(
+        stations=connection.ops.quote_name(OpcUaClientConfig._meta.db_table),
+        logs=connection.ops.quote_name(ConnectionLog._meta.db_table),
+    )
 
-        uptime_seconds = 0.0
-        last_online = None
 
-        for log in logs:
-            if log.status == "online":
-                last_online = log.timestamp
-            elif log.status == "offline" and last_online:
-                uptime_seconds += (log.timestamp - last_online).total_seconds()
-                last_online = None
+def calculate_uptime(days=30, since=None, until=None):
+    from roams_opcua_mgr.models import OpcUaClientConfig
+    """
+    Calculate station uptime percentage over a window, for all stations in one query.
+    Uses the online/offline transitions recorded in ConnectionLog: a station
+    counts as online from an "online" row until the next "offline" one, with
+    intervals clipped to the window edges.
+
+    Args:
+        days: Window length ending now (ignored when since is given)
+        since, until: Explicit window; until defaults to now
 
-        # If the station is still online at the end
-        if last_online:
-            uptime_seconds += (timezone.now() - last_online).total_seconds()
+    Returns:
+        Dict of station_name -> uptime % (stations never logged get 0)
+    """
+    until = until or timezone.now()
+    since = since or until - timedelta(days=days)
+    total_duration = (until - since).total_seconds()
+    total_duration = total_duration if total_duration > 0 else 1  # Avoid zero division
 
-        uptime = (uptime_seconds / total_duration) * 100
-        result[station.station_name] = round(uptime, 2)
+    sql = _UPTIME_SQL.format(
+        spans_cte=connection_spans_cte(),
+        stations=connection.ops.quote_name(OpcUaClientConfig._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {"since": since, "until": until})
+        rows = cursor.fetchall()
 
-    return result
+    return {
+        station_name: round(float(uptime_seconds) / total_duration * 100, 2)
+        for station_name, uptime_seconds in rows
+    }
@@ -0,0 +1,111 @@
+"""
+Sliding-window cache: per-bucket partial aggregates, extended at the tail.
+
+A "last 24 hours" aggregate polled every few seconds only changes in its
+newest buckets. The cache keeps the partials of every bucket in the window
+(in the Django cache, so all workers share them) together with a high-water
+mark; each call then queries only the buckets from the high-water mark on,
+drops buckets that slid out of the window, and returns the rest for the
+caller to merge:
+
+    top_params = SlidingWindowCache("top-params", timedelta(minutes=5), compute_partials)
+    for bucket, partial in top_params.buckets(key, start, end):
+        ...
+
+compute(start, end) must return {bucket_start: partial} for the rows with
+start <= timestamp < end. Buckets are aligned on the Unix epoch, like
+date_bin() in time_buckets.py. The bucket the window starts in is clipped to
+the window, so results match a plain aggregate over [start, end) exactly.
+
+The tail is re-read from `lag` before the high-water mark, so rows committed
+a little late are still counted; edits to older rows (deletes, backfills)
+show up once the state expires after `max_age` and is rebuilt in full.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.cache import cache
+
+from roams_opcua_mgr.rollups import bucket_start
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowCache:
+    """Per-bucket partials of one aggregate, keyed by the caller's parameters."""
+
+    def __init__(self, name, width, compute, lag=timedelta(seconds=10), max_age=600):
+        """
+        Args:
+            name: Cache namespace for this aggregate
+            width: Bucket width (timedelta)
+            compute: Callable(start, end) -> {bucket_start: partial} for [start, end)
+            lag: How far before the high-water mark the tail is re-read
+            max_age: Seconds before the state is rebuilt from scratch
+        """
+        if width <= timedelta(0):
+            raise ValueError("Bucket width must be positive")
+        self.name = name
+        self.width_seconds = int(width.total_seconds())
+        self.compute = compute
+        self.lag = lag
+        self.max_age = max_age
+
+    def _cache_key(self, key):
+        return f"swc:{self.name}:{key}"
+
+    def buckets(self, key, start, end):
+        """
+        Partials of every bucket overlapping [start, end), oldest first.
+
+        Args:
+            key: Identifies the parameters the partials depend on (station, ...)
+            start, end: Window; end is normally now()
+
+        Returns:
+            List of (bucket_start, partial)
+        """
+        width = timedelta(seconds=self.width_seconds)
+        first = bucket_start(start, self.width_seconds)
+        # The bucket holding `start` is only partly inside the window: it is read
+        # exactly on every call and never stored. Whole buckets start after it.
+        body = first + width if first < start else first
+        cache_key = self._cache_key(key)
+
+        try:
+            state = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"⚠️ Sliding window cache unavailable for {self.name}: {e}")
+            state = None
+
+        if (
+            state is None
+            or not body <= state["high_water"] <= end
+            or (end - state["built_at"]).total_seconds() > self.max_age
+        ):
+            # Nothing usable (or due for a full rebuild): compute the whole window
+            partials = self.compute(body, end) if body < end else {}
+            built_at = end
+        else:
+            built_at = state["built_at"]
+            tail = max(body, bucket_start(state["high_water"] - self.lag, self.width_seconds))
+            partials = {
+                bucket: partial
+                for bucket, partial in state["partials"].items()
+                if body <= bucket < tail
+            }
+            partials.update(self.compute(tail, end))
+
+        try:
+            cache.set(
+                cache_key,
+                {"partials": partials, "high_water": end, "built_at": built_at},
+                timeout=self.max_age,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not store sliding window {self.name}: {e}")
+
+        if first < start:
+            partials = {**partials, **self.compute(start, min(body, end))}
+        return sorted(partials.items())
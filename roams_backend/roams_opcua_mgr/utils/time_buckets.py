@@ -0,0 +1,112 @@
+"""
+Arbitrary-width time bucketing with gap filling (PostgreSQL 14+ date_bin).
+
+    rows = bucketed_series(
+        ThresholdBreach.objects.all(), "timestamp", timedelta(minutes=15),
+        start, end, total=Count("id"),
+    )
+    # [{"bucket": datetime, "total": 3}, {"bucket": ..., "total": 0}, ...]
+
+One aggregate query groups the rows with date_bin() (so the timestamp range
+filter still uses its index), and generate_series() joins in every bucket of
+[start, end], so empty buckets come back as explicit zeros instead of gaps.
+Buckets are aligned on the Unix epoch (UTC), like the reading rollups.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import connections
+from django.db.models import Count, DateTimeField, F, Func, Value
+
+BUCKET_ORIGIN = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class DateBin(Func):
+    """date_bin(stride, source, origin): start of the stride-wide bucket holding source."""
+    function = "date_bin"
+    output_field = DateTimeField()
+
+    def __init__(self, stride, expression, origin=BUCKET_ORIGIN, **extra):
+        super().__init__(Value(stride), expression, Value(origin), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # date_bin(interval, timestamptz, timestamptz); Value(timedelta) is untyped without the cast
+        stride, source, origin = self.get_source_expressions()
+        stride_sql, stride_params = compiler.compile(stride)
+        source_sql, source_params = compiler.compile(source)
+        origin_sql, origin_params = compiler.compile(origin)
+        return (
+            f"date_bin({stride_sql}::interval, {source_sql}, {origin_sql}::timestamptz)",
+            (*stride_params, *source_params, *origin_params),
+        )
+
+
+def bucketed_series(queryset, field, width, start, end, group_by=(), **aggregates):
+    """
+    Aggregate a queryset into fixed-width time buckets with no gaps.
+
+    Args:
+        queryset: Rows to aggregate (already filtered by anything but time)
+        field: DateTimeField to bucket on
+        width: Bucket width (timedelta), e.g. 5 min, 15 min, 6 h
+        start, end: Window (inclusive); every bucket overlapping it is returned
+        group_by: Extra lookups to group on (e.g. "node__client_config__station_name");
+            each group seen in the window gets the full run of buckets
+        **aggregates: Output name -> aggregate expression
+
+    Returns:
+        List of dicts (bucket, *group_by, *aggregates) ordered by bucket then group.
+        Empty buckets hold 0 for Count aggregates and None for the others.
+    """
+    if width <= timedelta(0):
+        raise ValueError("Bucket width must be positive")
+
+    # Group lookups get plain aliases so the outer query can join on them
+    group_aliases = {f"g{i}": lookup for i, lookup in enumerate(group_by)}
+    inner = (
+        queryset
+        .filter(**{f"{field}__gte": start, f"{field}__lte": end})
+        .annotate(time_bucket=DateBin(width, F(field)), **{alias: F(lookup) for alias, lookup in group_aliases.items()})
+        .values("time_bucket", *group_aliases)
+        .annotate(**aggregates)
+        .order_by()
+    )
+    inner_sql, inner_params = inner.query.sql_with_params()
+
+    select = ["s.bucket"] + [f'g."{alias}"' for alias in group_aliases]
+    fill = []
+    for name, aggregate in aggregates.items():
+        column = f'agg."{name}"'
+        select.append(f"COALESCE({column}, 0)" if isinstance(aggregate, Count) else column)
+        fill.append(name)
+
+    if group_aliases:
+        groups = ", ".join(f'"{alias}"' for alias in group_aliases)
+        groups_sql = f"CROSS JOIN (SELECT DISTINCT {groups} FROM agg) g"
+        join_on = " AND ".join(
+            ["agg.time_bucket = s.bucket"]
+            + [f'agg."{alias}" IS NOT DISTINCT FROM g."{alias}"' for alias in group_aliases]
+        )
+        order_by = "s.bucket, " + ", ".join(f'g."{alias}"' for alias in group_aliases)
+    else:
+        groups_sql = ""
+        join_on = "agg.time_bucket = s.bucket"
+        order_by = "s.bucket"
+
+    sql = f"""
+        WITH agg AS ({inner_sql})
+        SELECT {", ".join(select)}
+        FROM generate_series(
+            date_bin(%s::interval, %s::timestamptz, %s::timestamptz),
+            %s::timestamptz,
+            %s::interval
+        ) AS s(bucket)
+        {groups_sql}
+        LEFT JOIN agg ON {join_on}
+        ORDER BY {order_by}
+    """
+    params = (*inner_params, width, start, BUCKET_ORIGIN, end, width)
+
+    names = ["bucket", *group_by, *fill]
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
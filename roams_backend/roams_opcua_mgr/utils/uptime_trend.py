@@ -5,8 +5,8 @@ Tracks how long the Django server (and stations) have been running.
 
 from datetime import timedelta, datetime
 from django.utils import timezone
-from django.db.models import Count, Q
-from django.db.models.functions import TruncHour, TruncDay
+from django.db.models import Sum
+from django.db.models.functions import TruncDay
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,19 +15,39 @@ logger = logging.getLogger(__name__)
 def get_django_server_uptime():
     """
     Get Django server uptime duration.
-    This tracks how long the server process has been running.
+    This tracks how long web processes have been running without interruption,
+    read from the process registry (roams_opcua_mgr/process_registry.py).
     
     Returns:
-        dict with uptime information
+        dict with uptime information and the processes currently alive
     """
-    from django.core.cache import cache
-    from roams_opcua_mgr.logging_model import OpcUaReadLog
+    from datetime import timezone as dt_timezone
+    from roams_opcua_mgr.process_registry import list_processes, role_up_since
     
-    # Get the earliest read log as server start time
-    earliest_log = OpcUaReadLog.objects.earliest('timestamp') if OpcUaReadLog.objects.exists() else None
+    try:
+        up_since = role_up_since('web')
+        processes = list_processes()
+    except Exception as e:
+        logger.warning(f"⚠️ Process registry unavailable: {e}")
+        return {
+            'status': 'unknown',
+            'message': 'Process registry unavailable',
+        }
     
-    if earliest_log:
-        server_start = earliest_log.timestamp
+    process_info = [
+        {
+            'pid': p['pid'],
+            'host': p['host'],
+            'role': p['role'],
+            'start_time': datetime.fromtimestamp(p['started_at'], dt_timezone.utc).isoformat(),
+            'last_heartbeat': datetime.fromtimestamp(p['heartbeat_at'], dt_timezone.utc).isoformat(),
+        }
+        for p in processes
+    ]
+    ingest_count = sum(1 for p in processes if p['role'] == 'ingest')
+    
+    if up_since:
+        server_start = datetime.fromtimestamp(up_since, dt_timezone.utc)
         server_uptime = timezone.now() - server_start
         
         days = server_uptime.days
@@ -43,66 +63,84 @@ def get_django_server_uptime():
             'days': days,
             'hours': hours,
             'minutes': minutes,
+            'processes': process_info,
+            # More than one ingest process means every reading is stored twice
+            'duplicate_ingest': ingest_count > 1,
         }
     else:
         return {
             'status': 'unknown',
-            'message': 'No data collected yet',
+            'message': 'No web process registered',
+            'processes': process_info,
+            'duplicate_ingest': ingest_count > 1,
         }
 
 
 def get_uptime_trend_hourly(hours=24):
     """
     Get hourly uptime trend for the past N hours.
-    Shows uptime % for each station in hourly buckets.
+    Shows, for each station in hourly buckets, the readings stored and the uptime %.
+    
+    Reads StationHourlyActivity only. Connected time of hours not settled yet by
+    `manage.py rollup_station_activity` (normally just the current one) is
+    computed live from ConnectionLog.
     
     Args:
         hours: Number of hours to look back
     
     Returns:
-        List of dicts with timestamp and per-station uptime percentages
+        List of dicts with timestamp, per-station reading counts and an
+        `uptime` dict of per-station uptime percentages
     """
-    from roams_opcua_mgr.models import OpcUaClientConfig
-    from roams_opcua_mgr.logging_model import OpcUaReadLog
+    from roams_opcua_mgr.models import OpcUaClientConfig, StationHourlyActivity
+    from roams_opcua_mgr.rollups import bucket_start
+    from roams_opcua_mgr.station_activity import HOUR_SECONDS, connected_seconds_by_hour
     
     try:
-        cutoff = timezone.now() - timedelta(hours=hours)
+        end = timezone.now()
+        start = bucket_start(end - timedelta(hours=hours), HOUR_SECONDS)
+        current = bucket_start(end, HOUR_SECONDS)
+        hour = timedelta(seconds=HOUR_SECONDS)
         
-        # Get all stations
-        stations = OpcUaClientConfig.objects.all()
+        rows = {
+            (station_id, bucket): (logged_count, connected_seconds)
+            for station_id, bucket, logged_count, connected_seconds in (
+                StationHourlyActivity.objects
+                .filter(bucket__gte=start)
+                .values_list('station_id', 'bucket', 'logged_count', 'connected_seconds')
+            )
+        }
         
-        # Get hourly buckets of read logs
-        logs = (
-            OpcUaReadLog.objects
-            .filter(timestamp__gte=cutoff)
-            .annotate(hour=TruncHour('timestamp'))
-            .values('hour', 'client_config__station_name')
-            .annotate(count=Count('id'))
-            .order_by('hour', 'client_config__station_name')
+        # Hours after the last settled one get their connected time computed live
+        settled_until = max(
+            (bucket + hour for (_, bucket), (_, seconds) in rows.items() if seconds is not None),
+            default=start,
         )
+        live = connected_seconds_by_hour(settled_until, end) if settled_until < end else {}
         
-        # Build trend data structure
-        trend_data = {}
-        for log in logs:
-            hour = log['hour']
-            station = log['client_config__station_name']
-            count = log['count']
-            
-            if hour not in trend_data:
-                trend_data[hour] = {'timestamp': hour.isoformat()}
-            
-            trend_data[hour][station] = count
+        station_ids = {station_id for station_id, _ in rows} | {station_id for station_id, _ in live}
+        station_names = dict(
+            OpcUaClientConfig.objects.filter(id__in=station_ids).values_list('id', 'station_name')
+        )
         
-        # Calculate uptime percentages for each hour
+        # One entry per hour; hours without reads come back as 0
         result = []
-        for timestamp in sorted(trend_data.keys()):
-            entry = trend_data[timestamp]
-            entry['timestamp'] = timestamp.isoformat()
+        timestamp = start
+        while timestamp <= current:
+            entry = {'timestamp': timestamp.isoformat(), 'uptime': {}}
+            hour_length = (end - timestamp).total_seconds() if timestamp == current else HOUR_SECONDS
+            for station_id, station in sorted(station_names.items(), key=lambda item: item[1]):
+                logged_count, connected_seconds = rows.get((station_id, timestamp), (0, None))
+                if timestamp >= settled_until:
+                    connected_seconds = live.get((station_id, timestamp), 0)
+                entry[station] = logged_count
+                entry['uptime'][station] = round(min(100.0, (connected_seconds or 0) / max(hour_length, 1) * 100), 2)
             
             # Add a numeric timestamp for sorting
             entry['ts'] = int(timestamp.timestamp() * 1000)
             
             result.append(entry)
+            timestamp += hour
         
         return result
     
@@ -114,38 +152,36 @@ def get_uptime_trend_hourly(hours=24):
 def get_uptime_trend_daily(days=30):
     """
     Get daily uptime trend for the past N days.
-    Shows uptime % for each station per day.
+    Shows readings stored for each station per day, summed from StationHourlyActivity.
     
     Args:
         days: Number of days to look back
     
     Returns:
-        List of dicts with date and per-station uptime percentages
+        List of dicts with date and per-station reading counts
     """
-    from roams_opcua_mgr.models import OpcUaClientConfig
-    from roams_opcua_mgr.logging_model import OpcUaReadLog
+    from roams_opcua_mgr.models import StationHourlyActivity
+    from roams_opcua_mgr.rollups import bucket_start
+    from roams_opcua_mgr.station_activity import HOUR_SECONDS
     
     try:
-        cutoff = timezone.now() - timedelta(days=days)
-        
-        # Get all stations
-        stations = OpcUaClientConfig.objects.all()
+        cutoff = bucket_start(timezone.now() - timedelta(days=days), HOUR_SECONDS)
         
-        # Get daily buckets of read logs
+        # Get daily buckets of hourly activity
         logs = (
-            OpcUaReadLog.objects
-            .filter(timestamp__gte=cutoff)
-            .annotate(day=TruncDay('timestamp'))
-            .values('day', 'client_config__station_name')
-            .annotate(count=Count('id'))
-            .order_by('day', 'client_config__station_name')
+            StationHourlyActivity.objects
+            .filter(bucket__gte=cutoff)
+            .annotate(day=TruncDay('bucket'))
+            .values('day', 'station__station_name')
+            .annotate(count=Sum('logged_count'))
+            .order_by('day', 'station__station_name')
         )
         
         # Build trend data structure
         trend_data = {}
         for log in logs:
             day = log['day']
-            station = log['client_config__station_name']
+            station = log['station__station_name']
             count = log['count']
             
             if day not in trend_data:
@@ -2,12 +2,24 @@ import logging
 from opcua import Client, ua
 from django.utils.timezone import now
 from colorama import Fore, Style
-from roams_opcua_mgr.models import OpcUaWriteLog
+from roams_opcua_mgr.models import OpcUaWriteLog, OPCUANode
+from roams_opcua_mgr.session_scheduler import CONTROL_WRITE
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-def write_station_node(client: Client, node, value, command=None):
+def to_write_value(node, value):
+    """Convert value to proper OPC UA type based on node data type."""
+    if node.data_type == "Boolean":
+        return bool(int(value)) if not isinstance(value, bool) else value
+    elif node.data_type in ["Int16", "Int32", "Int64", "UInt16", "UInt32", "UInt64", "Integer"]:
+        return int(value) if not isinstance(value, int) else value
+    elif node.data_type in ["Float", "Double"]:
+        return float(value) if not isinstance(value, float) else value
+    # For unknown types, use value as-is
+    return value
+
+def write_station_node(client: Client, node, value, command=None, session=None, priority=CONTROL_WRITE):
     """
     Write a value to an OPC UA node using proper DataValue and Variant types (like UA Expert).
 
@@ -16,27 +28,23 @@ def write_station_node(client: Client, node, value, command=None):
         node (OPCUANode): The node to write to (model instance).
         value (any): The value to write.
         command (str): Optional command label, like 'START' or 'STOP'.
+        session (SessionScheduler): The station's session scheduler, if the client is shared.
+        priority (int): Session priority for the write.
 
     Returns:
         bool: True if successful, False otherwise.
     """
     try:
         opc_node = client.get_node(node.node_id)
-        
-        # Convert value to proper OPC UA type based on node data type
-        if node.data_type == "Boolean":
-            write_value = bool(int(value)) if not isinstance(value, bool) else value
-        elif node.data_type in ["Int16", "Int32", "Int64", "UInt16", "UInt32", "UInt64", "Integer"]:
-            write_value = int(value) if not isinstance(value, int) else value
-        elif node.data_type in ["Float", "Double"]:
-            write_value = float(value) if not isinstance(value, float) else value
-        else:
-            # For unknown types, use value as-is
-            write_value = value
+        write_value = to_write_value(node, value)
         
         # Create DataValue with Variant (UA Expert method)
         dv = ua.DataValue(ua.Variant(write_value))
-        opc_node.set_value(dv)
+        if session is not None:
+            with session.slot(priority):
+                opc_node.set_value(dv)
+        else:
+            opc_node.set_value(dv)
 
         # Log success
         logger.info(f"{Fore.BLUE}✅ Written '{write_value}' to {node.node_id} ({node.tag_name}){Style.RESET_ALL}")
@@ -60,3 +68,63 @@ def write_station_node(client: Client, node, value, command=None):
     except Exception as e:
         logger.error(f"{Fore.RED}❌ Write failed: {e} [Node: {node.node_id}]{Style.RESET_ALL}")
         return False
+
+def write_station_nodes(client: Client, writes, command=None, session=None, priority=CONTROL_WRITE):
+    """
+    Write several nodes of one station in a single OPC UA Write service call.
+
+    Args:
+        client (Client): Connected OPC UA client.
+        writes (list): (OPCUANode, value) pairs, all on this client's server.
+        command (str): Optional command label, like 'START' or 'STOP'.
+        session (SessionScheduler): The station's session scheduler, if the client is shared.
+        priority (int): Session priority for the write.
+
+    Returns:
+        list: OPC UA status name per write, in order ("Good" when written).
+        Errors of the service call itself (session lost, ...) are raised.
+        Nothing is saved: the caller records accepted writes (record_station_writes)
+        together with the rest of the outcome.
+    """
+    write_values = [to_write_value(node, value) for node, value in writes]
+    node_ids = [ua.NodeId.from_string(node.node_id) for node, _ in writes]
+    datavalues = [ua.DataValue(ua.Variant(write_value)) for write_value in write_values]
+
+    if session is not None:
+        with session.slot(priority):
+            results = client.uaclient.set_attributes(node_ids, datavalues, ua.AttributeIds.Value)
+    else:
+        results = client.uaclient.set_attributes(node_ids, datavalues, ua.AttributeIds.Value)
+
+    for (node, _), result in zip(writes, results):
+        if not result.is_good():
+            logger.error(f"{Fore.RED}❌ Write failed: {result.name} [Node: {node.node_id}]{Style.RESET_ALL}")
+    written = sum(1 for result in results if result.is_good())
+    logger.info(f"{Fore.BLUE}✅ Bulk write: {written}/{len(writes)} nodes written{Style.RESET_ALL}")
+    return [result.name for result in results]
+
+def record_station_writes(writes, command=None):
+    """
+    Record nodes written by write_station_nodes: one UPDATE and one INSERT for the batch.
+
+    Args:
+        writes (list): (OPCUANode, value) pairs the server accepted.
+        command (str): Optional command label, like 'START' or 'STOP'.
+    """
+    timestamp = now()
+    written_nodes = []
+    write_logs = []
+    for node, value in writes:
+        write_value = to_write_value(node, value)
+        node.last_value = str(write_value)
+        node.last_updated = timestamp
+        written_nodes.append(node)
+        write_logs.append(OpcUaWriteLog(
+            client_config_id=node.client_config_id,
+            node=node,
+            value=str(write_value),
+            command=command,
+            timestamp=timestamp
+        ))
+    OPCUANode.objects.bulk_update(written_nodes, ["last_value", "last_updated"])
+    OpcUaWriteLog.objects.bulk_create(write_logs)
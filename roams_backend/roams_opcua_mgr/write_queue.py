@@ -0,0 +1,433 @@
+"""
+Control write queue - PLC writes run in the ingest process, never in a web request.
+
+The API validates a write, stores a ControlWriteJob and answers 202 with its
+id right away (submit_write). Once the job row is committed its id is pushed
+onto the station's queue, which a worker thread in the ingest process drains
+(serve_write_queue, started next to each OPCUAClientHandler):
+
+    roams:writeq:<station pk>         list   ids of jobs waiting for the station's worker,
+                                             or "batch:<batch id>" for a bulk write
+    roams:writeq:<station pk>:estop   list   the same for writes to emergency stop controls
+
+The worker always pops the e-stop list first, so an emergency stop never
+waits behind a backlog of ordinary writes. The worker claims a job, performs the OPC UA write with no database
+transaction open, then records the outcome (job status, ControlState,
+ControlStateHistory) in one short transaction. Progress is pushed
+to ws/live/ subscribers (live_push.publish_write_job) and readable at
+/api/write-jobs/<id>/.
+
+A bulk write (submit_bulk_write) is one job per node sharing a batch_id; the
+worker writes them in a single OPC UA Write call and stores each node's
+status code on its job.
+
+Jobs not started within WRITE_JOB_TTL seconds are expired instead of being
+written late: an operator's "open valve" must not land minutes after they
+gave up on it. If a push is lost (Redis down at commit time) the worker's
+periodic sweep still finds the queued row. The sweep also fails jobs left
+"running" for more than WRITE_TIMEOUT seconds (the ingest process died or
+restarted mid-write), so no job stays in flight forever; anything created
+before write_job_cutoff() can no longer be in progress.
+"""
+
+import logging
+import time
+import uuid
+from datetime import timedelta
+from functools import partial
+
+from django.apps import apps
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.timezone import now
+from django_redis import get_redis_connection
+
+from roams_opcua_mgr.live_push import publish_write_job
+from roams_opcua_mgr.session_scheduler import CONTROL_WRITE, EMERGENCY_STOP
+from roams_opcua_mgr.write_data import record_station_writes, write_station_node, write_station_nodes
+
+logger = logging.getLogger(__name__)
+
+WRITE_QUEUE_PREFIX = "roams:writeq"
+BATCH_PREFIX = "batch:"
+WRITE_JOB_TTL = 60  # seconds a job may wait before it is expired
+WRITE_TIMEOUT = 60  # seconds a running job may take (request_time_out is capped at 60s)
+POLL_TIMEOUT = 5  # seconds per BLPOP; the DB is swept for lost pushes this often
+
+
+def _queue_key(station_pk, priority=CONTROL_WRITE):
+    if priority == EMERGENCY_STOP:
+        return f"{WRITE_QUEUE_PREFIX}:{station_pk}:estop"
+    return f"{WRITE_QUEUE_PREFIX}:{station_pk}"
+
+
+def _push(station_pk, item, priority=CONTROL_WRITE):
+    try:
+        get_redis_connection("default").rpush(_queue_key(station_pk, priority), str(item))
+    except Exception as e:
+        # The worker's sweep picks the job up from the database instead
+        logger.warning(f"⚠️ Could not queue write job {item}: {e}")
+
+
+def write_job_cutoff():
+    """Jobs created before this are past their TTL plus the write timeout: none is still in flight."""
+    return now() - timedelta(seconds=WRITE_JOB_TTL + WRITE_TIMEOUT)
+
+
+def submit_write(node, value, kind="node_write", command=None, requested_by=None,
+                 control_state=None, control_request=None, reason="", ip_address=None):
+    """
+    Store a write job for the node's station and queue it once committed.
+
+    Args:
+        node: OPCUANode to write (its client_config is the station)
+        value: Value already converted to the node's data type
+        kind: "node_write" or "control_change"
+        Remaining arguments are recorded on the job for the audit trail
+
+    Returns:
+        The ControlWriteJob (status "queued")
+    """
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+    job = ControlWriteJob.objects.create(
+        kind=kind,
+        station_id=node.client_config_id,
+        node=node,
+        value=value,
+        command=command,
+        requested_by=requested_by if requested_by is not None and requested_by.is_authenticated else None,
+        control_state=control_state,
+        control_request=control_request,
+        reason=reason or "",
+        ip_address=ip_address,
+    )
+    transaction.on_commit(partial(_push, node.client_config_id, job.pk, _write_priority(job)))
+    logger.info(f"📮 Queued write job {job.pk}: {node.tag_name} = {value}")
+    return job
+
+
+def submit_bulk_write(station, writes, command=None, requested_by=None, reason="", ip_address=None):
+    """
+    Store one job per node for a single-call bulk write and queue the batch once committed.
+
+    Args:
+        station: OpcUaClientConfig every node belongs to
+        writes: (OPCUANode, value) pairs, values already converted
+        Remaining arguments are recorded on every job
+
+    Returns:
+        (batch_id, list of ControlWriteJob in the order of writes)
+    """
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+    batch_id = uuid.uuid4()
+    requested_by = requested_by if requested_by is not None and requested_by.is_authenticated else None
+    jobs = ControlWriteJob.objects.bulk_create([
+        ControlWriteJob(
+            kind="node_write",
+            batch_id=batch_id,
+            station=station,
+            node=node,
+            value=value,
+            command=command,
+            requested_by=requested_by,
+            reason=reason or "",
+            ip_address=ip_address,
+        )
+        for node, value in writes
+    ])
+    priority = _batch_priority([node.pk for node, _ in writes])
+    transaction.on_commit(partial(_push, station.pk, f"{BATCH_PREFIX}{batch_id}", priority))
+    logger.info(f"📮 Queued bulk write {batch_id}: {len(jobs)} nodes on {station.station_name}")
+    return batch_id, jobs
+
+
+def serve_write_queue(client_handler):
+    """Worker loop for one station's queue; runs in its own ingest thread."""
+    station_pk = client_handler.config.pk
+    logger.info(f"📮 Write queue worker started for {client_handler.config.station_name}")
+
+    swept_at = 0.0  # Sweep straight away: jobs may be left over from before a restart
+    while True:
+        try:
+            if time.monotonic() - swept_at >= POLL_TIMEOUT:
+                close_old_connections()
+                _sweep(station_pk, client_handler)
+                swept_at = time.monotonic()
+            # E-stops first: BLPOP takes from the first non-empty list
+            item = get_redis_connection("default").blpop(
+                [_queue_key(station_pk, EMERGENCY_STOP), _queue_key(station_pk)], timeout=POLL_TIMEOUT
+            )
+            close_old_connections()
+            if item:
+                item = item[1].decode()
+                if item.startswith(BATCH_PREFIX):
+                    run_write_batch(item[len(BATCH_PREFIX):], client_handler)
+                else:
+                    run_write_job(item, client_handler)
+        except Exception as e:
+            logger.error(f"❌ Write queue worker error for {client_handler.config.station_name}: {e}")
+            time.sleep(POLL_TIMEOUT)
+
+
+def _sweep(station_pk, client_handler):
+    """Fail abandoned running jobs, then run queued jobs whose push never arrived (e-stops first)."""
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+    ControlState = apps.get_model("roams_opcua_mgr", "ControlState")
+    abandoned = ControlWriteJob.objects.filter(
+        station_id=station_pk,
+        status='running',
+        started_at__lt=now() - timedelta(seconds=WRITE_TIMEOUT),
+    ).values_list('id', flat=True)
+    for job_id in abandoned:
+        _fail_abandoned(job_id)
+
+    stale = ControlWriteJob.objects.filter(
+        station_id=station_pk,
+        status='queued',
+        created_at__lt=now() - timedelta(seconds=POLL_TIMEOUT),
+    ).annotate(
+        estop=Exists(ControlState.objects.filter(node=OuterRef('node'), tag_type='emergency'))
+    ).order_by('-estop', 'created_at').values_list('id', 'batch_id')
+    batches = set()
+    for job_id, batch_id in stale:
+        if batch_id is None:
+            run_write_job(job_id, client_handler)
+        elif batch_id not in batches:
+            batches.add(batch_id)
+            run_write_batch(batch_id, client_handler)
+
+
+def _fail_abandoned(job_id):
+    """Fail a job still "running" after WRITE_TIMEOUT; its worker is gone."""
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+    message = f"No result within {WRITE_TIMEOUT}s: the write was abandoned (ingest restarted?)"
+    # Claim it first so a write finishing right now is not overwritten
+    if not ControlWriteJob.objects.filter(pk=job_id, status='running').update(status='failed', message=message):
+        return
+    job = ControlWriteJob.objects.select_related(
+        'station', 'node', 'node__client_config', 'control_state', 'control_request', 'requested_by'
+    ).get(pk=job_id)
+    _finish(job, 'failed', message)
+
+
+def run_write_job(job_id, client_handler):
+    """Claim one job, write it to the PLC and record the outcome."""
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+
+    # Claim: a job runs once even if several workers see it
+    started_at = now()
+    if not ControlWriteJob.objects.filter(pk=job_id, status='queued').update(status='running', started_at=started_at):
+        return
+
+    # From here on the job must end finished, whatever fails
+    job = None
+    try:
+        job = ControlWriteJob.objects.select_related(
+            'station', 'node', 'node__client_config', 'control_state', 'control_request', 'requested_by'
+        ).get(pk=job_id)
+
+        if started_at - job.created_at > timedelta(seconds=WRITE_JOB_TTL):
+            _finish(job, 'expired', f"Not written: waited more than {WRITE_JOB_TTL}s for the PLC")
+            return
+        publish_write_job(job.station_id, job.station.station_name, job)
+        priority = _write_priority(job)
+
+        # 🔌 OPC UA round trip - no transaction is open here
+        if job.kind == 'control_change':
+            success, message = client_handler.write_node_value(job.node, job.value, priority=priority)
+        elif client_handler.connected and client_handler.client:
+            success = write_station_node(
+                client_handler.client, job.node, job.value, job.command,
+                session=client_handler.session, priority=priority,
+            )
+            message = (
+                f"✅ Successfully wrote {job.value} to {job.node.tag_name}" if success
+                else f"Write operation failed for {job.node.tag_name}. Check server permissions."
+            )
+        else:
+            success, message = False, f"Station {job.station.station_name} is not connected"
+    except Exception as e:
+        logger.exception(f"❌ Unexpected error executing write job {job_id}: {e}")
+        success, message = False, f"Error executing write: {e}"
+        if job is None:
+            ControlWriteJob.objects.filter(pk=job_id, status='running').update(
+                status='failed', message=message, finished_at=now()
+            )
+            return
+
+    # If recording the outcome fails too, the sweep fails the job after WRITE_TIMEOUT
+    _finish(job, 'succeeded' if success else 'failed', message)
+
+
+def run_write_batch(batch_id, client_handler):
+    """Claim a bulk write's jobs, write them in one OPC UA call and record each node's status."""
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+
+    # Claim: lock the batch's queued rows so no other worker takes them
+    started_at = now()
+    with transaction.atomic():
+        jobs = list(
+            ControlWriteJob.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('station', 'node', 'node__tag_name', 'requested_by')
+            .filter(batch_id=batch_id, status='queued')
+            .order_by('created_at', 'pk')
+        )
+        if not jobs:
+            return
+        ControlWriteJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status='running', started_at=started_at
+        )
+    station = jobs[0].station
+
+    # From here on the jobs must end finished, whatever fails
+    try:
+        if started_at - jobs[0].created_at > timedelta(seconds=WRITE_JOB_TTL):
+            _finish_batch(jobs, ['expired'] * len(jobs), [""] * len(jobs),
+                          f"Not written: waited more than {WRITE_JOB_TTL}s for the PLC")
+            return
+        for job in jobs:
+            job.status = 'running'
+            publish_write_job(station.pk, station.station_name, job)
+        priority = _batch_priority([job.node_id for job in jobs])
+
+        # 🔌 One OPC UA Write call for the whole batch - no transaction is open here
+        if not (client_handler.connected and client_handler.client):
+            _finish_batch(jobs, ['failed'] * len(jobs), [""] * len(jobs),
+                          f"Station {station.station_name} is not connected")
+            return
+        status_codes = write_station_nodes(
+            client_handler.client, [(job.node, job.value) for job in jobs], jobs[0].command,
+            session=client_handler.session, priority=priority,
+        )
+    except Exception as e:
+        logger.exception(f"❌ Bulk write {batch_id} failed: {e}")
+        # If recording this fails too, the sweep fails the jobs after WRITE_TIMEOUT
+        _finish_batch(jobs, ['failed'] * len(jobs), [""] * len(jobs), f"Error executing write: {e}")
+        return
+
+    statuses = ['succeeded' if code == "Good" else 'failed' for code in status_codes]
+    _finish_batch(jobs, statuses, status_codes)
+
+
+def _finish_batch(jobs, statuses, status_codes, message=None):
+    """Record a bulk write's outcome per job and the nodes written, in one short transaction."""
+    ControlWriteJob = apps.get_model("roams_opcua_mgr", "ControlWriteJob")
+    finished_at = now()
+    for job, job_status, status_code in zip(jobs, statuses, status_codes):
+        job.status = job_status
+        job.status_code = status_code
+        job.finished_at = finished_at
+        job.message = message or (
+            f"✅ Successfully wrote {job.value} to {job.node.tag_name}" if job_status == 'succeeded'
+            else f"Write to {job.node.tag_name} rejected by the server: {status_code}"
+        )
+
+    written = [job for job in jobs if job.status == 'succeeded']
+    with transaction.atomic():
+        ControlWriteJob.objects.bulk_update(jobs, ['status', 'status_code', 'message', 'finished_at'])
+        if written:
+            record_station_writes([(job.node, job.value) for job in written], jobs[0].command)
+        for job in written:
+            _sync_control_state(job)
+
+    succeeded = statuses.count('succeeded')
+    log = logger.info if succeeded == len(jobs) else logger.error
+    log(f"🎯 Bulk write {jobs[0].batch_id}: {succeeded}/{len(jobs)} nodes written")
+    for job in jobs:
+        publish_write_job(job.station_id, job.station.station_name, job)
+
+
+def _write_priority(job):
+    """Writes to emergency stop controls jump ahead of every other session request."""
+    ControlState = apps.get_model("roams_opcua_mgr", "ControlState")
+    if job.control_state is not None:
+        tag_type = job.control_state.tag_type
+    else:
+        tag_type = ControlState.objects.filter(node=job.node).values_list('tag_type', flat=True).first()
+    return EMERGENCY_STOP if tag_type == 'emergency' else CONTROL_WRITE
+
+
+def _batch_priority(node_ids):
+    """A bulk write touching any emergency stop control runs as one."""
+    ControlState = apps.get_model("roams_opcua_mgr", "ControlState")
+    emergency = ControlState.objects.filter(node__in=node_ids, tag_type='emergency').exists()
+    return EMERGENCY_STOP if emergency else CONTROL_WRITE
+
+
+def _finish(job, status, message):
+    """Record a job's outcome and everything that depends on it, in one short transaction."""
+    with transaction.atomic():
+        job.status = status
+        job.message = message
+        job.finished_at = now()
+        job.save(update_fields=['status', 'message', 'finished_at'])
+
+        if job.kind == 'control_change':
+            _record_control_change(job)
+        elif status == 'succeeded':
+            _sync_control_state(job)
+
+    log = logger.info if status == 'succeeded' else logger.error
+    log(f"🎯 Write job {job.pk} {status}: {message}")
+    publish_write_job(job.station_id, job.station.station_name, job)
+
+
+def _record_control_change(job):
+    ControlStateHistory = apps.get_model("roams_opcua_mgr", "ControlStateHistory")
+    control_state = job.control_state
+    if control_state is None:
+        return
+
+    if job.status != 'succeeded':
+        ControlStateHistory.objects.create(
+            control_state=control_state,
+            change_type='failed',
+            requested_by=job.requested_by,
+            previous_value=control_state.current_value,
+            requested_value=job.value,
+            reason=job.reason,
+            error_message=job.message,
+            ip_address=job.ip_address
+        )
+        if job.control_request:
+            job.control_request.status = 'failed'
+            job.control_request.save()
+        return
+
+    control_state.current_value = job.value
+    control_state.plc_value = job.value
+    control_state.is_synced_with_plc = True
+    control_state.last_changed_by = job.requested_by
+    control_state.save()
+
+    ControlStateHistory.objects.create(
+        control_state=control_state,
+        change_type='executed',
+        requested_by=job.requested_by,
+        previous_value=not job.value,
+        requested_value=job.value,
+        final_value=job.value,
+        reason=job.reason,
+        ip_address=job.ip_address
+    )
+
+
+def _sync_control_state(job):
+    """A direct write to a boolean control node also moves its ControlState."""
+    ControlState = apps.get_model("roams_opcua_mgr", "ControlState")
+    node = job.node
+    if node.data_type != "Boolean" or not getattr(node, 'is_boolean_control', False):
+        return
+
+    control_state, created = ControlState.objects.get_or_create(
+        node=node,
+        defaults={
+            'current_value': job.value,
+            'last_changed_by': job.requested_by,
+        }
+    )
+    # Only update if value actually changed
+    if not created and control_state.current_value != job.value:
+        control_state.current_value = job.value
+        control_state.last_changed_by = job.requested_by
+        control_state.save()
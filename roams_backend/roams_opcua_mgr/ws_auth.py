@@ -0,0 +1,40 @@
+"""
+WebSocket authentication.
+
+Browsers can't set an Authorization header on a WebSocket, so the frontend
+passes its DRF token in the query string: ws://host/ws/live/?token=<key>.
+Without a token, the Django session (AuthMiddlewareStack) is used, as for the
+browsable API.
+"""
+
+from urllib.parse import parse_qs
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.authtoken.models import Token
+
+
+@database_sync_to_async
+def get_token_user(key):
+    try:
+        token = Token.objects.select_related("user").get(key=key)
+    except Token.DoesNotExist:
+        return AnonymousUser()
+    return token.user if token.user.is_active else AnonymousUser()
+
+
+class TokenAuthMiddleware(BaseMiddleware):
+    """Set scope["user"] from a `token` query parameter, when one is given."""
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        key = query.get("token", [None])[0]
+        if key:
+            scope = dict(scope, user=await get_token_user(key))
+        return await super().__call__(scope, receive, send)
+
+
+def TokenAuthMiddlewareStack(inner):
+    """Session auth first, then a query-string token overrides it if present."""
+    return AuthMiddlewareStack(TokenAuthMiddleware(inner))
@@ -13,4 +13,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'roams_pro.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing anything that touches models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+from roams_opcua_mgr.routing import websocket_urlpatterns  # noqa: E402
+from roams_opcua_mgr.ws_auth import TokenAuthMiddlewareStack  # noqa: E402
+from roams_opcua_mgr.process_registry import register_process  # noqa: E402
+
+register_process("web")
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": AllowedHostsOriginValidator(
+        TokenAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
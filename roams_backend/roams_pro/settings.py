@@ -158,6 +158,10 @@ CORS_ALLOWED_ORIGINS = [
     "https://144.91.79.167",
 ]
 
+# Let the frontend read the delta-sync token, conditional-GET validators and
+# the resolution the telemetry endpoint chose
+CORS_EXPOSE_HEADERS = ["X-Sync-Token", "ETag", "X-Telemetry-Resolution"]
+
 CSRF_TRUSTED_ORIGINS = [
     "http://144.91.79.167",
     "https://144.91.79.167",
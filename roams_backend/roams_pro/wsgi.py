@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'roams_pro.settings')
 
 application = get_wsgi_application()
+
+from roams_opcua_mgr.process_registry import register_process  # noqa: E402
+
+register_process("web")
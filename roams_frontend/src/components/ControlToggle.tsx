@@ -8,6 +8,7 @@ import { Badge } from '@/components/ui/badge';
 import { AlertCircle, CheckCircle, Clock, AlertTriangle, ShieldAlert, Power, Loader2 } from 'lucide-react';
 import { toast } from 'sonner';
 import { useApi } from '@/hooks/useApi';
+import { waitForWriteJob } from '@/services/api';
 
 export interface ControlState {
   id: number;
@@ -124,7 +125,6 @@ export function ControlToggle({ control, onStateChange }: ControlToggleProps) {
   const requestStateChange = useCallback(
     async (newValue: boolean, changeReason: string) => {
       setIsLoading(true);
-      setLocalValue(newValue);
       try {
         const response = await api.post(`/control-states/${control.id}/request_change/`, {
           requested_value: newValue,
@@ -146,15 +146,20 @@ export function ControlToggle({ control, onStateChange }: ControlToggleProps) {
             `Confirmation required. Pending admin approval. (Expires in ${respData.expires_in_seconds}s)`
           );
         } else {
-          // Immediate execution
-          toast.success(`${newValue ? 'Started' : 'Stopped'} successfully!`);
-          onStateChange?.(newValue);
+          // Queued for the PLC (202): only flip the toggle once the write is done
+          const job = await waitForWriteJob(respData.job_id);
           setShowReasonDialog(false);
+          if (job.status === 'succeeded') {
+            setLocalValue(newValue);
+            toast.success(`${newValue ? 'Started' : 'Stopped'} successfully!`);
+            onStateChange?.(newValue);
+          } else {
+            toast.error(job.message || `Control change ${job.status_display.toLowerCase()}`);
+          }
         }
       } catch (error: any) {
-        const message = error.response?.data?.detail || 'Failed to request control change';
+        const message = error.response?.data?.detail || error.message || 'Failed to request control change';
         toast.error(message);
-        setLocalValue(!newValue); // Revert on error
       } finally {
         setIsLoading(false);
         setPendingAction(null);
@@ -8,7 +8,7 @@ import {
   AlertCircle,
   Clock,
 } from "lucide-react";
-import { getServerUrl } from "@/services/api";
+import { getServerUrl, waitForWriteJob } from "@/services/api";
 import {
   SidebarProvider,
   SidebarTrigger,
@@ -212,7 +212,7 @@ const Control = () => {
       const serverUrl = getServerUrl();
       const authAxios = createAuthAxios();
       
-      await authAxios.post(
+      const response = await authAxios.post(
         `${serverUrl}/api/opcua_node/${selectedNode}/write/`,
         {
           value: writeValue,
@@ -220,6 +220,12 @@ const Control = () => {
         }
       );
 
+      // The write is queued (202): wait for the PLC's answer before flipping the toggle
+      const job = await waitForWriteJob(response.data.job_id);
+      if (job.status !== "succeeded") {
+        throw new Error(job.message || `Write ${job.status_display.toLowerCase()}`);
+      }
+
       setIsRunning(pressed);
       toast({
         title: "Success",
@@ -315,6 +315,32 @@ export async function fetchTelemetry(
   return res.data;
 }
 
+// -------- Control Write Jobs --------
+// PLC writes are queued: the write endpoints answer 202 with a job id and the
+// ingest process performs the write. Only the finished job says whether it worked.
+export interface WriteJob {
+  id: string;
+  status: "queued" | "running" | "succeeded" | "failed" | "expired";
+  status_display: string;
+  is_finished: boolean;
+  message: string;
+  tag_name: string;
+  value: unknown;
+}
+
+const WRITE_JOB_POLL_MS = 500;
+const WRITE_JOB_TIMEOUT_MS = 130_000; // Server gives up after 120s (queue TTL + write timeout)
+
+export async function waitForWriteJob(jobId: string): Promise<WriteJob> {
+  const deadline = Date.now() + WRITE_JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const res = await api.get<WriteJob>(`/write-jobs/${jobId}/`);
+    if (res.data.is_finished) return res.data;
+    await new Promise((resolve) => setTimeout(resolve, WRITE_JOB_POLL_MS));
+  }
+  throw new Error("No result from the PLC yet - check the control state before retrying");
+}
+
 // -------- VPN Monitoring (Admin Only) --------
 export interface VPNClient {
   id: string;